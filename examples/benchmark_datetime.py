@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# vim: expandtab sw=4 ts=4 sts=4:
+#
+# Copyright © 2003 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of python-gammu <https://wammu.eu/python-gammu/>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Micro benchmark for date and time conversions.
+
+Decodes status report PDU which contains two timestamps, so the default
+count of 50000 iterations does 100000 datetime conversions. Run it against
+different builds to compare conversion performance.
+"""
+
+import sys
+import timeit
+
+import gammu
+
+PDU_DATA = bytes.fromhex(
+    "079124602009999002AB098106845688F8907080517375809070805183018000"
+)
+CONVERSIONS = 2
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    sms = gammu.DecodePDU(PDU_DATA)
+    if sms["DateTime"] is None or sms["SMSCDateTime"] is None:
+        print("Message does not contain both timestamps!")
+        sys.exit(1)
+
+    elapsed = min(
+        timeit.repeat(lambda: gammu.DecodePDU(PDU_DATA), number=count, repeat=5)
+    )
+    conversions = count * CONVERSIONS
+    print(f"{conversions} conversions: {elapsed:.3f} s")
+    print(f"{elapsed / conversions * 1e9:.0f} ns per decoded message timestamp")
+
+
+if __name__ == "__main__":
+    main()
@@ -123,11 +123,9 @@ def print_all_sms(sms, folders) -> None:
 
 
 def link_all_sms(sms, folders) -> None:
-    data = gammu.LinkSMS([[msg] for msg in sms])
-
-    for x in data:  # ruff: ignore[too-many-nested-blocks]
-        v = gammu.DecodeSMS(x)
+    data = gammu.LinkAndDecodeSMS([[msg] for msg in sms])
 
+    for x, v in data:  # ruff: ignore[too-many-nested-blocks]
         m = x[0]
         print_sms_header(m, folders)
         loc = [str(m["Location"]) for m in x]
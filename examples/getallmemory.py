@@ -37,26 +37,12 @@ def main() -> None:
 
     memory_type = sys.argv[1]
 
-    status = state_machine.GetMemoryStatus(Type=memory_type)
-
-    remain = status["Used"]
-
-    start = True
-
-    while remain > 0:
-        if start:
-            entry = state_machine.GetNextMemory(Start=True, Type=memory_type)
-            start = False
-        else:
-            entry = state_machine.GetNextMemory(
-                Location=entry["Location"], Type=memory_type
-            )
-        remain -= 1
-
-        print()
-        print(f"{'Location':<15}: {entry['Location']:d}")
-        for v in entry["Entries"]:
-            print(f"{v['Type']:<15}: {v['Value']!s}")
+    for batch in state_machine.IterMemory(Type=memory_type, Fallback=True):
+        for entry in batch:
+            print()
+            print(f"{'Location':<15}: {entry['Location']:d}")
+            for v in entry["Entries"]:
+                print(f"{v['Type']:<15}: {v['Value']!s}")
 
 
 if __name__ == "__main__":
@@ -24,38 +24,24 @@
 import gammu
 
 
-def get_next_sms(state_machine, previous):
-    if previous is None:
-        return state_machine.GetNextSMS(Start=True, Folder=0)
-    return state_machine.GetNextSMS(Location=previous[0]["Location"], Folder=0)
-
-
 def main() -> None:
     state_machine = gammu.StateMachine()
     state_machine.ReadConfig()
     state_machine.Init()
 
-    status = state_machine.GetSMSStatus()
-
-    remain = status["SIMUsed"] + status["PhoneUsed"] + status["TemplatesUsed"]
-
-    sms = None
-    while remain > 0:
-        try:
-            sms = get_next_sms(state_machine, sms)
-        except gammu.ERR_EMPTY:
-            # This error is raised when we've reached last entry
-            # It can happen when reported status does not match real counts
-            print("Failed to read all messages!")
-            break
-        remain -= len(sms)
-
-        for message in sms:
-            print()
-            print(f"{'Number':<15}: {message['Number']}")
-            print(f"{'Date':<15}: {message['DateTime']!s}")
-            print(f"{'State':<15}: {message['State']}")
-            print(f"\n{message['Text']}")
+    iterator = state_machine.IterSMS(Folder=0)
+    for batch in iterator:
+        for sms in batch:
+            for message in sms:
+                print()
+                print(f"{'Number':<15}: {message['Number']}")
+                print(f"{'Date':<15}: {message['DateTime']!s}")
+                print(f"{'State':<15}: {message['State']}")
+                print(f"\n{message['Text']}")
+
+    if iterator.Total not in {-1, iterator.Read}:
+        # It can happen when reported status does not match real counts
+        print("Failed to read all messages!")
 
 
 if __name__ == "__main__":
@@ -52,11 +52,9 @@ while remain > 0:
     remain -= len(current_sms)
     sms.append(current_sms)
 
-data = gammu.LinkSMS(sms)
-
-for x in data:
-    v = gammu.DecodeSMS(x)
+data = gammu.LinkAndDecodeSMS(sms)
 
+for x, v in data:
     m = x[0]
     print()
     print(f"{'Number':<15}: {m['Number']}")
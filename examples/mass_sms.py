@@ -35,13 +35,16 @@ state_machine = gammu.StateMachine()
 state_machine.ReadConfig()
 state_machine.Init()
 
-# Prepare SMS template
-message = {"Text": sys.argv[1], "SMSC": {"Location": 1}}
+# Prepare SMS for all recipients on command line
+numbers = sys.argv[2:]
+messages = [
+    {"Text": sys.argv[1], "SMSC": {"Location": 1}, "Number": number}
+    for number in numbers
+]
 
-# Send SMS to all recipients on command line
-for number in sys.argv[2:]:
-    message["Number"] = number
-    try:
-        state_machine.SendSMS(message)
-    except gammu.GSMError as exc:
-        print(f"Sending to {number} failed: {exc}")
+# Send them in one batch
+for number, (_reference, error) in zip(
+    numbers, state_machine.SendSMSBatch(messages), strict=True
+):
+    if error is not None:
+        print(f"Sending to {number} failed: {error}")
@@ -27,6 +27,38 @@ import sys
 import gammu
 
 
+def print_message(message, charsetencoder) -> None:
+    decoded = gammu.DecodeSMS(message)
+
+    part = message[0]
+    print()
+    print(f"{'Number':<15}: {part['Number']}")
+    print(f"{'Date':<15}: {part['DateTime']!s}")
+    print(f"{'State':<15}: {part['State']}")
+    print(f"{'Folder':<15}: {part['Folder']}")
+    print(f"{'Validity':<15}: {part['SMSC']['Validity']}")
+    loc = []
+    for part in message:
+        loc.append(str(part["Location"]))
+    print(f"{'Location(s)':<15}: {', '.join(loc)}")
+    if decoded is None:
+        print(f"\n{charsetencoder(part['Text'], 'replace')[0]}")
+    else:
+        for entries in decoded["Entries"]:
+            print()
+            print(f"{'Type':<15}: {entries['ID']}")
+            if entries["Bitmap"] is not None:
+                for bmp in entries["Bitmap"]:
+                    print("Bitmap:")
+                    for row in bmp["XPM"][3:]:
+                        print(row)
+                print()
+            if entries["Buffer"] is not None:
+                print("Text:")
+                print(charsetencoder(entries["Buffer"], "replace"))
+                print()
+
+
 def main() -> None:
     if len(sys.argv) != 2:
         print("This requires parameter: backup file!")
@@ -36,43 +68,19 @@ def main() -> None:
 
     filename = sys.argv[1]
 
-    backup = gammu.ReadSMSBackup(filename)
-
-    # Make nested array
-    messages = [[message] for message in backup]
+    print(f"Messages in backup: {gammu.CountSMSBackup(filename)}")
 
-    data = gammu.LinkSMS(messages)
+    # Process backup in chunks, linking multipart messages as they come
+    linker = gammu.SMSLinker(ttl=None, max_pending=None)
+    for chunk in gammu.IterSMSBackup(filename):
+        for part in chunk:
+            message = linker.add(part)
+            if message is not None:
+                print_message(message, charsetencoder)
 
-    for message in data:  # ruff: ignore[too-many-nested-blocks]
-        decoded = gammu.DecodeSMS(message)
-
-        part = message[0]
-        print()
-        print(f"{'Number':<15}: {part['Number']}")
-        print(f"{'Date':<15}: {part['DateTime']!s}")
-        print(f"{'State':<15}: {part['State']}")
-        print(f"{'Folder':<15}: {part['Folder']}")
-        print(f"{'Validity':<15}: {part['SMSC']['Validity']}")
-        loc = []
-        for part in message:
-            loc.append(str(part["Location"]))
-        print(f"{'Location(s)':<15}: {', '.join(loc)}")
-        if decoded is None:
-            print(f"\n{charsetencoder(part['Text'], 'replace')[0]}")
-        else:
-            for entries in decoded["Entries"]:
-                print()
-                print(f"{'Type':<15}: {entries['ID']}")
-                if entries["Bitmap"] is not None:
-                    for bmp in entries["Bitmap"]:
-                        print("Bitmap:")
-                        for row in bmp["XPM"][3:]:
-                            print(row)
-                    print()
-                if entries["Buffer"] is not None:
-                    print("Text:")
-                    print(charsetencoder(entries["Buffer"], "replace"))
-                    print()
+    # Print incomplete messages
+    for message in linker.flush():
+        print_message(message, charsetencoder)
 
 
 if __name__ == "__main__":
@@ -21,5 +21,7 @@
 """Phone communication library - python wrapper for Gammu library."""
 
 from gammu._gammu import *  # ruff: ignore[undefined-local-with-import-star]
+from gammu.backup import SMSBackupWriter  # ruff: ignore[unused-import]
+from gammu.linker import SMSLinker  # ruff: ignore[unused-import]
 
 __version__ = "Gammu {}, python-gammu {}".format(*Version())  # ruff: ignore[undefined-local-with-import-star-usage]
@@ -27,16 +27,22 @@ import gammu.worker
 class GammuAsyncThread(gammu.worker.GammuThread):
     """Thread for phone communication."""
 
-    def __init__(self, queue, config, callback, pull_func) -> None:
+    def __init__(
+        self,
+        queue,
+        config,
+        callback,
+        pull_func,
+        poll_interval=gammu.worker.POLL_INTERVAL,
+    ) -> None:
         """Initialize thread."""
-        super().__init__(queue, config, callback, pull_func)
+        super().__init__(queue, config, callback, pull_func, poll_interval)
 
     def _do_command(self, future, cmd, params, percentage=100) -> None:
         """Execute single command on phone."""
-        func = getattr(self._sm, cmd)
         result = None
         try:
-            result = gammu.worker._execute_command(func, params)
+            result = self._execute(cmd, params)
         except gammu.GSMError as info:
             errcode = info.args[0]["Code"]
             error = gammu.ErrorNumbers[errcode]
@@ -70,19 +76,25 @@ class GammuAsyncWorker(gammu.worker.GammuWorker):
         if future is not None:
             if error is None:
                 self._loop.call_soon_threadsafe(future.set_result, result)
+            elif error in {"ERR_CANCELED", "ERR_ABORTED"}:
+                # Operation was cancelled by abort
+                self._loop.call_soon_threadsafe(future.cancel)
             else:
                 exception = error
                 if not isinstance(error, Exception):
                     exception = gammu.GSMError(error)
                 self._loop.call_soon_threadsafe(future.set_exception, exception)
 
-    def __init__(self, pull_func=gammu_pull_device) -> None:
+    def __init__(
+        self, pull_func=gammu_pull_device, poll_interval=gammu.worker.POLL_INTERVAL
+    ) -> None:
         """
         Initialize the worker class.
 
-        @param callback: See L{GammuThread.__init__} for description.
+        @param pull_func: See L{GammuThread.__init__} for description.
+        @param poll_interval: See L{GammuThread.__init__} for description.
         """
-        super().__init__(self.worker_callback, pull_func)
+        super().__init__(self.worker_callback, pull_func, poll_interval)
         self._loop = asyncio.get_event_loop()
         self._init_future = None
         self._terminate_future = None
@@ -94,7 +106,11 @@ class GammuAsyncWorker(gammu.worker.GammuWorker):
         self._init_future = self._loop.create_future()
 
         self._thread = GammuAsyncThread(
-            self._queue, self._config, self._callback, self._pull_func
+            self._queue,
+            self._config,
+            self._callback,
+            self._pull_func,
+            self._poll_interval,
         )
         self._thread.start()
 
@@ -158,9 +174,78 @@ class GammuAsyncWorker(gammu.worker.GammuWorker):
     async def terminate_async(self) -> None:
         """Terminate phone communication."""
         self._terminate_future = self._loop.create_future()
-        self.enqueue("Terminate")
+        self.enqueue("Terminate", priority=gammu.worker.PRIORITY_TERMINATE)
         await self._terminate_future
 
         await asyncio.to_thread(self._thread.join)
 
         self._thread = None
+
+
+# Methods which need special handling and are not wrapped automatically
+_ASYNC_SKIPPED_COMMANDS = {
+    # Connection is handled by the worker thread
+    "Init",
+    "Terminate",
+    # Aborting can not wait in the queue behind the command it aborts
+    "Abort",
+    # Iterators would communicate with the phone in the caller thread
+    "IterMemory",
+    "IterSMS",
+}
+
+
+def _async_command(name):
+    """Creates awaitable wrapper for StateMachine method."""
+
+    async def command(self, *args, **kwargs):
+        return await self.run_command_async(name, *args, **kwargs)
+
+    command.__name__ = name
+    command.__qualname__ = f"AsyncStateMachine.{name}"
+    command.__doc__ = getattr(gammu.StateMachine, name).__doc__
+    return command
+
+
+class AsyncStateMachine(GammuAsyncWorker):
+    """
+    Asynchronous variant of L{gammu.StateMachine}.
+
+    All methods of L{gammu.StateMachine} are available as coroutines with
+    same name and parameters, they are executed in the worker thread. Use
+    L{Init} and L{Terminate} to connect and disconnect from the phone.
+    """
+
+    async def run_command_async(self, command, *args, **kwargs):
+        """
+        Executes StateMachine method in the worker thread.
+
+        @param command: Name of the method.
+        @type command: string
+        """
+        params = kwargs or args
+        if args and kwargs:
+            params = gammu.worker._Arguments(args, kwargs)
+        future = self._loop.create_future()
+        self.enqueue(future, commands=[(command, params)])
+        return await future
+
+    async def Init(self) -> None:
+        """Connect to phone."""
+        await self.init_async()
+
+    async def Terminate(self) -> None:
+        """Terminate phone communication."""
+        await self.terminate_async()
+
+    async def Abort(self) -> None:
+        """Abort pending and currently executed operations, see L{abort}."""
+        self.abort()
+
+
+for _name in dir(gammu.StateMachine):
+    if _name.startswith("_") or _name in _ASYNC_SKIPPED_COMMANDS:
+        continue
+    setattr(AsyncStateMachine, _name, _async_command(_name))
+
+del _name
@@ -0,0 +1,289 @@
+# vim: expandtab sw=4 ts=4 sts=4:
+#
+# Copyright © 2003 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of python-gammu <https://wammu.eu/python-gammu/>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+"""Helpers for working with backup files."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import re
+import tempfile
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import gammu
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = ["ConversionResult", "SMSBackupWriter", "convert_many"]
+
+# Default number of messages written to SMS backup at once
+DEFAULT_BATCH = 100
+
+# Section headers of messages in SMS backup
+SMS_SECTION_RE = re.compile(rb"^\[SMSBackup(\d+)\]", re.MULTILINE | re.IGNORECASE)
+
+
+class SMSBackupWriter:
+    """
+    Appends messages to SMS backup in batches.
+
+    Messages are buffered and appended to the file once the batch is full,
+    so recording every message as it arrives does not rewrite the file each
+    time. Sections of every batch are renumbered to follow the highest one
+    already present in the file, otherwise they would be read back as copies
+    of the first batch. The file is scanned once when first batch is written
+    and kept open, so it should not be modified by others while the writer
+    is open. Remaining messages are written when the writer is closed, it
+    can be used as a context manager to ensure that.
+
+    gammu.ReadSMSBackup can read at most gammu.GSM_BACKUP_MAX_SMS messages,
+    bigger files can be read only by gammu.IterSMSBackup, so long running
+    archives should be rotated. Warning is issued when the file grows over
+    this limit.
+    """
+
+    def __init__(self, filename, batch=DEFAULT_BATCH) -> None:
+        """
+        Initializes writer.
+
+        @param filename: Name of file where SMS backup is stored, messages
+            are appended to existing file.
+        @type filename: string
+        @param batch: Number of messages written at once, it is limited by
+            gammu.GSM_BACKUP_MAX_SMS.
+        @type batch: int
+        """
+        if batch < 1:
+            msg = "Batch has to be positive!"
+            raise ValueError(msg)
+        self._filename = os.fspath(filename)
+        self._batch = min(batch, gammu.GSM_BACKUP_MAX_SMS - 1)
+        self._pending = []
+        self._handle = None
+        self._scratch = None
+        self._next_section = 0
+        self._sections = 0
+        self._closed = False
+        self.written = 0
+
+    def __enter__(self) -> Self:
+        """Returns writer for use in with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Writes remaining messages and closes writer."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Returns number of messages waiting to be written."""
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        """Whether writer is closed."""
+        return self._closed
+
+    def write(self, message) -> None:
+        """
+        Adds message to the backup.
+
+        @param message: Message to store, same as for gammu.SaveSMSBackup.
+        @type message: dict
+        """
+        if self._closed:
+            msg = "Writing to closed SMS backup!"
+            raise ValueError(msg)
+        self._pending.append(message)
+        if len(self._pending) >= self._batch:
+            self.flush()
+
+    def write_many(self, messages) -> None:
+        """
+        Adds several messages to the backup.
+
+        @param messages: Messages to store.
+        @type messages: iterable
+        """
+        for message in messages:
+            self.write(message)
+
+    def _open(self) -> None:
+        """Scans existing sections and opens the file for appending."""
+        path = Path(self._filename)
+        if path.exists():
+            with path.open("rb") as handle:
+                for line in handle:
+                    match = SMS_SECTION_RE.match(line)
+                    if match is not None:
+                        self._sections += 1
+                        self._next_section = max(
+                            self._next_section, int(match.group(1)) + 1
+                        )
+        fd, self._scratch = tempfile.mkstemp(suffix=".smsbackup")
+        os.close(fd)
+        self._handle = path.open("ab")
+
+    def flush(self) -> None:
+        """Writes buffered messages to the file."""
+        if not self._pending:
+            return
+        if self._handle is None:
+            self._open()
+
+        # libgammu appends to the file and numbers sections from zero
+        scratch = Path(self._scratch)
+        scratch.write_bytes(b"")
+        gammu.SaveSMSBackup(self._scratch, self._pending)
+        offset = self._next_section
+        data = SMS_SECTION_RE.sub(
+            lambda match: b"[SMSBackup%03d]" % (offset + int(match.group(1))),
+            scratch.read_bytes(),
+        )
+        self._handle.write(data)
+        self._handle.flush()
+
+        count = len(self._pending)
+        if self._sections <= gammu.GSM_BACKUP_MAX_SMS < self._sections + count:
+            warnings.warn(
+                f"SMS backup {self._filename} has more than "
+                f"{gammu.GSM_BACKUP_MAX_SMS} messages, it can be read only "
+                "using gammu.IterSMSBackup",
+                stacklevel=2,
+            )
+        self._next_section += count
+        self._sections += count
+        self.written += count
+        self._pending = []
+
+    def close(self) -> None:
+        """Writes remaining messages, writer can not be used afterwards."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            if self._handle is not None:
+                self._handle.close()
+                Path(self._scratch).unlink()
+
+
+class ConversionResult(NamedTuple):
+    """Result of converting single backup file."""
+
+    source: str
+    target: str
+    error: Exception | None
+
+    @property
+    def ok(self) -> bool:
+        """Whether file was converted."""
+        return self.error is None
+
+
+def _convert(source, target, save_format) -> None:
+    """Converts single backup file, executed in worker process."""
+    backup = gammu.ReadBackup(source, Lazy=True)
+    if save_format is None:
+        gammu.SaveBackup(target, backup)
+    else:
+        gammu.SaveBackup(target, backup, save_format)
+
+
+def convert_many(  # ruff: ignore[too-many-arguments]
+    paths,
+    out_format,
+    *,
+    workers=None,
+    output_dir=None,
+    save_format=None,
+    progress=None,
+):
+    """
+    Converts backup files to another format using pool of processes.
+
+    Every file is saved with same name and extension given by out_format,
+    either next to the source file or in output_dir. Failures of single
+    files do not stop the conversion, they are reported in the result.
+
+    @param paths: Names of backup files to convert.
+    @type paths: iterable
+    @param out_format: Extension of target files, which determines their
+        format, for example vcf, ics, lmb or backup.
+    @type out_format: string
+    @param workers: Number of worker processes, defaults to number of CPUs.
+    @type workers: int
+    @param output_dir: Directory where to store converted files.
+    @type output_dir: string
+    @param save_format: Format passed to gammu.SaveBackup, defaults to
+        detection by extension.
+    @type save_format: string
+    @param progress: Function called with number of finished files, total
+        number of files and L{ConversionResult} whenever file is processed.
+    @type progress: function
+    @return: Results of conversion in same order as paths.
+    @rtype: list of L{ConversionResult}
+    """
+    suffix = "." + out_format.lstrip(".")
+    results = []
+    targets = set()
+    for path in paths:
+        source = Path(path)
+        directory = source.parent if output_dir is None else Path(output_dir)
+        target = directory / (source.stem + suffix)
+        resolved = target.resolve()
+        error = None
+        if resolved == source.resolve():
+            error = ValueError(f"Conversion would overwrite {source}!")
+        elif resolved in targets:
+            error = ValueError(f"Conversion would overwrite {target} twice!")
+        targets.add(resolved)
+        results.append(ConversionResult(os.fspath(source), os.fspath(target), error))
+
+    total = len(results)
+    finished = 0
+
+    def report(index, error) -> None:
+        nonlocal finished
+        if error is not None:
+            results[index] = results[index]._replace(error=error)
+        finished += 1
+        if progress is not None:
+            progress(finished, total, results[index])
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for index, result in enumerate(results):
+            if result.error is not None:
+                report(index, None)
+                continue
+            future = executor.submit(
+                _convert, result.source, result.target, save_format
+            )
+            futures[future] = index
+
+        for future in concurrent.futures.as_completed(futures):
+            report(futures[future], future.exception())
+
+    return results
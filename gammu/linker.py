@@ -0,0 +1,182 @@
+# vim: expandtab sw=4 ts=4 sts=4:
+#
+# Copyright © 2003 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of python-gammu <https://wammu.eu/python-gammu/>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+"""Incremental linking of multipart messages."""
+
+import collections
+import time
+
+__all__ = ["SMSLinker"]
+
+# Default time after which incomplete message is dropped, in seconds
+DEFAULT_TTL = 24 * 3600
+
+# Default limit of incomplete messages kept in memory
+DEFAULT_MAX_PENDING = 1000
+
+
+def _get_udh(message):
+    """
+    Returns UDH of message if it is part of multipart message.
+
+    Parts with number outside of the message (corrupted UDH) are handled as
+    standalone messages.
+    """
+    udh = message.get("UDH")
+    if not udh:
+        return None
+    all_parts = udh.get("AllParts", -1)
+    if all_parts <= 1 or not 1 <= udh.get("PartNumber", -1) <= all_parts:
+        return None
+    return udh
+
+
+class SMSLinker:
+    """
+    Links parts of multipart messages as they arrive.
+
+    Unlike gammu.LinkSMS, which needs all messages on every call, this keeps
+    incomplete messages indexed by sender and UDH identification, so every
+    message part is processed only once. Incomplete messages are dropped
+    when no new part arrived within configured time or when there are too
+    many of them.
+    """
+
+    def __init__(
+        self,
+        ttl=DEFAULT_TTL,
+        max_pending=DEFAULT_MAX_PENDING,
+        expired_callback=None,
+        clock=time.monotonic,
+    ) -> None:
+        """
+        Initializes linker.
+
+        @param ttl: Time in seconds after which incomplete message is dropped,
+            None to keep them forever.
+        @type ttl: float
+        @param max_pending: Maximal number of incomplete messages, oldest is
+            dropped when exceeding it, None for no limit.
+        @type max_pending: int
+        @param expired_callback: Function called with list of parts of every
+            dropped incomplete message.
+        @type expired_callback: function
+        @param clock: Function returning current time in seconds.
+        @type clock: function
+        """
+        if ttl is not None and ttl < 0:
+            msg = "TTL can not be negative!"
+            raise ValueError(msg)
+        if max_pending is not None and max_pending < 1:
+            msg = "Limit of pending messages has to be positive!"
+            raise ValueError(msg)
+        self._ttl = ttl
+        self._max_pending = max_pending
+        self._expired_callback = expired_callback
+        self._clock = clock
+        # Ordered by time of last received part
+        self._pending = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns number of incomplete messages."""
+        return len(self._pending)
+
+    @staticmethod
+    def _get_key(message, udh) -> tuple:
+        """Returns identification of multipart message."""
+        return (
+            message.get("Number"),
+            udh["Type"],
+            udh["ID8bit"],
+            udh["ID16bit"],
+            udh["AllParts"],
+        )
+
+    @staticmethod
+    def _get_parts(parts) -> list:
+        """Returns message parts sorted by part number."""
+        return [parts[number] for number in sorted(parts)]
+
+    def _drop(self, key) -> None:
+        """Drops incomplete message."""
+        parts = self._pending.pop(key)[1]
+        if self._expired_callback is not None:
+            self._expired_callback(self._get_parts(parts))
+
+    def add(self, message):
+        """
+        Adds message part to the linker.
+
+        @param message: Message as returned by StateMachine.GetSMS or
+            gammu.DecodePDU, incoming SMS events which contain only
+            location need to be read first.
+        @type message: dict
+        @return: Complete message as list of parts (suitable for
+            gammu.DecodeSMS) or None if more parts are needed.
+        @rtype: list
+        """
+        self.expire()
+
+        udh = _get_udh(message)
+        if udh is None:
+            return [message]
+
+        key = self._get_key(message, udh)
+        parts = self._pending.pop(key)[1] if key in self._pending else {}
+        parts[udh["PartNumber"]] = message
+
+        if sorted(parts) == list(range(1, udh["AllParts"] + 1)):
+            return self._get_parts(parts)
+
+        self._pending[key] = (self._clock(), parts)
+        if self._max_pending is not None:
+            while len(self._pending) > self._max_pending:
+                self._drop(next(iter(self._pending)))
+        return None
+
+    def expire(self) -> int:
+        """
+        Drops incomplete messages which did not receive part within TTL.
+
+        @return: Number of dropped messages.
+        @rtype: int
+        """
+        if self._ttl is None:
+            return 0
+        limit = self._clock() - self._ttl
+        dropped = 0
+        while self._pending:
+            key, (updated, _parts) = next(iter(self._pending.items()))
+            if updated > limit:
+                break
+            self._drop(key)
+            dropped += 1
+        return dropped
+
+    def flush(self):
+        """
+        Removes all incomplete messages.
+
+        @return: List of incomplete messages, each as list of parts.
+        @rtype: list
+        """
+        result = [self._get_parts(parts) for _updated, parts in self._pending.values()]
+        self._pending.clear()
+        return result
@@ -28,93 +28,6 @@
 
 /* FIXME: should better check for errors and support all backup features */
 
-PyObject *BackupToPython(GSM_Backup * backup)
-{
-	PyObject *phone;
-	PyObject *sim;
-	PyObject *calendar;
-	PyObject *todo;
-	PyObject *o;
-	PyObject *dt;
-	int i;
-
-	phone = PyList_New(0);
-	for (i = 0; backup->PhonePhonebook[i] != NULL; i++) {
-		o = MemoryEntryToPython(backup->PhonePhonebook[i]);
-		if (o == NULL) {
-			Py_DECREF(phone);
-			return NULL;
-		}
-		PyList_Append(phone, o);
-		Py_DECREF(o);
-	}
-
-	sim = PyList_New(0);
-	for (i = 0; backup->SIMPhonebook[i] != NULL; i++) {
-		o = MemoryEntryToPython(backup->SIMPhonebook[i]);
-		if (o == NULL) {
-			Py_DECREF(sim);
-			return NULL;
-		}
-		PyList_Append(sim, o);
-		Py_DECREF(o);
-	}
-
-	todo = PyList_New(0);
-	for (i = 0; backup->ToDo[i] != NULL; i++) {
-		o = TodoToPython(backup->ToDo[i]);
-		if (o == NULL) {
-			Py_DECREF(todo);
-			return NULL;
-		}
-		PyList_Append(todo, o);
-		Py_DECREF(o);
-	}
-
-	calendar = PyList_New(0);
-	for (i = 0; backup->Calendar[i] != NULL; i++) {
-		o = CalendarToPython(backup->Calendar[i]);
-		if (o == NULL) {
-			Py_DECREF(calendar);
-			return NULL;
-		}
-		PyList_Append(calendar, o);
-		Py_DECREF(o);
-	}
-
-	if (backup->DateTimeAvailable) {
-		dt = BuildPythonDateTime(&backup->DateTime);
-		if (dt == NULL) {
-			PyErr_Clear();
-			Py_INCREF(Py_None);
-			dt = Py_None;
-		}
-	} else {
-		Py_INCREF(Py_None);
-		dt = Py_None;
-	}
-
-	o = Py_BuildValue(
-		"{s:s,s:s,s:s,s:O,s:O,s:O,s:O,s:O}",
-		"IMEI", backup->IMEI,
-		"Model", backup->Model,
-		"Creator", backup->Creator,
-		"PhonePhonebook", phone,
-		"SIMPhonebook", sim,
-		"Calendar", calendar,
-		"ToDo", todo,
-		"DateTime", dt
-	);
-
-	Py_DECREF(phone);
-	Py_DECREF(sim);
-	Py_DECREF(calendar);
-	Py_DECREF(todo);
-	Py_DECREF(dt);
-
-	return o;
-}
-
 #define GET_ONE(key, data, maxlen, type, conv)\
     o = PyDict_GetItemString(dict, key);\
     if (o == NULL) {\
@@ -0,0 +1,640 @@
+/*
+ * python-gammu - Phone communication library
+ * Copyright (C) 2003 - 2018 Michal Čihař
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along
+ * with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+ *
+ * vim: expandtab sw=4 ts=4 sts=4:
+ */
+
+/* Lazy backup records */
+
+#include "convertors.h"
+#include "misc.h"
+
+#ifdef GSM_ENABLE_BACKUP
+
+/* Fields of record, same as keys in backup dictionary */
+typedef enum {
+	BACKUP_FIELD_IMEI = 0,
+	BACKUP_FIELD_MODEL,
+	BACKUP_FIELD_CREATOR,
+	BACKUP_FIELD_PHONEPHONEBOOK,
+	BACKUP_FIELD_SIMPHONEBOOK,
+	BACKUP_FIELD_CALENDAR,
+	BACKUP_FIELD_TODO,
+	BACKUP_FIELD_DATETIME,
+	BACKUP_FIELD_LAST
+} BackupRecordField;
+
+static const char *BackupRecordFieldNames[BACKUP_FIELD_LAST] = {
+	"IMEI",
+	"Model",
+	"Creator",
+	"PhonePhonebook",
+	"SIMPhonebook",
+	"Calendar",
+	"ToDo",
+	"DateTime",
+};
+
+/* Interned field names, shared by records and backup dictionaries */
+static PyObject *BackupRecordFieldKeys[BACKUP_FIELD_LAST];
+
+/* Dictionary mapping field names to fields */
+static PyObject *BackupRecordFieldIndex = NULL;
+
+typedef struct {
+	PyObject_HEAD
+	GSM_Backup *backup;
+	/* Already converted fields */
+	PyObject *cache[BACKUP_FIELD_LAST];
+} BackupRecordObject;
+
+static PyTypeObject BackupRecordType;
+
+int BackupRecordCheck(PyObject * o)
+{
+	return PyObject_TypeCheck(o, &BackupRecordType);
+}
+
+GSM_Backup *BackupRecordGetBackup(PyObject * o)
+{
+	return ((BackupRecordObject *) o)->backup;
+}
+
+int BackupObjectConverter(PyObject * o, void *address)
+{
+	if (!PyDict_Check(o) && !BackupRecordCheck(o)) {
+		PyErr_Format(PyExc_TypeError,
+			     "Backup must be dict or BackupRecord, not %s",
+			     Py_TYPE(o)->tp_name);
+		return 0;
+	}
+	*(PyObject **) address = o;
+	return 1;
+}
+
+/**
+ * Returns entry of backup section, NULL after last one.
+ */
+static void *BackupRecordEntry(GSM_Backup * backup, BackupRecordField field,
+			       int index)
+{
+	switch (field) {
+		case BACKUP_FIELD_PHONEPHONEBOOK:
+			return backup->PhonePhonebook[index];
+		case BACKUP_FIELD_SIMPHONEBOOK:
+			return backup->SIMPhonebook[index];
+		case BACKUP_FIELD_CALENDAR:
+			return backup->Calendar[index];
+		case BACKUP_FIELD_TODO:
+			return backup->ToDo[index];
+		default:
+			return NULL;
+	}
+}
+
+/**
+ * Converts single entry of backup section to Python.
+ */
+static PyObject *BackupRecordEntryToPython(BackupRecordField field,
+					   void *entry)
+{
+	switch (field) {
+		case BACKUP_FIELD_PHONEPHONEBOOK:
+		case BACKUP_FIELD_SIMPHONEBOOK:
+			return MemoryEntryToPython((GSM_MemoryEntry *) entry);
+		case BACKUP_FIELD_CALENDAR:
+			return CalendarToPython((GSM_CalendarEntry *) entry);
+		case BACKUP_FIELD_TODO:
+			return TodoToPython((GSM_ToDoEntry *) entry);
+		default:
+			break;
+	}
+	PyErr_SetString(PyExc_SystemError, "Invalid backup section");
+	return NULL;
+}
+
+/**
+ * Converts whole backup section to list.
+ */
+static PyObject *BackupRecordSection(GSM_Backup * backup,
+				     BackupRecordField field)
+{
+	PyObject *result;
+	PyObject *item;
+	void *entry;
+	int i;
+
+	result = PyList_New(0);
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; (entry = BackupRecordEntry(backup, field, i)) != NULL; i++) {
+		item = BackupRecordEntryToPython(field, entry);
+		if (item == NULL) {
+			Py_DECREF(result);
+			return NULL;
+		}
+		if (PyList_Append(result, item) != 0) {
+			Py_DECREF(item);
+			Py_DECREF(result);
+			return NULL;
+		}
+		Py_DECREF(item);
+	}
+	return result;
+}
+
+/**
+ * Converts single field of backup to Python.
+ */
+static PyObject *BackupRecordConvert(GSM_Backup * backup,
+				     BackupRecordField field)
+{
+	PyObject *dt;
+
+	switch (field) {
+		case BACKUP_FIELD_IMEI:
+			return PyUnicode_FromString(backup->IMEI);
+		case BACKUP_FIELD_MODEL:
+			return PyUnicode_FromString(backup->Model);
+		case BACKUP_FIELD_CREATOR:
+			return PyUnicode_FromString(backup->Creator);
+		case BACKUP_FIELD_PHONEPHONEBOOK:
+		case BACKUP_FIELD_SIMPHONEBOOK:
+		case BACKUP_FIELD_CALENDAR:
+		case BACKUP_FIELD_TODO:
+			return BackupRecordSection(backup, field);
+		case BACKUP_FIELD_DATETIME:
+			if (backup->DateTimeAvailable) {
+				dt = BuildPythonDateTime(&backup->DateTime);
+				if (dt != NULL) {
+					return dt;
+				}
+				PyErr_Clear();
+			}
+			Py_RETURN_NONE;
+		default:
+			break;
+	}
+	PyErr_SetString(PyExc_SystemError, "Invalid backup record field");
+	return NULL;
+}
+
+/**
+ * Returns field value, converting it on first access.
+ */
+static PyObject *BackupRecord_GetField(BackupRecordObject * self,
+				       BackupRecordField field)
+{
+	if (self->cache[field] == NULL) {
+		self->cache[field] = BackupRecordConvert(self->backup, field);
+		if (self->cache[field] == NULL)
+			return NULL;
+	}
+	Py_INCREF(self->cache[field]);
+	return self->cache[field];
+}
+
+/**
+ * Finds field by name, returns -1 if not found.
+ */
+static int BackupRecordFieldFromPython(PyObject * key)
+{
+	PyObject *field;
+
+	if (!PyUnicode_Check(key))
+		return -1;
+
+	field = PyDict_GetItemWithError(BackupRecordFieldIndex, key);
+	if (field == NULL) {
+		PyErr_Clear();
+		return -1;
+	}
+	return PyLong_AsLong(field);
+}
+
+PyObject *BackupToPython(GSM_Backup * backup)
+{
+	PyObject *result;
+	PyObject *value;
+	int i;
+
+	result = PyDict_New();
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; i < BACKUP_FIELD_LAST; i++) {
+		value = BackupRecordConvert(backup, (BackupRecordField) i);
+		if (value == NULL) {
+			Py_DECREF(result);
+			return NULL;
+		}
+		if (PyDict_SetItem(result, BackupRecordFieldKeys[i], value) != 0) {
+			Py_DECREF(value);
+			Py_DECREF(result);
+			return NULL;
+		}
+		Py_DECREF(value);
+	}
+	return result;
+}
+
+PyObject *BackupRecordFromBackup(GSM_Backup * backup)
+{
+	BackupRecordObject *self;
+
+	self = PyObject_GC_New(BackupRecordObject, &BackupRecordType);
+	if (self == NULL)
+		return NULL;
+
+	self->backup = backup;
+	memset(self->cache, 0, sizeof(self->cache));
+
+	PyObject_GC_Track(self);
+	return (PyObject *) self;
+}
+
+static int BackupRecord_traverse(BackupRecordObject * self, visitproc visit,
+				 void *arg)
+{
+	int i;
+
+	for (i = 0; i < BACKUP_FIELD_LAST; i++) {
+		Py_VISIT(self->cache[i]);
+	}
+	return 0;
+}
+
+static int BackupRecord_clear(BackupRecordObject * self)
+{
+	int i;
+
+	for (i = 0; i < BACKUP_FIELD_LAST; i++) {
+		Py_CLEAR(self->cache[i]);
+	}
+	return 0;
+}
+
+static void BackupRecord_dealloc(BackupRecordObject * self)
+{
+	PyObject_GC_UnTrack(self);
+	BackupRecord_clear(self);
+	if (self->backup != NULL) {
+		GSM_FreeBackup(self->backup);
+		free(self->backup);
+	}
+	PyObject_GC_Del(self);
+}
+
+static PyObject *BackupRecord_getattr(BackupRecordObject * self,
+				      void *closure)
+{
+	return BackupRecord_GetField(self,
+				     (BackupRecordField) (Py_intptr_t) closure);
+}
+
+static PyObject *BackupRecord_subscript(BackupRecordObject * self,
+				       PyObject * key)
+{
+	int field;
+
+	field = BackupRecordFieldFromPython(key);
+	if (field < 0) {
+		PyErr_SetObject(PyExc_KeyError, key);
+		return NULL;
+	}
+	return BackupRecord_GetField(self, (BackupRecordField) field);
+}
+
+static Py_ssize_t BackupRecord_length(BackupRecordObject * self)
+{
+	return BACKUP_FIELD_LAST;
+}
+
+static int BackupRecord_contains(BackupRecordObject * self, PyObject * key)
+{
+	return BackupRecordFieldFromPython(key) >= 0;
+}
+
+static PyObject *BackupRecord_keys(BackupRecordObject * self,
+				   PyObject * Py_UNUSED(ignored))
+{
+	PyObject *result;
+	int i;
+
+	result = PyList_New(BACKUP_FIELD_LAST);
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; i < BACKUP_FIELD_LAST; i++) {
+		Py_INCREF(BackupRecordFieldKeys[i]);
+		PyList_SET_ITEM(result, i, BackupRecordFieldKeys[i]);
+	}
+	return result;
+}
+
+static PyObject *BackupRecord_iter(BackupRecordObject * self)
+{
+	PyObject *keys;
+	PyObject *result;
+
+	keys = BackupRecord_keys(self, NULL);
+	if (keys == NULL)
+		return NULL;
+
+	result = PyObject_GetIter(keys);
+	Py_DECREF(keys);
+	return result;
+}
+
+static PyObject *BackupRecord_get(BackupRecordObject * self, PyObject * args)
+{
+	PyObject *key;
+	PyObject *def = Py_None;
+	int field;
+
+	if (!PyArg_ParseTuple(args, "O|O", &key, &def))
+		return NULL;
+
+	field = BackupRecordFieldFromPython(key);
+	if (field < 0) {
+		Py_INCREF(def);
+		return def;
+	}
+	return BackupRecord_GetField(self, (BackupRecordField) field);
+}
+
+static PyObject *BackupRecord_ToDict(BackupRecordObject * self,
+				     PyObject * Py_UNUSED(ignored))
+{
+	return BackupToPython(self->backup);
+}
+
+/* Iterator converting entries of backup section one by one */
+typedef struct {
+	PyObject_HEAD
+	BackupRecordObject *record;
+	BackupRecordField field;
+	int index;
+} BackupSectionIteratorObject;
+
+static PyObject *BackupSectionIterator_next(BackupSectionIteratorObject * it)
+{
+	void *entry;
+
+	entry = BackupRecordEntry(it->record->backup, it->field, it->index);
+	if (entry == NULL)
+		return NULL;
+
+	it->index++;
+	return BackupRecordEntryToPython(it->field, entry);
+}
+
+static void BackupSectionIterator_dealloc(BackupSectionIteratorObject * it)
+{
+	Py_XDECREF(it->record);
+	PyObject_Del(it);
+}
+
+static PyTypeObject BackupSectionIteratorType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"_gammu.BackupSectionIterator",	/*tp_name */
+	sizeof(BackupSectionIteratorObject),	/*tp_basicsize */
+	0,			/*tp_itemsize */
+	/* methods */
+	(destructor) BackupSectionIterator_dealloc,	/*tp_dealloc */
+	0,			/*tp_print */
+	0,			/*tp_getattr */
+	0,			/*tp_setattr */
+	0,			/*tp_compare */
+	0,			/*tp_repr */
+	0,			/*tp_as_number */
+	0,			/*tp_as_sequence */
+	0,			/*tp_as_mapping */
+	0,			/*tp_hash */
+	0,			/*tp_call */
+	0,			/*tp_str */
+	0,			/*tp_getattro */
+	0,			/*tp_setattro */
+	0,			/*tp_as_buffer */
+	Py_TPFLAGS_DEFAULT,	/*tp_flags */
+	"Iterator converting entries of backup section one by one.",	/* Documentation string */
+	0,			/* tp_traverse */
+	0,			/* tp_clear */
+	0,			/* tp_richcompare */
+	0,			/* tp_weaklistoffset */
+	PyObject_SelfIter,	/* tp_iter */
+	(iternextfunc) BackupSectionIterator_next,	/* tp_iternext */
+};
+
+static PyObject *BackupRecord_IterSection(BackupRecordObject * self,
+					  PyObject * args)
+{
+	PyObject *key;
+	BackupSectionIteratorObject *it;
+	int field;
+
+	if (!PyArg_ParseTuple(args, "U", &key))
+		return NULL;
+
+	field = BackupRecordFieldFromPython(key);
+	if (field != BACKUP_FIELD_PHONEPHONEBOOK
+	    && field != BACKUP_FIELD_SIMPHONEBOOK
+	    && field != BACKUP_FIELD_CALENDAR && field != BACKUP_FIELD_TODO) {
+		PyErr_Format(PyExc_ValueError, "Bad value for Section: '%U'",
+			     key);
+		return NULL;
+	}
+
+	it = PyObject_New(BackupSectionIteratorObject,
+			  &BackupSectionIteratorType);
+	if (it == NULL)
+		return NULL;
+
+	Py_INCREF(self);
+	it->record = self;
+	it->field = (BackupRecordField) field;
+	it->index = 0;
+
+	return (PyObject *) it;
+}
+
+static PyObject *BackupRecord_repr(BackupRecordObject * self)
+{
+	PyObject *imei;
+	PyObject *model;
+	PyObject *result;
+
+	imei = BackupRecord_GetField(self, BACKUP_FIELD_IMEI);
+	if (imei == NULL)
+		return NULL;
+
+	model = BackupRecord_GetField(self, BACKUP_FIELD_MODEL);
+	if (model == NULL) {
+		Py_DECREF(imei);
+		return NULL;
+	}
+
+	result = PyUnicode_FromFormat("<BackupRecord IMEI=%R Model=%R>", imei,
+				      model);
+	Py_DECREF(imei);
+	Py_DECREF(model);
+	return result;
+}
+
+static PyGetSetDef BackupRecord_getset[] = {
+	{"IMEI", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_IMEI},
+	{"Model", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_MODEL},
+	{"Creator", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_CREATOR},
+	{"PhonePhonebook", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_PHONEPHONEBOOK},
+	{"SIMPhonebook", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_SIMPHONEBOOK},
+	{"Calendar", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_CALENDAR},
+	{"ToDo", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_TODO},
+	{"DateTime", (getter) BackupRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) BACKUP_FIELD_DATETIME},
+	{NULL, NULL, NULL, NULL, NULL}	/* sentinel */
+};
+
+static struct PyMethodDef BackupRecord_methods[] = {
+	{"keys", (PyCFunction) BackupRecord_keys, METH_NOARGS,
+	 "keys()\n\nReturns list of field names.\n"},
+	{"get", (PyCFunction) BackupRecord_get, METH_VARARGS,
+	 "get(Key, Default = None)\n\nReturns field value or default.\n"},
+	{"IterSection", (PyCFunction) BackupRecord_IterSection, METH_VARARGS,
+	 "IterSection(Section)\n\n"
+	 "Returns iterator converting entries of section one by one, without "
+	 "keeping them in the record.\n\n"
+	 "@param Section: Name of section (PhonePhonebook, SIMPhonebook, "
+	 "Calendar or ToDo)\n"
+	 "@type Section: string\n"
+	 "@return: Iterator over section entries\n"
+	 "@rtype: iterator\n"},
+	{"ToDict", (PyCFunction) BackupRecord_ToDict, METH_NOARGS,
+	 "ToDict()\n\nConverts record to backup dictionary.\n"},
+	{NULL, NULL, 0, NULL}	/* sentinel */
+};
+
+static PyMappingMethods BackupRecord_as_mapping = {
+	(lenfunc) BackupRecord_length,	/* mp_length */
+	(binaryfunc) BackupRecord_subscript,	/* mp_subscript */
+	0,			/* mp_ass_subscript */
+};
+
+static PySequenceMethods BackupRecord_as_sequence = {
+	0,			/* sq_length */
+	0,			/* sq_concat */
+	0,			/* sq_repeat */
+	0,			/* sq_item */
+	0,			/* was_sq_slice */
+	0,			/* sq_ass_item */
+	0,			/* was_sq_ass_slice */
+	(objobjproc) BackupRecord_contains,	/* sq_contains */
+};
+
+static char BackupRecordType__doc__[] =
+    "Read only backup, which converts sections to Python on first access.\n\n"
+    "Fields can be accessed both as attributes and as keys, they are same as "
+    "keys in backup dictionary. SaveBackup stores the backup as it was read, "
+    "use ToDict to get modifiable dictionary.\n";
+
+static PyTypeObject BackupRecordType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"_gammu.BackupRecord",	/*tp_name */
+	sizeof(BackupRecordObject),	/*tp_basicsize */
+	0,			/*tp_itemsize */
+	/* methods */
+	(destructor) BackupRecord_dealloc,	/*tp_dealloc */
+	0,			/*tp_print */
+	0,			/*tp_getattr */
+	0,			/*tp_setattr */
+	0,			/*tp_compare */
+	(reprfunc) BackupRecord_repr,	/*tp_repr */
+	0,			/*tp_as_number */
+	&BackupRecord_as_sequence,	/*tp_as_sequence */
+	&BackupRecord_as_mapping,	/*tp_as_mapping */
+	0,			/*tp_hash */
+	0,			/*tp_call */
+	0,			/*tp_str */
+	0,			/*tp_getattro */
+	0,			/*tp_setattro */
+	0,			/*tp_as_buffer */
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,	/*tp_flags */
+	BackupRecordType__doc__,	/* Documentation string */
+	(traverseproc) BackupRecord_traverse,	/* tp_traverse */
+	(inquiry) BackupRecord_clear,	/* tp_clear */
+	0,			/* tp_richcompare */
+	0,			/* tp_weaklistoffset */
+	(getiterfunc) BackupRecord_iter,	/* tp_iter */
+	0,			/* tp_iternext */
+	BackupRecord_methods,	/* tp_methods */
+	0,			/* tp_members */
+	BackupRecord_getset,	/* tp_getset */
+};
+
+int gammu_backuprecord_init(PyObject * m)
+{
+	PyObject *field;
+	int i;
+
+	BackupRecordFieldIndex = PyDict_New();
+	if (BackupRecordFieldIndex == NULL)
+		return 0;
+
+	for (i = 0; i < BACKUP_FIELD_LAST; i++) {
+		BackupRecordFieldKeys[i] =
+		    PyUnicode_InternFromString(BackupRecordFieldNames[i]);
+		if (BackupRecordFieldKeys[i] == NULL)
+			return 0;
+		field = PyLong_FromLong(i);
+		if (field == NULL)
+			return 0;
+		if (PyDict_SetItem(BackupRecordFieldIndex,
+				   BackupRecordFieldKeys[i], field) != 0) {
+			Py_DECREF(field);
+			return 0;
+		}
+		Py_DECREF(field);
+	}
+
+	if (PyType_Ready(&BackupRecordType) < 0)
+		return 0;
+
+	if (PyType_Ready(&BackupSectionIteratorType) < 0)
+		return 0;
+
+	Py_INCREF(&BackupRecordType);
+
+	if (PyModule_AddObject(m, "BackupRecord", (PyObject *) & BackupRecordType)
+	    < 0)
+		return 0;
+
+	return 1;
+}
+
+#endif
+
+/*
+ * vim: noexpandtab sw=8 ts=8 sts=8:
+ */
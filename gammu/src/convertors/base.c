@@ -301,6 +301,30 @@ char *GetDataFromDict(PyObject * dict, const char *key, Py_ssize_t * len)
 	return ps;
 }
 
+int CopyDataFromDict(PyObject * dict, const char *key, Py_ssize_t maxlen,
+		     unsigned char *dest, Py_ssize_t * len)
+{
+	PyObject *o;
+	Py_buffer view;
+
+	o = PyDict_GetItemString(dict, key);
+	if (o == NULL) {
+		PyErr_Format(PyExc_ValueError, "Missing key in dictionary: %s",
+			     key);
+		return 0;
+	}
+	if (PyObject_GetBuffer(o, &view, PyBUF_SIMPLE) != 0) {
+		PyErr_Clear();
+		PyErr_Format(PyExc_ValueError, "Not a bytes string: %s",
+			     key);
+		return 0;
+	}
+	*len = view.len;
+	memcpy(dest, view.buf, view.len < maxlen ? view.len : maxlen);
+	PyBuffer_Release(&view);
+	return 1;
+}
+
 char *GetCStringLengthFromDict(PyObject * dict, const char *key,
 			       Py_ssize_t * length)
 {
@@ -200,7 +200,7 @@ PyObject *CalendarToPython(const GSM_CalendarEntry * entry)
 	PyObject *d;
 	int i;
 	wchar_t *s;
-	char *t;
+	PyObject *t;
 	GSM_DateTime dt;
 	int ignore;
 
@@ -506,15 +506,15 @@ PyObject *CalendarToPython(const GSM_CalendarEntry * entry)
 		Py_DECREF(f);
 	}
 
-	t = CalendarTypeToString(entry->Type);
+	t = EnumToPython(GAMMU_ENUM_CALENDAR_TYPE, entry->Type);
 	if (t == NULL) {
 		Py_DECREF(v);
 		return NULL;
 	}
 
-	r = Py_BuildValue("{s:i,s:s,s:O}",
+	r = Py_BuildValue("{s:i,s:O,s:O}",
 			  "Location", entry->Location, "Type", t, "Entries", v);
-	free(t);
+	Py_DECREF(t);
 	Py_DECREF(v);
 	return r;
 }
@@ -544,13 +544,18 @@ int CalendarFromPython(PyObject * dict, GSM_CalendarEntry * entry,
 			return 0;
 	}
 
-	t = GetCharFromDict(dict, "Type");
-	if (t == NULL)
-		return 0;
-	entry->Type = StringToCalendarType(t);
-	free(t);
-	if (entry->Type == 0)
-		return 0;
+	i = GetEnumFromDict(dict, "Type", GAMMU_ENUM_CALENDAR_TYPE);
+	if (i >= 0) {
+		entry->Type = i;
+	} else {
+		t = GetCharFromDict(dict, "Type");
+		if (t == NULL)
+			return 0;
+		entry->Type = StringToCalendarType(t);
+		free(t);
+		if (entry->Type == 0)
+			return 0;
+	}
 
 	o = PyDict_GetItemString(dict, "Entries");
 	if (o == NULL) {
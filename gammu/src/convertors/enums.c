@@ -0,0 +1,204 @@
+/*
+ * python-gammu - Phone communication library
+ * Copyright (C) 2003 - 2018 Michal Čihař
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along
+ * with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+ *
+ * vim: expandtab sw=4 ts=4 sts=4:
+ */
+
+/* Precomputed lookup tables between enums and Python strings */
+
+#include "convertors.h"
+
+/* Interned strings for enum values, indexed by value */
+static PyObject *enum_names[GAMMU_ENUM_LAST][GAMMU_ENUM_MAX_VALUE];
+
+/* Dictionaries mapping strings back to values */
+static PyObject *enum_values[GAMMU_ENUM_LAST];
+
+/**
+ * Converts enum value to string using convertor for given enum.
+ */
+static char *EnumToString(GammuEnum kind, int value)
+{
+	GSM_SMSValidity validity;
+
+	switch (kind) {
+		case GAMMU_ENUM_UDH_TYPE:
+			return UDHTypeToString(value);
+		case GAMMU_ENUM_SMS_TYPE:
+			return SMSTypeToString(value);
+		case GAMMU_ENUM_SMS_CODING:
+			return SMSCodingToString(value);
+		case GAMMU_ENUM_SMS_STATE:
+			return SMSStateToString(value);
+		case GAMMU_ENUM_SMS_VALIDITY:
+			if (value == GAMMU_ENUM_VALIDITY_NA) {
+				validity.Format = SMS_Validity_NotAvailable;
+				validity.Relative = 0;
+			} else {
+				validity.Format = SMS_Validity_RelativeFormat;
+				validity.Relative = value;
+			}
+			return SMSValidityToString(validity);
+		case GAMMU_ENUM_MEMORY_TYPE:
+			return MemoryTypeToString(value);
+		case GAMMU_ENUM_CALENDAR_TYPE:
+			return CalendarTypeToString(value);
+		default:
+			break;
+	}
+	PyErr_SetString(PyExc_SystemError, "Invalid enum");
+	return NULL;
+}
+
+/**
+ * Checks whether string convertor parses string back to the value. Strings
+ * which do not round trip are left out of reverse lookup, so that they are
+ * still handled by the convertor.
+ */
+static int EnumStringMatches(GammuEnum kind, char *s, int value)
+{
+	GSM_SMSValidity validity;
+
+	if (kind != GAMMU_ENUM_SMS_VALIDITY)
+		return 1;
+
+	validity = StringToSMSValidity(s);
+	if (validity.Format == 0) {
+		PyErr_Clear();
+		return 0;
+	}
+	if (value == GAMMU_ENUM_VALIDITY_NA)
+		return validity.Format == SMS_Validity_NotAvailable;
+	return validity.Format == SMS_Validity_RelativeFormat &&
+	    validity.Relative == value;
+}
+
+/**
+ * Stores single value in lookup tables, values without string are skipped.
+ */
+static int EnumTableAdd(GammuEnum kind, int value)
+{
+	char *s;
+	PyObject *name;
+	PyObject *number;
+	PyObject *existing;
+	int reverse;
+
+	s = EnumToString(kind, value);
+	if (s == NULL) {
+		PyErr_Clear();
+		return 1;
+	}
+
+	name = PyUnicode_InternFromString(s);
+	if (name == NULL) {
+		free(s);
+		return 0;
+	}
+	reverse = EnumStringMatches(kind, s, value);
+	free(s);
+
+	enum_names[kind][value] = name;
+	if (!reverse)
+		return 1;
+
+	number = PyLong_FromLong(value);
+	if (number == NULL)
+		return 0;
+
+	/* Keep first value for string, same as the string convertors */
+	existing = PyDict_SetDefault(enum_values[kind], name, number);
+	Py_DECREF(number);
+	if (existing == NULL)
+		return 0;
+
+	return 1;
+}
+
+int gammu_enums_init(void)
+{
+	int kind;
+	int value;
+
+	for (kind = 0; kind < GAMMU_ENUM_LAST; kind++) {
+		enum_values[kind] = PyDict_New();
+		if (enum_values[kind] == NULL)
+			return 0;
+
+		for (value = 0; value < GAMMU_ENUM_MAX_VALUE; value++) {
+			if (!EnumTableAdd(kind, value))
+				return 0;
+		}
+	}
+
+	return 1;
+}
+
+PyObject *EnumToPython(GammuEnum kind, int value)
+{
+	PyObject *result;
+	char *s;
+
+	if (value >= 0 && value < GAMMU_ENUM_MAX_VALUE) {
+		result = enum_names[kind][value];
+		if (result != NULL) {
+			Py_INCREF(result);
+			return result;
+		}
+	}
+
+	/* Not in table, convertor will report the error */
+	s = EnumToString(kind, value);
+	if (s == NULL)
+		return NULL;
+
+	result = PyUnicode_FromString(s);
+	free(s);
+	return result;
+}
+
+int EnumFromPython(GammuEnum kind, PyObject * o)
+{
+	PyObject *value;
+
+	if (!PyUnicode_Check(o))
+		return -1;
+
+	value = PyDict_GetItemWithError(enum_values[kind], o);
+	if (value == NULL) {
+		PyErr_Clear();
+		return -1;
+	}
+
+	return PyLong_AsLong(value);
+}
+
+int GetEnumFromDict(PyObject * dict, const char *key, GammuEnum kind)
+{
+	PyObject *o;
+
+	o = PyDict_GetItemString(dict, key);
+	if (o == NULL)
+		return -1;
+
+	return EnumFromPython(kind, o);
+}
+
+/*
+ * vim: noexpandtab sw=8 ts=8 sts=8:
+ */
@@ -73,7 +73,7 @@ PyObject *MemoryEntryToPython(const GSM_MemoryEntry * entry)
 	int i;
 	int j;
 	wchar_t *s;
-	char *t;
+	PyObject *t;
 	const GSM_BinaryPicture *bitmap;
 	const char *bmptype;
 
@@ -320,17 +320,17 @@ PyObject *MemoryEntryToPython(const GSM_MemoryEntry * entry)
 		Py_DECREF(f);
 	}
 
-	t = MemoryTypeToString(entry->MemoryType);
+	t = EnumToPython(GAMMU_ENUM_MEMORY_TYPE, entry->MemoryType);
 
 	if (t == NULL) {
 		Py_DECREF(v);
 		return NULL;
 	}
 
-	r = Py_BuildValue("{s:i,s:s,s:O}",
+	r = Py_BuildValue("{s:i,s:O,s:O}",
 			  "Location", entry->Location,
 			  "MemoryType", t, "Entries", v);
-	free(t);
+	Py_DECREF(t);
 	Py_DECREF(v);
 	return r;
 }
@@ -73,8 +73,13 @@ char *MemoryTypeToString(GSM_MemoryType t)
 GSM_MemoryType GetMemoryTypeFromDict(PyObject * dict, const char *key)
 {
 	char *s;
+	int value;
 	GSM_MemoryType result;
 
+	value = GetEnumFromDict(dict, key, GAMMU_ENUM_MEMORY_TYPE);
+	if (value >= 0)
+		return value;
+
 	s = GetCharFromDict(dict, key);
 	if (s == NULL)
 		return MEM_INVALID;
@@ -220,11 +220,59 @@ GSM_SMSFormat StringToSMSFormat(char *s)
 	}
 }
 
+/**
+ * Converts SMSValidity to Python string, using lookup table when possible.
+ */
+static PyObject *SMSValidityToPython(GSM_SMSValidity Validity)
+{
+	char *s;
+	PyObject *result;
+
+	if (Validity.Format == SMS_Validity_NotAvailable) {
+		return EnumToPython(GAMMU_ENUM_SMS_VALIDITY,
+				    GAMMU_ENUM_VALIDITY_NA);
+	}
+	if (Validity.Format == SMS_Validity_RelativeFormat) {
+		return EnumToPython(GAMMU_ENUM_SMS_VALIDITY, Validity.Relative);
+	}
+
+	s = SMSValidityToString(Validity);
+	if (s == NULL)
+		return NULL;
+
+	result = PyUnicode_FromString(s);
+	free(s);
+	return result;
+}
+
+/**
+ * Looks up SMSValidity from dictionary in lookup table, returns 0 if it
+ * is not found there.
+ */
+static int GetSMSValidityFromDict(PyObject * dict, GSM_SMSValidity * Validity)
+{
+	int value;
+
+	value = GetEnumFromDict(dict, "Validity", GAMMU_ENUM_SMS_VALIDITY);
+	if (value < 0)
+		return 0;
+
+	if (value == GAMMU_ENUM_VALIDITY_NA) {
+		Validity->Format = SMS_Validity_NotAvailable;
+		Validity->Relative = 0;
+	} else {
+		Validity->Format = SMS_Validity_RelativeFormat;
+		Validity->Relative = value;
+	}
+	return 1;
+}
+
 PyObject *SMSCToPython(GSM_SMSC * smsc)
 {
 	PyObject *ret;
+	PyObject *val;
 	wchar_t *name, *number, *defaultn;
-	char *val, *fmt;
+	char *fmt;
 
 	name = strGammuToPython(smsc->Name);
 	if (name == NULL) {
@@ -244,7 +292,7 @@ PyObject *SMSCToPython(GSM_SMSC * smsc)
 		return NULL;
 	}
 
-	val = SMSValidityToString(smsc->Validity);
+	val = SMSValidityToPython(smsc->Validity);
 	if (val == NULL) {
 		free(name);
 		free(number);
@@ -257,18 +305,18 @@ PyObject *SMSCToPython(GSM_SMSC * smsc)
 		free(name);
 		free(number);
 		free(defaultn);
-		free(val);
+		Py_DECREF(val);
 		return NULL;
 	}
 
-	ret = Py_BuildValue("{s:i,s:u,s:s,s:s,s:u,s:u}",
+	ret = Py_BuildValue("{s:i,s:u,s:s,s:O,s:u,s:u}",
 			    "Location", smsc->Location,
 			    "Name", name,
 			    "Format", fmt,
 			    "Validity", val,
 			    "Number", number, "DefaultNumber", defaultn);
 
-	free(val);
+	Py_DECREF(val);
 	free(fmt);
 	free(name);
 	free(number);
@@ -324,8 +372,9 @@ int SMSCFromPython(PyObject * dict, GSM_SMSC * smsc, gboolean complete)
 				return 0;
 		}
 
-		s = GetCharFromDict(dict, "Validity");
-		if (s == NULL) {
+		if (GetSMSValidityFromDict(dict, &(smsc->Validity))) {
+			/* Found in lookup table */
+		} else if ((s = GetCharFromDict(dict, "Validity")) == NULL) {
 			PyErr_Clear();
 		} else {
 			smsc->Validity = StringToSMSValidity(s);
@@ -359,13 +408,15 @@ int SMSCFromPython(PyObject * dict, GSM_SMSC * smsc, gboolean complete)
 		if (smsc->Format == 0)
 			return 0;
 
-		s = GetCharFromDict(dict, "Validity");
-		if (s == NULL)
-			return 0;
-		smsc->Validity = StringToSMSValidity(s);
-		free(s);
-		if (smsc->Validity.Format == 0)
-			return 0;
+		if (!GetSMSValidityFromDict(dict, &(smsc->Validity))) {
+			s = GetCharFromDict(dict, "Validity");
+			if (s == NULL)
+				return 0;
+			smsc->Validity = StringToSMSValidity(s);
+			free(s);
+			if (smsc->Validity.Format == 0)
+				return 0;
+		}
 	}
 
 	return 1;
@@ -616,6 +667,7 @@ char *SMSStateToString(GSM_SMS_State type)
 int UDHFromPython(PyObject * dict, GSM_UDHHeader * udh)
 {
 	char *s;
+	int i;
 	Py_ssize_t len;
 
 	if (!PyDict_Check(dict)) {
@@ -649,16 +701,20 @@ int UDHFromPython(PyObject * dict, GSM_UDHHeader * udh)
 		PyErr_Clear();
 	}
 
-	s = GetCharFromDict(dict, "Type");
-	if (s == NULL)
-		return 0;
-	udh->Type = StringToUDHType(s);
-	free(s);
-	if (udh->Type == 0)
-		return 0;
+	i = GetEnumFromDict(dict, "Type", GAMMU_ENUM_UDH_TYPE);
+	if (i >= 0) {
+		udh->Type = i;
+	} else {
+		s = GetCharFromDict(dict, "Type");
+		if (s == NULL)
+			return 0;
+		udh->Type = StringToUDHType(s);
+		free(s);
+		if (udh->Type == 0)
+			return 0;
+	}
 
-	s = GetDataFromDict(dict, "Text", &len);
-	if (s == NULL)
+	if (!CopyDataFromDict(dict, "Text", GSM_MAX_UDH_LENGTH, udh->Text, &len))
 		return 0;
 
 	udh->Length = len;
@@ -668,22 +724,20 @@ int UDHFromPython(PyObject * dict, GSM_UDHHeader * udh)
 		udh->Length = GSM_MAX_UDH_LENGTH;
 	}
 
-	memcpy(udh->Text, s, udh->Length);
-
 	return 1;
 }
 
 PyObject *UDHToPython(GSM_UDHHeader * udh)
 {
-	char *type;
+	PyObject *type;
 	PyObject *val;
 
-	type = UDHTypeToString(udh->Type);
+	type = EnumToPython(GAMMU_ENUM_UDH_TYPE, udh->Type);
 	if (type == NULL)
 		return NULL;
 
 	val = Py_BuildValue(
-		"{s:s,s:y#,s:i,s:i,s:i,s:i}",
+		"{s:O,s:y#,s:i,s:i,s:i,s:i}",
 		"Type", type,
 		"Text", udh->Text, (Py_ssize_t)udh->Length,
 		"ID8bit", udh->ID8bit,
@@ -692,7 +746,7 @@ PyObject *UDHToPython(GSM_UDHHeader * udh)
 		"AllParts", udh->AllParts
 	);
 
-	free(type);
+	Py_DECREF(type);
 
 	return val;
 }
@@ -706,6 +760,29 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 	int i;
 	Py_ssize_t len;
 
+	if (SMSRecordCheck(dict)) {
+		if (SMSRecordIsModified(dict)) {
+			/* Assigned fields have to be converted back */
+			o = SMSRecordToDict(dict);
+			if (o == NULL)
+				return 0;
+			i = SMSFromPython(o, sms, needslocation, needsfolder,
+					  needsnumber);
+			Py_DECREF(o);
+			if (!i)
+				return 0;
+		} else {
+			/* Records already contain converted message, they
+			 * have all fields, so only number can be missing */
+			*sms = *SMSRecordGetSMS(dict);
+		}
+		if (needsnumber && sms->Number[0] == 0 && sms->Number[1] == 0) {
+			PyErr_Format(PyExc_ValueError, "Missing SMS number!");
+			return 0;
+		}
+		return 1;
+	}
+
 	if (!PyDict_Check(dict)) {
 		PyErr_Format(PyExc_ValueError, "SMS is not a dictionary");
 		return 0;
@@ -764,8 +841,9 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 		}
 	}
 
-	s = GetCharFromDict(dict, "Coding");
-	if (s == NULL) {
+	if ((i = GetEnumFromDict(dict, "Coding", GAMMU_ENUM_SMS_CODING)) >= 0) {
+		sms->Coding = i;
+	} else if ((s = GetCharFromDict(dict, "Coding")) == NULL) {
 		sms->Coding = SMS_Coding_Default_No_Compression;
 		PyErr_Clear();
 	} else {
@@ -783,8 +861,8 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 		sms->Length = UnicodeLength(sms->Text);
 	} else {
 		/* Some UDH => copy as data */
-		s = GetDataFromDict(dict, "Text", &len);
-		if (s == NULL)
+		if (!CopyDataFromDict
+		    (dict, "Text", GSM_MAX_SMS_LENGTH, sms->Text, &len))
 			return 0;
 
 		sms->Length = len;
@@ -793,8 +871,6 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 			pyg_warning("SMS text too large, truncating!\n");
 			sms->Length = GSM_MAX_SMS_LENGTH;
 		}
-
-		memcpy(sms->Text, s, sms->Length);
 	}
 
 	if ((sms->Folder = GetIntFromDict(dict, "Folder")) == INT_INVALID) {
@@ -854,8 +930,10 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 		PyErr_Clear();
 	}
 
-	s = GetCharFromDict(dict, "Memory");
-	if (s == NULL || strcmp(s, "") == 0) {
+	if ((i = GetEnumFromDict(dict, "Memory", GAMMU_ENUM_MEMORY_TYPE)) >= 0) {
+		sms->Memory = i;
+	} else if ((s = GetCharFromDict(dict, "Memory")) == NULL
+		   || strcmp(s, "") == 0) {
 		sms->Memory = 0;
 		PyErr_Clear();
 		if (s != NULL) {
@@ -868,8 +946,9 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 			return 0;
 	}
 
-	s = GetCharFromDict(dict, "Type");
-	if (s == NULL) {
+	if ((i = GetEnumFromDict(dict, "Type", GAMMU_ENUM_SMS_TYPE)) >= 0) {
+		sms->PDU = i;
+	} else if ((s = GetCharFromDict(dict, "Type")) == NULL) {
 		sms->PDU = SMS_Submit;
 		PyErr_Clear();
 	} else {
@@ -891,8 +970,9 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 		PyErr_Clear();
 	}
 
-	s = GetCharFromDict(dict, "State");
-	if (s == NULL) {
+	if ((i = GetEnumFromDict(dict, "State", GAMMU_ENUM_SMS_STATE)) >= 0) {
+		sms->State = i;
+	} else if ((s = GetCharFromDict(dict, "State")) == NULL) {
 		PyErr_Clear();
 		sms->State = SMS_UnSent;
 	} else {
@@ -907,181 +987,26 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
 
 PyObject *SMSToPython(GSM_SMSMessage * sms)
 {
-	PyObject *udh;
-	PyObject *smsc;
-	char *mt;
-	wchar_t *name;
-	wchar_t *number;
-	PyObject *text;
-	char *type;
-	char *coding;
-	char *state;
-	PyObject *dt;
-	PyObject *smscdt;
-
-	PyObject *val;
-
-	smsc = SMSCToPython(&(sms->SMSC));
-	if (smsc == NULL)
-		return NULL;
-
-	udh = UDHToPython(&(sms->UDH));
-	if (udh == NULL) {
-		Py_DECREF(smsc);
-		return NULL;
-	}
-
-	if (sms->Memory == 0) {
-		mt = strdup("");
-	} else {
-		mt = MemoryTypeToString(sms->Memory);
-		if (mt == NULL) {
-			Py_DECREF(smsc);
-			Py_DECREF(udh);
-			return NULL;
-		}
-	}
-
-	name = strGammuToPython(sms->Name);
-	if (name == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		return NULL;
-	}
-
-	number = strGammuToPython(sms->Number);
-	if (number == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		return NULL;
-	}
-
-	if (sms->Coding != SMS_Coding_8bit) {
-		/* No UDH/User UDH => copy as text */
-		text = UnicodeStringToPythonL(sms->Text, sms->Length);
-	} else {
-		/* Some UDH => copy as data */
-		text =
-		    PyBytes_FromStringAndSize((char *)sms->Text, sms->Length);
-	}
-	if (text == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		return NULL;
-	}
-
-	type = SMSTypeToString(sms->PDU);
-	if (type == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		Py_DECREF(text);
-		return NULL;
-	}
-
-	coding = SMSCodingToString(sms->Coding);
-	if (coding == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		Py_DECREF(text);
-		free(type);
-		return NULL;
-	}
-
-	state = SMSStateToString(sms->State);
-	if (state == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		Py_DECREF(text);
-		free(type);
-		free(coding);
-		return NULL;
-	}
+	return SMSToPythonLazy(sms, -1);
+}
 
-	dt = BuildPythonDateTime(&(sms->DateTime));
-	if (dt == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		Py_DECREF(text);
-		free(type);
-		free(coding);
-		free(state);
-		return NULL;
+PyObject *SMSToPythonLazy(GSM_SMSMessage * sms, int lazy)
+{
+	if (lazy < 0) {
+		lazy = SMSRecordGetLazy();
 	}
-
-	smscdt = BuildPythonDateTime(&(sms->SMSCTime));
-	if (smscdt == NULL) {
-		Py_DECREF(smsc);
-		Py_DECREF(udh);
-		free(mt);
-		free(name);
-		free(number);
-		Py_DECREF(text);
-		free(type);
-		free(coding);
-		free(state);
-		Py_DECREF(dt);
-		return NULL;
+	if (lazy) {
+		return SMSRecordFromSMS(sms);
 	}
-
-	val = Py_BuildValue(
-		"{s:O,s:O,s:i,s:i,s:s,s:i,s:u,s:u,s:O,s:s,s:s,s:O,s:O,s:i,s:i,s:s,s:i,s:i,s:i,s:i,s:i}",
-		"SMSC", smsc,
-		"UDH", udh,
-		"Folder", (int)sms->Folder,
-		"InboxFolder", (int)sms->InboxFolder,
-		"Memory", mt,
-		"Location", (int)sms->Location,
-		"Name", name,
-		"Number", number,
-		"Text", text,
-		"Type", type,
-		"Coding", coding,
-		"DateTime", dt,
-		"SMSCDateTime", smscdt,
-		"DeliveryStatus", (int)sms->DeliveryStatus,
-		"ReplyViaSameSMSC", (int)sms->ReplyViaSameSMSC,
-		"State", state,
-		"Class", (int)sms->Class,
-		"MessageReference", (int)sms->MessageReference,
-		"ReplaceMessage", (int)sms->ReplaceMessage,
-		"RejectDuplicates", (int)sms->RejectDuplicates,
-		"Length", sms->Length
-	);
-
-	Py_DECREF(smsc);
-	Py_DECREF(udh);
-	free(mt);
-	free(name);
-	free(number);
-	Py_DECREF(text);
-	free(type);
-	free(coding);
-	free(state);
-	Py_DECREF(dt);
-	Py_DECREF(smscdt);
-
-	return val;
+	return SMSToPythonDict(sms);
 }
 
 PyObject *MultiSMSToPython(GSM_MultiSMSMessage * sms)
+{
+	return MultiSMSToPythonLazy(sms, -1);
+}
+
+PyObject *MultiSMSToPythonLazy(GSM_MultiSMSMessage * sms, int lazy)
 {
 	PyObject *val;
 	PyObject *item;
@@ -1092,7 +1017,7 @@ PyObject *MultiSMSToPython(GSM_MultiSMSMessage * sms)
 		return NULL;
 
 	for (i = 0; i < sms->Number; i++) {
-		item = SMSToPython(&(sms->SMS[i]));
+		item = SMSToPythonLazy(&(sms->SMS[i]), lazy);
 		if (item == NULL) {
 			Py_DECREF(val);
 			return NULL;
@@ -1132,7 +1057,7 @@ int MultiSMSFromPython(PyObject * list, GSM_MultiSMSMessage * sms)
 		item = PyList_GetItem(list, i);
 		if (item == NULL)
 			return 0;
-		if (!PyDict_Check(item)) {
+		if (!PyDict_Check(item) && !SMSRecordCheck(item)) {
 			PyErr_Format(PyExc_ValueError,
 				     "Element %" PY_FORMAT_SIZE_T
 				     "d in Messages is not dictionary", i);
@@ -2024,24 +1949,24 @@ int SMSInfoFromPython(PyObject * dict, GSM_MultiPartSMSInfo * entry)
 PyObject *SMSFolderToPython(GSM_OneSMSFolder * folder)
 {
 	wchar_t *name;
-	char *mt;
+	PyObject *mt;
 	PyObject *result;
 
 	name = strGammuToPython(folder->Name);
 	if (name == NULL)
 		return NULL;
 
-	mt = MemoryTypeToString(folder->Memory);
+	mt = EnumToPython(GAMMU_ENUM_MEMORY_TYPE, folder->Memory);
 	if (mt == NULL) {
 		free(name);
 		return NULL;
 	}
 
-	result = Py_BuildValue("{s:u,s:s,s:i}",
+	result = Py_BuildValue("{s:u,s:O,s:i}",
 			       "Name", name,
 			       "Memory", mt, "Inbox", (int)folder->InboxFolder);
 
-	free(mt);
+	Py_DECREF(mt);
 	free(name);
 
 	return result;
@@ -2076,6 +2001,11 @@ PyObject *SMSFoldersToPython(GSM_SMSFolders * folders)
 
 #ifdef GSM_ENABLE_BACKUP
 PyObject *SMSBackupToPython(GSM_SMS_Backup * sms)
+{
+	return SMSBackupToPythonLazy(sms, -1);
+}
+
+PyObject *SMSBackupToPythonLazy(GSM_SMS_Backup * sms, int lazy)
 {
 	PyObject *val;
 	PyObject *item;
@@ -2086,7 +2016,7 @@ PyObject *SMSBackupToPython(GSM_SMS_Backup * sms)
 		return NULL;
 
 	while (sms->SMS[i] != NULL) {
-		item = SMSToPython(sms->SMS[i]);
+		item = SMSToPythonLazy(sms->SMS[i], lazy);
 		if (item == NULL) {
 			Py_DECREF(val);
 			return NULL;
@@ -2127,7 +2057,7 @@ int SMSBackupFromPython(PyObject * list, GSM_SMS_Backup * sms)
 		if (item == NULL) {
 			return 0;
 		}
-		if (!PyDict_Check(item)) {
+		if (!PyDict_Check(item) && !SMSRecordCheck(item)) {
 			PyErr_Format(PyExc_ValueError,
 				     "Element %" PY_FORMAT_SIZE_T
 				     "d in SMS Backup is not dict", i);
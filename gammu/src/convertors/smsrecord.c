@@ -0,0 +1,698 @@
+/*
+ * python-gammu - Phone communication library
+ * Copyright (C) 2003 - 2018 Michal Čihař
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along
+ * with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+ *
+ * vim: expandtab sw=4 ts=4 sts=4:
+ */
+
+/* Lazy SMS records */
+
+#define PY_SSIZE_T_CLEAN
+#include "convertors.h"
+#include "misc.h"
+
+/* Whether SMSToPython creates records instead of dictionaries */
+static int lazy_sms = 0;
+
+/* Fields of record, same as keys in SMS dictionary */
+typedef enum {
+	SMS_FIELD_SMSC = 0,
+	SMS_FIELD_UDH,
+	SMS_FIELD_FOLDER,
+	SMS_FIELD_INBOXFOLDER,
+	SMS_FIELD_MEMORY,
+	SMS_FIELD_LOCATION,
+	SMS_FIELD_NAME,
+	SMS_FIELD_NUMBER,
+	SMS_FIELD_TEXT,
+	SMS_FIELD_TYPE,
+	SMS_FIELD_CODING,
+	SMS_FIELD_DATETIME,
+	SMS_FIELD_SMSCDATETIME,
+	SMS_FIELD_DELIVERYSTATUS,
+	SMS_FIELD_REPLYVIASAMESMSC,
+	SMS_FIELD_STATE,
+	SMS_FIELD_CLASS,
+	SMS_FIELD_MESSAGEREFERENCE,
+	SMS_FIELD_REPLACEMESSAGE,
+	SMS_FIELD_REJECTDUPLICATES,
+	SMS_FIELD_LENGTH,
+	SMS_FIELD_LAST
+} SMSRecordField;
+
+static const char *SMSRecordFieldNames[SMS_FIELD_LAST] = {
+	"SMSC",
+	"UDH",
+	"Folder",
+	"InboxFolder",
+	"Memory",
+	"Location",
+	"Name",
+	"Number",
+	"Text",
+	"Type",
+	"Coding",
+	"DateTime",
+	"SMSCDateTime",
+	"DeliveryStatus",
+	"ReplyViaSameSMSC",
+	"State",
+	"Class",
+	"MessageReference",
+	"ReplaceMessage",
+	"RejectDuplicates",
+	"Length",
+};
+
+/* Interned field names, shared by records and SMS dictionaries */
+static PyObject *SMSRecordFieldKeys[SMS_FIELD_LAST];
+
+/* Dictionary mapping field names to fields */
+static PyObject *SMSRecordFieldIndex = NULL;
+
+typedef struct {
+	PyObject_HEAD
+	GSM_SMSMessage sms;
+	/* Already converted fields */
+	PyObject *cache[SMS_FIELD_LAST];
+	/* Whether some field was assigned and differs from sms */
+	int modified;
+} SMSRecordObject;
+
+static PyTypeObject SMSRecordType;
+
+/* Read only buffer exporting part of message stored in record */
+typedef struct {
+	PyObject_HEAD
+	SMSRecordObject *record;
+	unsigned char *data;
+	Py_ssize_t length;
+} SMSRecordBufferObject;
+
+static int SMSRecordBuffer_getbuffer(SMSRecordBufferObject * self,
+				     Py_buffer * view, int flags)
+{
+	return PyBuffer_FillInfo(view, (PyObject *) self, self->data,
+				 self->length, 1, flags);
+}
+
+static void SMSRecordBuffer_dealloc(SMSRecordBufferObject * self)
+{
+	Py_XDECREF(self->record);
+	PyObject_Del(self);
+}
+
+static PyBufferProcs SMSRecordBuffer_as_buffer = {
+	(getbufferproc) SMSRecordBuffer_getbuffer,	/* bf_getbuffer */
+	0,			/* bf_releasebuffer */
+};
+
+static PyTypeObject SMSRecordBufferType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"_gammu.SMSRecordBuffer",	/*tp_name */
+	sizeof(SMSRecordBufferObject),	/*tp_basicsize */
+	0,			/*tp_itemsize */
+	/* methods */
+	(destructor) SMSRecordBuffer_dealloc,	/*tp_dealloc */
+	0,			/*tp_print */
+	0,			/*tp_getattr */
+	0,			/*tp_setattr */
+	0,			/*tp_compare */
+	0,			/*tp_repr */
+	0,			/*tp_as_number */
+	0,			/*tp_as_sequence */
+	0,			/*tp_as_mapping */
+	0,			/*tp_hash */
+	0,			/*tp_call */
+	0,			/*tp_str */
+	0,			/*tp_getattro */
+	0,			/*tp_setattro */
+	&SMSRecordBuffer_as_buffer,	/*tp_as_buffer */
+	Py_TPFLAGS_DEFAULT,	/*tp_flags */
+	"Buffer exporting data of SMS record.",	/* Documentation string */
+};
+
+/**
+ * Creates memoryview of record data, the view keeps record alive.
+ */
+static PyObject *SMSRecordMemoryView(SMSRecordObject * record,
+				     unsigned char *data, Py_ssize_t length)
+{
+	SMSRecordBufferObject *buffer;
+	PyObject *result;
+
+	buffer = PyObject_New(SMSRecordBufferObject, &SMSRecordBufferType);
+	if (buffer == NULL)
+		return NULL;
+
+	Py_INCREF(record);
+	buffer->record = record;
+	buffer->data = data;
+	buffer->length = length;
+
+	result = PyMemoryView_FromObject((PyObject *) buffer);
+	Py_DECREF(buffer);
+	return result;
+}
+
+void SMSRecordSetLazy(int lazy)
+{
+	lazy_sms = lazy;
+}
+
+int SMSRecordGetLazy(void)
+{
+	return lazy_sms;
+}
+
+int SMSRecordCheck(PyObject * o)
+{
+	return PyObject_TypeCheck(o, &SMSRecordType);
+}
+
+GSM_SMSMessage *SMSRecordGetSMS(PyObject * o)
+{
+	return &(((SMSRecordObject *) o)->sms);
+}
+
+int SMSRecordIsModified(PyObject * o)
+{
+	return ((SMSRecordObject *) o)->modified;
+}
+
+int SMSObjectConverter(PyObject * o, void *address)
+{
+	if (!PyDict_Check(o) && !SMSRecordCheck(o)) {
+		PyErr_Format(PyExc_TypeError,
+			     "SMS must be dict or SMSRecord, not %s",
+			     Py_TYPE(o)->tp_name);
+		return 0;
+	}
+	*(PyObject **) address = o;
+	return 1;
+}
+
+/**
+ * Converts single field of SMS to Python.
+ */
+static PyObject *SMSRecordConvert(GSM_SMSMessage * sms, SMSRecordField field)
+{
+	switch (field) {
+		case SMS_FIELD_SMSC:
+			return SMSCToPython(&(sms->SMSC));
+		case SMS_FIELD_UDH:
+			return UDHToPython(&(sms->UDH));
+		case SMS_FIELD_FOLDER:
+			return PyLong_FromLong(sms->Folder);
+		case SMS_FIELD_INBOXFOLDER:
+			return PyLong_FromLong(sms->InboxFolder);
+		case SMS_FIELD_MEMORY:
+			if (sms->Memory == 0) {
+				return PyUnicode_FromString("");
+			}
+			return EnumToPython(GAMMU_ENUM_MEMORY_TYPE, sms->Memory);
+		case SMS_FIELD_LOCATION:
+			return PyLong_FromLong(sms->Location);
+		case SMS_FIELD_NAME:
+			return UnicodeStringToPython(sms->Name);
+		case SMS_FIELD_NUMBER:
+			return UnicodeStringToPython(sms->Number);
+		case SMS_FIELD_TEXT:
+			if (sms->Coding != SMS_Coding_8bit) {
+				return UnicodeStringToPythonL(sms->Text,
+							      sms->Length);
+			}
+			return PyBytes_FromStringAndSize((char *)sms->Text,
+							 sms->Length);
+		case SMS_FIELD_TYPE:
+			return EnumToPython(GAMMU_ENUM_SMS_TYPE, sms->PDU);
+		case SMS_FIELD_CODING:
+			return EnumToPython(GAMMU_ENUM_SMS_CODING, sms->Coding);
+		case SMS_FIELD_DATETIME:
+			return BuildPythonDateTime(&(sms->DateTime));
+		case SMS_FIELD_SMSCDATETIME:
+			return BuildPythonDateTime(&(sms->SMSCTime));
+		case SMS_FIELD_DELIVERYSTATUS:
+			return PyLong_FromLong(sms->DeliveryStatus);
+		case SMS_FIELD_REPLYVIASAMESMSC:
+			return PyLong_FromLong(sms->ReplyViaSameSMSC);
+		case SMS_FIELD_STATE:
+			return EnumToPython(GAMMU_ENUM_SMS_STATE, sms->State);
+		case SMS_FIELD_CLASS:
+			return PyLong_FromLong(sms->Class);
+		case SMS_FIELD_MESSAGEREFERENCE:
+			return PyLong_FromLong(sms->MessageReference);
+		case SMS_FIELD_REPLACEMESSAGE:
+			return PyLong_FromLong(sms->ReplaceMessage);
+		case SMS_FIELD_REJECTDUPLICATES:
+			return PyLong_FromLong(sms->RejectDuplicates);
+		case SMS_FIELD_LENGTH:
+			return PyLong_FromLong(sms->Length);
+		default:
+			break;
+	}
+	PyErr_SetString(PyExc_SystemError, "Invalid SMS record field");
+	return NULL;
+}
+
+/**
+ * Returns field value, converting it on first access.
+ */
+static PyObject *SMSRecord_GetField(SMSRecordObject * self,
+				    SMSRecordField field)
+{
+	if (self->cache[field] == NULL) {
+		self->cache[field] = SMSRecordConvert(&(self->sms), field);
+		if (self->cache[field] == NULL)
+			return NULL;
+	}
+	Py_INCREF(self->cache[field]);
+	return self->cache[field];
+}
+
+/**
+ * Finds field by name, returns -1 if not found.
+ */
+static int SMSRecordFieldFromPython(PyObject * key)
+{
+	PyObject *field;
+
+	if (!PyUnicode_Check(key))
+		return -1;
+
+	field = PyDict_GetItemWithError(SMSRecordFieldIndex, key);
+	if (field == NULL) {
+		PyErr_Clear();
+		return -1;
+	}
+	return PyLong_AsLong(field);
+}
+
+PyObject *SMSToPythonDict(GSM_SMSMessage * sms)
+{
+	PyObject *result;
+	PyObject *value;
+	int i;
+
+	result = PyDict_New();
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		value = SMSRecordConvert(sms, (SMSRecordField) i);
+		if (value == NULL) {
+			Py_DECREF(result);
+			return NULL;
+		}
+		if (PyDict_SetItem(result, SMSRecordFieldKeys[i], value) != 0) {
+			Py_DECREF(value);
+			Py_DECREF(result);
+			return NULL;
+		}
+		Py_DECREF(value);
+	}
+	return result;
+}
+
+PyObject *SMSRecordFromSMS(const GSM_SMSMessage * sms)
+{
+	SMSRecordObject *self;
+
+	self = PyObject_GC_New(SMSRecordObject, &SMSRecordType);
+	if (self == NULL)
+		return NULL;
+
+	self->sms = *sms;
+	memset(self->cache, 0, sizeof(self->cache));
+	self->modified = 0;
+
+	PyObject_GC_Track(self);
+	return (PyObject *) self;
+}
+
+static int SMSRecord_traverse(SMSRecordObject * self, visitproc visit,
+			      void *arg)
+{
+	int i;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		Py_VISIT(self->cache[i]);
+	}
+	return 0;
+}
+
+static int SMSRecord_clear(SMSRecordObject * self)
+{
+	int i;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		Py_CLEAR(self->cache[i]);
+	}
+	return 0;
+}
+
+static void SMSRecord_dealloc(SMSRecordObject * self)
+{
+	PyObject_GC_UnTrack(self);
+	SMSRecord_clear(self);
+	PyObject_GC_Del(self);
+}
+
+static PyObject *SMSRecord_getattr(SMSRecordObject * self, void *closure)
+{
+	return SMSRecord_GetField(self, (SMSRecordField) (Py_intptr_t) closure);
+}
+
+static PyObject *SMSRecord_GetUDHData(SMSRecordObject * self, void *closure)
+{
+	return SMSRecordMemoryView(self, self->sms.UDH.Text,
+				   self->sms.UDH.Length);
+}
+
+static PyObject *SMSRecord_GetTextData(SMSRecordObject * self, void *closure)
+{
+	if (self->sms.Coding != SMS_Coding_8bit) {
+		Py_RETURN_NONE;
+	}
+	return SMSRecordMemoryView(self, self->sms.Text, self->sms.Length);
+}
+
+static int SMSRecord_ass_subscript(SMSRecordObject * self, PyObject * key,
+				   PyObject * value)
+{
+	int field;
+
+	field = SMSRecordFieldFromPython(key);
+	if (field < 0) {
+		PyErr_SetObject(PyExc_KeyError, key);
+		return -1;
+	}
+	if (value == NULL) {
+		PyErr_SetString(PyExc_TypeError,
+				"SMS record fields can not be deleted");
+		return -1;
+	}
+
+	/* Value is converted back together with whole message */
+	Py_INCREF(value);
+	Py_XSETREF(self->cache[field], value);
+	self->modified = 1;
+	return 0;
+}
+
+static PyObject *SMSRecord_subscript(SMSRecordObject * self, PyObject * key)
+{
+	int field;
+
+	field = SMSRecordFieldFromPython(key);
+	if (field < 0) {
+		PyErr_SetObject(PyExc_KeyError, key);
+		return NULL;
+	}
+	return SMSRecord_GetField(self, (SMSRecordField) field);
+}
+
+static Py_ssize_t SMSRecord_length(SMSRecordObject * self)
+{
+	return SMS_FIELD_LAST;
+}
+
+static int SMSRecord_contains(SMSRecordObject * self, PyObject * key)
+{
+	return SMSRecordFieldFromPython(key) >= 0;
+}
+
+static PyObject *SMSRecord_keys(SMSRecordObject * self,
+				PyObject * Py_UNUSED(ignored))
+{
+	PyObject *result;
+	int i;
+
+	result = PyList_New(SMS_FIELD_LAST);
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		Py_INCREF(SMSRecordFieldKeys[i]);
+		PyList_SET_ITEM(result, i, SMSRecordFieldKeys[i]);
+	}
+	return result;
+}
+
+static PyObject *SMSRecord_iter(SMSRecordObject * self)
+{
+	PyObject *keys;
+	PyObject *result;
+
+	keys = SMSRecord_keys(self, NULL);
+	if (keys == NULL)
+		return NULL;
+
+	result = PyObject_GetIter(keys);
+	Py_DECREF(keys);
+	return result;
+}
+
+static PyObject *SMSRecord_get(SMSRecordObject * self, PyObject * args)
+{
+	PyObject *key;
+	PyObject *def = Py_None;
+	int field;
+
+	if (!PyArg_ParseTuple(args, "O|O", &key, &def))
+		return NULL;
+
+	field = SMSRecordFieldFromPython(key);
+	if (field < 0) {
+		Py_INCREF(def);
+		return def;
+	}
+	return SMSRecord_GetField(self, (SMSRecordField) field);
+}
+
+static PyObject *SMSRecord_ToDict(SMSRecordObject * self,
+				  PyObject * Py_UNUSED(ignored))
+{
+	PyObject *result;
+	PyObject *value;
+	int i;
+
+	if (!self->modified)
+		return SMSToPythonDict(&(self->sms));
+
+	/* Use assigned values instead of stored message */
+	result = PyDict_New();
+	if (result == NULL)
+		return NULL;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		value = SMSRecord_GetField(self, (SMSRecordField) i);
+		if (value == NULL) {
+			Py_DECREF(result);
+			return NULL;
+		}
+		if (PyDict_SetItem(result, SMSRecordFieldKeys[i], value) != 0) {
+			Py_DECREF(value);
+			Py_DECREF(result);
+			return NULL;
+		}
+		Py_DECREF(value);
+	}
+	return result;
+}
+
+PyObject *SMSRecordToDict(PyObject * o)
+{
+	return SMSRecord_ToDict((SMSRecordObject *) o, NULL);
+}
+
+static PyObject *SMSRecord_repr(SMSRecordObject * self)
+{
+	PyObject *dict;
+	PyObject *result;
+
+	dict = SMSRecord_ToDict(self, NULL);
+	if (dict == NULL)
+		return NULL;
+
+	result = PyUnicode_FromFormat("SMSRecord(%R)", dict);
+	Py_DECREF(dict);
+	return result;
+}
+
+static PyGetSetDef SMSRecord_getset[] = {
+	{"SMSC", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_SMSC},
+	{"UDH", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_UDH},
+	{"Folder", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_FOLDER},
+	{"InboxFolder", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_INBOXFOLDER},
+	{"Memory", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_MEMORY},
+	{"Location", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_LOCATION},
+	{"Name", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_NAME},
+	{"Number", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_NUMBER},
+	{"Text", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_TEXT},
+	{"Type", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_TYPE},
+	{"Coding", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_CODING},
+	{"DateTime", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_DATETIME},
+	{"SMSCDateTime", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_SMSCDATETIME},
+	{"DeliveryStatus", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_DELIVERYSTATUS},
+	{"ReplyViaSameSMSC", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_REPLYVIASAMESMSC},
+	{"State", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_STATE},
+	{"Class", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_CLASS},
+	{"MessageReference", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_MESSAGEREFERENCE},
+	{"ReplaceMessage", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_REPLACEMESSAGE},
+	{"RejectDuplicates", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_REJECTDUPLICATES},
+	{"Length", (getter) SMSRecord_getattr, NULL, NULL,
+	 (void *)(Py_intptr_t) SMS_FIELD_LENGTH},
+	{"UDHData", (getter) SMSRecord_GetUDHData, NULL,
+	 "Read only memoryview of raw UDH, without copying it. Assigned "
+	 "fields are not reflected.", NULL},
+	{"TextData", (getter) SMSRecord_GetTextData, NULL,
+	 "Read only memoryview of 8-bit message data, without copying it, "
+	 "None for text messages. Assigned fields are not reflected.", NULL},
+	{NULL, NULL, NULL, NULL, NULL}	/* sentinel */
+};
+
+static struct PyMethodDef SMSRecord_methods[] = {
+	{"keys", (PyCFunction) SMSRecord_keys, METH_NOARGS,
+	 "keys()\n\nReturns list of field names.\n"},
+	{"get", (PyCFunction) SMSRecord_get, METH_VARARGS,
+	 "get(Key, Default = None)\n\nReturns field value or default.\n"},
+	{"ToDict", (PyCFunction) SMSRecord_ToDict, METH_NOARGS,
+	 "ToDict()\n\nConverts record to SMS dictionary.\n"},
+	{NULL, NULL, 0, NULL}	/* sentinel */
+};
+
+static PyMappingMethods SMSRecord_as_mapping = {
+	(lenfunc) SMSRecord_length,	/* mp_length */
+	(binaryfunc) SMSRecord_subscript,	/* mp_subscript */
+	(objobjargproc) SMSRecord_ass_subscript,	/* mp_ass_subscript */
+};
+
+static PySequenceMethods SMSRecord_as_sequence = {
+	0,			/* sq_length */
+	0,			/* sq_concat */
+	0,			/* sq_repeat */
+	0,			/* sq_item */
+	0,			/* was_sq_slice */
+	0,			/* sq_ass_item */
+	0,			/* was_sq_ass_slice */
+	(objobjproc) SMSRecord_contains,	/* sq_contains */
+};
+
+static char SMSRecordType__doc__[] =
+    "SMS record, which converts fields to Python on first access.\n\n"
+    "Fields can be accessed both as attributes and as keys, they are same as "
+    "keys in SMS dictionary. Fields can be changed by assigning to keys, "
+    "the message is then converted back from Python when it is used. Use "
+    "ToDict to get dictionary.\n";
+
+static PyTypeObject SMSRecordType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"_gammu.SMSRecord",	/*tp_name */
+	sizeof(SMSRecordObject),	/*tp_basicsize */
+	0,			/*tp_itemsize */
+	/* methods */
+	(destructor) SMSRecord_dealloc,	/*tp_dealloc */
+	0,			/*tp_print */
+	0,			/*tp_getattr */
+	0,			/*tp_setattr */
+	0,			/*tp_compare */
+	(reprfunc) SMSRecord_repr,	/*tp_repr */
+	0,			/*tp_as_number */
+	&SMSRecord_as_sequence,	/*tp_as_sequence */
+	&SMSRecord_as_mapping,	/*tp_as_mapping */
+	0,			/*tp_hash */
+	0,			/*tp_call */
+	0,			/*tp_str */
+	0,			/*tp_getattro */
+	0,			/*tp_setattro */
+	0,			/*tp_as_buffer */
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,	/*tp_flags */
+	SMSRecordType__doc__,	/* Documentation string */
+	(traverseproc) SMSRecord_traverse,	/* tp_traverse */
+	(inquiry) SMSRecord_clear,	/* tp_clear */
+	0,			/* tp_richcompare */
+	0,			/* tp_weaklistoffset */
+	(getiterfunc) SMSRecord_iter,	/* tp_iter */
+	0,			/* tp_iternext */
+	SMSRecord_methods,	/* tp_methods */
+	0,			/* tp_members */
+	SMSRecord_getset,	/* tp_getset */
+};
+
+int gammu_smsrecord_init(PyObject * m)
+{
+	PyObject *field;
+	int i;
+
+	SMSRecordFieldIndex = PyDict_New();
+	if (SMSRecordFieldIndex == NULL)
+		return 0;
+
+	for (i = 0; i < SMS_FIELD_LAST; i++) {
+		SMSRecordFieldKeys[i] =
+		    PyUnicode_InternFromString(SMSRecordFieldNames[i]);
+		if (SMSRecordFieldKeys[i] == NULL)
+			return 0;
+		field = PyLong_FromLong(i);
+		if (field == NULL)
+			return 0;
+		if (PyDict_SetItem(SMSRecordFieldIndex, SMSRecordFieldKeys[i],
+				   field) != 0) {
+			Py_DECREF(field);
+			return 0;
+		}
+		Py_DECREF(field);
+	}
+
+	if (PyType_Ready(&SMSRecordType) < 0)
+		return 0;
+
+	if (PyType_Ready(&SMSRecordBufferType) < 0)
+		return 0;
+
+	Py_INCREF(&SMSRecordType);
+
+	if (PyModule_AddObject(m, "SMSRecord", (PyObject *) & SMSRecordType) < 0)
+		return 0;
+
+	return 1;
+}
+
+/*
+ * vim: noexpandtab sw=8 ts=8 sts=8:
+ */
@@ -22,52 +22,32 @@
 /* DateTime conversions */
 
 #include "convertors.h"
+#include <datetime.h>
 
-PyObject *BuildPythonDateTime(const GSM_DateTime * dt)
+int gammu_datetime_init(void)
 {
-	PyObject *pModule;
-	PyObject *result;
+	/* Load datetime C API, it is used for all conversions */
+	PyDateTime_IMPORT;
+	return PyDateTimeAPI != NULL;
+}
 
+PyObject *BuildPythonDateTime(const GSM_DateTime * dt)
+{
 	if (dt->Year == 0) {
 		Py_RETURN_NONE;
 	}
 
-	/* import datetime */
-	pModule = PyImport_ImportModule("datetime");
-	if (pModule == NULL)
-		return NULL;
-
 	/* create datetime object */
-	result = PyObject_CallMethod(pModule,
-				     "datetime",
-				     "iiiiii",
-				     dt->Year,
-				     dt->Month,
-				     dt->Day, dt->Hour, dt->Minute, dt->Second);
-
-	Py_DECREF(pModule);
-
-	return result;
+	return PyDateTime_FromDateAndTime(dt->Year,
+					  dt->Month,
+					  dt->Day,
+					  dt->Hour, dt->Minute, dt->Second, 0);
 }
 
 PyObject *BuildPythonTime(const GSM_DateTime * dt)
 {
-	PyObject *pModule;
-	PyObject *result;
-
-	/* import datetime */
-	pModule = PyImport_ImportModule("datetime");
-	if (pModule == NULL)
-		return NULL;
-
-	/* create datetime object */
-	result = PyObject_CallMethod(pModule,
-				     "time",
-				     "iii", dt->Hour, dt->Minute, dt->Second);
-
-	Py_DECREF(pModule);
-
-	return result;
+	/* create time object */
+	return PyTime_FromTime(dt->Hour, dt->Minute, dt->Second, 0);
 }
 
 int BuildGSMDateTime(PyObject * pydt, GSM_DateTime * dt)
@@ -79,6 +59,17 @@ int BuildGSMDateTime(PyObject * pydt, GSM_DateTime * dt)
 	if (pydt == Py_None)
 		return 1;
 
+	/* Fast path for datetime.datetime, avoids attribute lookups */
+	if (PyDateTime_Check(pydt)) {
+		dt->Year = PyDateTime_GET_YEAR(pydt);
+		dt->Month = PyDateTime_GET_MONTH(pydt);
+		dt->Day = PyDateTime_GET_DAY(pydt);
+		dt->Hour = PyDateTime_DATE_GET_HOUR(pydt);
+		dt->Minute = PyDateTime_DATE_GET_MINUTE(pydt);
+		dt->Second = PyDateTime_DATE_GET_SECOND(pydt);
+		return 1;
+	}
+
 	result = PyObject_GetAttrString(pydt, "year");
 	if (result == NULL) {
 		PyErr_Format(PyExc_ValueError, "Attribute year is missing");
@@ -178,6 +169,14 @@ int BuildGSMDate(PyObject * pydt, GSM_DateTime * dt)
 	if (pydt == Py_None)
 		return 1;
 
+	/* Fast path for datetime.date (and datetime.datetime) */
+	if (PyDate_Check(pydt)) {
+		dt->Year = PyDateTime_GET_YEAR(pydt);
+		dt->Month = PyDateTime_GET_MONTH(pydt);
+		dt->Day = PyDateTime_GET_DAY(pydt);
+		return 1;
+	}
+
 	result = PyObject_GetAttrString(pydt, "year");
 	if (result == NULL)
 		return 0;
@@ -220,6 +219,14 @@ int BuildGSMTime(PyObject * pydt, GSM_DateTime * dt)
 	if (pydt == Py_None)
 		return 1;
 
+	/* Fast path for datetime.time */
+	if (PyTime_Check(pydt)) {
+		dt->Hour = PyDateTime_TIME_GET_HOUR(pydt);
+		dt->Minute = PyDateTime_TIME_GET_MINUTE(pydt);
+		dt->Second = PyDateTime_TIME_GET_SECOND(pydt);
+		return 1;
+	}
+
 	result = PyObject_GetAttrString(pydt, "hour");
 	if (result == NULL)
 		return 0;
@@ -79,7 +79,7 @@ PyObject *TodoToPython(const GSM_ToDoEntry * entry)
 	int i;
 	wchar_t *s;
 	char *p;
-	char *t;
+	PyObject *t;
 
 	v = PyList_New(0);
 	if (v == NULL)
@@ -260,18 +260,18 @@ PyObject *TodoToPython(const GSM_ToDoEntry * entry)
 		return NULL;
 	}
 
-	t = CalendarTypeToString(entry->Type);
+	t = EnumToPython(GAMMU_ENUM_CALENDAR_TYPE, entry->Type);
 	if (t == NULL) {
 		free(p);
 		Py_DECREF(v);
 		return NULL;
 	}
 
-	r = Py_BuildValue("{s:i,s:s,s:s,s:O}",
+	r = Py_BuildValue("{s:i,s:O,s:s,s:O}",
 			  "Location", entry->Location,
 			  "Type", t, "Priority", p, "Entries", v);
 	free(p);
-	free(t);
+	Py_DECREF(t);
 	Py_DECREF(v);
 	return r;
 }
@@ -301,13 +301,18 @@ int TodoFromPython(PyObject * dict, GSM_ToDoEntry * entry, int needs_location)
 			return 0;
 	}
 
-	t = GetCharFromDict(dict, "Type");
-	if (t == NULL)
-		return 0;
-	entry->Type = StringToCalendarType(t);
-	free(t);
-	if (entry->Type == 0)
-		return 0;
+	i = GetEnumFromDict(dict, "Type", GAMMU_ENUM_CALENDAR_TYPE);
+	if (i >= 0) {
+		entry->Type = i;
+	} else {
+		t = GetCharFromDict(dict, "Type");
+		if (t == NULL)
+			return 0;
+		entry->Type = StringToCalendarType(t);
+		free(t);
+		if (entry->Type == 0)
+			return 0;
+	}
 
 	p = GetCharFromDict(dict, "Priority");
 	if (p == NULL)
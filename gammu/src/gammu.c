@@ -30,6 +30,9 @@
 /* Locales */
 #include <locale.h>
 
+/* INT_MAX */
+#include <limits.h>
+
 /* File creation and permissions */
 #include <sys/stat.h>
 #include <fcntl.h>
@@ -45,6 +48,16 @@
 #include <strings.h>
 #endif
 
+/* Iterator attributes */
+#include <structmember.h>
+
+/* Sleeping between sent messages */
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
 /* For locking */
 #ifdef WITH_THREAD
 #include <pythread.h>
@@ -97,7 +110,45 @@
 
 PyObject    *DebugFile;
 
-#define MAX_EVENTS 10
+/* Default capacity of incoming events queues */
+#define DEFAULT_EVENT_QUEUE_CAPACITY 16
+
+/* Types of incoming events, used as index to queues */
+typedef enum {
+    EVENT_CALL = 0,
+    EVENT_SMS,
+    EVENT_CB,
+    EVENT_USSD,
+    EVENT_LAST
+} IncomingEventType;
+
+static const char *IncomingEventNames[EVENT_LAST] = {"Call", "SMS", "CB", "USSD"};
+
+/* What to do with new incoming event when queue is full */
+typedef enum {
+    QUEUE_GROW = 1,
+    QUEUE_DROP_OLDEST,
+    QUEUE_DROP_NEWEST,
+} EventQueuePolicy;
+
+/* Ring buffer holding pending incoming events */
+typedef struct {
+    void                **items;
+    Py_ssize_t          allocated;
+    Py_ssize_t          head;
+    Py_ssize_t          count;
+    Py_ssize_t          enqueued;
+    Py_ssize_t          dropped;
+    Py_ssize_t          high_water;
+} EventQueue;
+
+#ifdef WITH_THREAD
+#define LOCK_EVENT_QUEUE(sm) PyThread_acquire_lock((sm)->queue_mutex, 1);
+#define UNLOCK_EVENT_QUEUE(sm) PyThread_release_lock((sm)->queue_mutex);
+#else
+#define LOCK_EVENT_QUEUE(sm)
+#define UNLOCK_EVENT_QUEUE(sm)
+#endif
 
 /* ----------------------------------------------------- */
 
@@ -110,17 +161,18 @@ typedef struct {
     PyObject            *IncomingCallback;
     volatile GSM_Error  SMSStatus;
     volatile int        MessageReference;
-    GSM_Call            *IncomingCallQueue[MAX_EVENTS + 1];
-    GSM_SMSMessage      *IncomingSMSQueue[MAX_EVENTS + 1];
-    GSM_CBMessage       *IncomingCBQueue[MAX_EVENTS + 1];
-    GSM_USSDMessage     *IncomingUSSDQueue[MAX_EVENTS + 1];
+    EventQueue          IncomingQueue[EVENT_LAST];
+    Py_ssize_t          event_queue_capacity;
+    EventQueuePolicy    event_queue_policy;
     GSM_MemoryType      memory_entry_cache_type;
     int                 memory_entry_cache;
     int                 todo_entry_cache;
     int                 calendar_entry_cache;
     int                 in_callback;        /* Flag to prevent reentrancy: set to 1 during callback execution */
+    int                 incoming_batch;     /* Whether to deliver all pending events at once */
 #ifdef WITH_THREAD
     PyThread_type_lock mutex;
+    PyThread_type_lock queue_mutex;
 #endif
 } StateMachineObject;
 
@@ -216,284 +268,324 @@ static void SendSMSStatus (GSM_StateMachine *s, int status, int mr, void *user)
 }
 
 /**
- * Incoming call callback.
+ * Resizes event queue storage, it has to be big enough to hold all queued events.
  */
-static void IncomingCall (GSM_StateMachine *s, GSM_Call *call, void *user) {
+static int EventQueueResize(EventQueue *q, Py_ssize_t size) {
+    void **items;
+    Py_ssize_t i;
+
+    items = (void **)malloc(size * sizeof(void *));
+    if (items == NULL) return 0;
+
+    for (i = 0; i < q->count; i++) {
+        items[i] = q->items[(q->head + i) % q->allocated];
+    }
+
+    free(q->items);
+    q->items = items;
+    q->allocated = size;
+    q->head = 0;
+
+    return 1;
+}
+
+/**
+ * Removes oldest event from the queue.
+ */
+static void *EventQueuePop(EventQueue *q) {
+    void *item;
+
+    if (q->count == 0) return NULL;
+
+    item = q->items[q->head];
+    q->head = (q->head + 1) % q->allocated;
+    q->count--;
+
+    return item;
+}
+
+/**
+ * Removes newest event from the queue.
+ */
+static void *EventQueuePopNewest(EventQueue *q) {
+    if (q->count == 0) return NULL;
+
+    q->count--;
+
+    return q->items[(q->head + q->count) % q->allocated];
+}
+
+/**
+ * Frees all events in the queue and its storage.
+ */
+static void EventQueueFree(EventQueue *q) {
+    while (q->count > 0) {
+        free(EventQueuePop(q));
+    }
+    free(q->items);
+    q->items = NULL;
+    q->allocated = 0;
+    q->head = 0;
+}
+
+/**
+ * Appends event to the queue applying overflow policy, takes ownership of the item.
+ */
+static void EventQueuePush(StateMachineObject *sm, IncomingEventType type, void *item) {
+    EventQueue *q = &(sm->IncomingQueue[type]);
+    Py_ssize_t size;
+
+    LOCK_EVENT_QUEUE(sm)
+
+    if (q->count == q->allocated) {
+        if (sm->event_queue_policy == QUEUE_GROW || q->allocated < sm->event_queue_capacity) {
+            size = q->allocated * 2;
+            if (size < sm->event_queue_capacity) size = sm->event_queue_capacity;
+            if (!EventQueueResize(q, size)) {
+                q->dropped++;
+                UNLOCK_EVENT_QUEUE(sm)
+                free(item);
+                pyg_error("Incoming %s queue overflow, can not allocate memory!\n", IncomingEventNames[type]);
+                return;
+            }
+        } else if (sm->event_queue_policy == QUEUE_DROP_OLDEST) {
+            free(EventQueuePop(q));
+            q->dropped++;
+            pyg_warning("Incoming %s queue overflow, dropping oldest event!\n", IncomingEventNames[type]);
+        } else {
+            q->dropped++;
+            UNLOCK_EVENT_QUEUE(sm)
+            free(item);
+            pyg_error("Incoming %s queue overflow!\n", IncomingEventNames[type]);
+            return;
+        }
+    }
+
+    q->items[(q->head + q->count) % q->allocated] = item;
+    q->count++;
+    q->enqueued++;
+    if (q->count > q->high_water) q->high_water = q->count;
+
+    UNLOCK_EVENT_QUEUE(sm)
+}
+
+/**
+ * Validates that callback belongs to our state machine.
+ */
+static StateMachineObject *IncomingStateMachine(GSM_StateMachine *s, void *user) {
     StateMachineObject  *sm = (StateMachineObject  *)user;
-    GSM_Call *message;
-    int i = 0;
 
     if (sm == NULL) {
         pyg_error("Received callback without user pointer!\n");
-        return;
+        return NULL;
     }
     if (sm->s != s) {
         pyg_error("Callback user pointer doesn't match state machine!\n");
-        return;
+        return NULL;
     }
+    return sm;
+}
 
-    while (i < MAX_EVENTS && sm->IncomingCallQueue[i] != NULL) i++;
+/**
+ * Incoming call callback.
+ */
+static void IncomingCall (GSM_StateMachine *s, GSM_Call *call, void *user) {
+    StateMachineObject  *sm = IncomingStateMachine(s, user);
+    GSM_Call *message;
 
-    if (i == MAX_EVENTS) {
-        pyg_error("Incoming call queue overflow!\n");
-        return;
-    }
+    if (sm == NULL) return;
 
     message = malloc(sizeof(GSM_Call));
     if (message == NULL) return;
 
     *message = *call;
 
-    sm->IncomingCallQueue[i + 1] = NULL;
-    sm->IncomingCallQueue[i] = message;
+    EventQueuePush(sm, EVENT_CALL, message);
 }
 
 /**
  * Incoming SMS callback.
  */
 static void IncomingSMS (GSM_StateMachine *s, GSM_SMSMessage *msg, void *user) {
-    StateMachineObject  *sm = (StateMachineObject  *)user;
+    StateMachineObject  *sm = IncomingStateMachine(s, user);
     GSM_SMSMessage *message;
-    int i = 0;
-
-    if (sm == NULL) {
-        pyg_error("Received callback without user pointer!\n");
-        return;
-    }
-    if (sm->s != s) {
-        pyg_error("Callback user pointer doesn't match state machine!\n");
-        return;
-    }
 
-    while (i < MAX_EVENTS && sm->IncomingSMSQueue[i] != NULL) i++;
-
-    if (i == MAX_EVENTS) {
-        pyg_error("Incoming SMS queue overflow!\n");
-        return;
-    }
+    if (sm == NULL) return;
 
     message = malloc(sizeof(GSM_SMSMessage));
     if (message == NULL) return;
 
     *message = *msg;
 
-    sm->IncomingSMSQueue[i + 1] = NULL;
-    sm->IncomingSMSQueue[i] = message;
+    EventQueuePush(sm, EVENT_SMS, message);
 }
 
 /**
  * Incoming CB callback.
  */
 static void IncomingCB (GSM_StateMachine *s, GSM_CBMessage *cb, void *user) {
-    StateMachineObject  *sm = (StateMachineObject  *)user;
+    StateMachineObject  *sm = IncomingStateMachine(s, user);
     GSM_CBMessage *message;
-    int i = 0;
-
-    if (sm == NULL) {
-        pyg_error("Received callback without user pointer!\n");
-        return;
-    }
-    if (sm->s != s) {
-        pyg_error("Callback user pointer doesn't match state machine!\n");
-        return;
-    }
 
-    while (i < MAX_EVENTS && sm->IncomingCBQueue[i] != NULL) i++;
-
-    if (i == MAX_EVENTS) {
-        pyg_error("Incoming CB queue overflow!\n");
-        return;
-    }
+    if (sm == NULL) return;
 
     message = malloc(sizeof(GSM_CBMessage));
     if (message == NULL) return;
 
     *message = *cb;
 
-    sm->IncomingCBQueue[i + 1] = NULL;
-    sm->IncomingCBQueue[i] = message;
+    EventQueuePush(sm, EVENT_CB, message);
 }
 
 /**
  * Incoming USSD callback.
  */
 static void IncomingUSSD (GSM_StateMachine *s, GSM_USSDMessage *ussd, void *user) {
-    StateMachineObject  *sm = (StateMachineObject  *)user;
+    StateMachineObject  *sm = IncomingStateMachine(s, user);
     GSM_USSDMessage *message;
-    int i = 0;
-
-    if (sm == NULL) {
-        pyg_error("Received callback without user pointer!\n");
-        return;
-    }
-    if (sm->s != s) {
-        pyg_error("Callback user pointer doesn't match state machine!\n");
-        return;
-    }
-
-    while (i < MAX_EVENTS && sm->IncomingUSSDQueue[i] != NULL) i++;
-
-    if (i == MAX_EVENTS) {
-        pyg_error("Incoming USSD queue overflow!\n");
-        return;
-    }
 
-    pyg_warning("Adding USSD to queue, position %d\n", i);
+    if (sm == NULL) return;
 
     message = malloc(sizeof(GSM_USSDMessage));
     if (message == NULL) return;
 
     *message = *ussd;
 
-    sm->IncomingUSSDQueue[i + 1] = NULL;
-    sm->IncomingUSSDQueue[i] = message;
+    EventQueuePush(sm, EVENT_USSD, message);
 }
 
 /**
- * Process queue of incoming events from phone.
+ * Converts queued incoming event to Python object.
  */
-static void CheckIncomingEvents(StateMachineObject *sm) {
-    int                 i;
-    PyObject            *arglist;
-    PyObject            *event;
-
-    if (sm->IncomingCallQueue[0] != NULL) {
-        event = CallToPython(sm->IncomingCallQueue[0]);
-        if (event == NULL) {
-            pyg_error("Discarding incoming call event due to conversion error!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
-        }
-
-        arglist = Py_BuildValue("(OsO)", sm, "Call", event);
-        Py_DECREF(event);
+static PyObject *IncomingEventToPython(IncomingEventType type, void *item) {
+    GSM_SMSMessage *sms;
+
+    switch (type) {
+        case EVENT_CALL:
+            return CallToPython((GSM_Call *)item);
+        case EVENT_SMS:
+            sms = (GSM_SMSMessage *)item;
+            /* Did we get full message on location only? */
+            if (sms->State == 0) {
+                /* Location only */
+                return Py_BuildValue("{s:i,s:i,s:i}",
+                            "Location", sms->Location,
+                            "Folder", sms->Folder,
+                            "InboxFolder", (int)sms->InboxFolder
+                        );
+            }
+            return SMSToPython(sms);
+        case EVENT_CB:
+            return CBToPython((GSM_CBMessage *)item);
+        case EVENT_USSD:
+            return USSDToPython((GSM_USSDMessage *)item);
+        case EVENT_LAST:
+            break;
+    }
 
-        free(sm->IncomingCallQueue[0]);
+    PyErr_SetString(PyExc_SystemError, "Invalid incoming event type");
+    return NULL;
+}
 
-        /* Shift queue */
-        i = 0;
-        do {
-            sm->IncomingCallQueue[i] = sm->IncomingCallQueue[i + 1];
-            i++;
-        } while (i < MAX_EVENTS && sm->IncomingCallQueue[i] != NULL);
+/**
+ * Passes event to Python callback, returns 0 if callback has failed.
+ */
+static int CallIncomingCallback(StateMachineObject *sm, const char *type, PyObject *event) {
+    PyObject            *arglist;
+    PyObject            *result;
 
-        if (arglist == NULL) {
-            pyg_error("Discarding incoming call event due to error while building params!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
-        }
+    arglist = Py_BuildValue("(OsO)", sm, type, event);
+    if (arglist == NULL) {
+        pyg_error("Discarding incoming %s event due to error while building params!\n", type);
+        PyErr_WriteUnraisable((PyObject *)sm);
+        return 1;
+    }
 
-        sm->in_callback = 1;
-        PyObject_Call(sm->IncomingCallback, arglist, NULL);
-        sm->in_callback = 0;
+    sm->in_callback = 1;
+    result = PyObject_Call(sm->IncomingCallback, arglist, NULL);
+    sm->in_callback = 0;
 
-        Py_DECREF(arglist);
-    }
+    Py_DECREF(arglist);
 
-    if (sm->IncomingSMSQueue[0] != NULL) {
-        /* Did we get full message on location only? */
-        if (sm->IncomingSMSQueue[0]->State == 0) {
-            /* Location only */
-            event = Py_BuildValue("{s:i,s:i,s:i}",
-                        "Location", sm->IncomingSMSQueue[0]->Location,
-                        "Folder", sm->IncomingSMSQueue[0]->Folder,
-                        "InboxFolder", (int)sm->IncomingSMSQueue[0]->InboxFolder
-                    );
-        } else {
-            event = SMSToPython(sm->IncomingSMSQueue[0]);
-            if (event == NULL) {
-                pyg_error("Discarding incoming SMS event due to conversion error!\n");
-                PyErr_WriteUnraisable((PyObject *)sm);
-                return;
-            }
-        }
+    if (result == NULL) return 0;
+    Py_DECREF(result);
+    return 1;
+}
 
-        free(sm->IncomingSMSQueue[0]);
+/**
+ * Process queue of incoming events from phone.
+ */
+static void CheckIncomingEvents(StateMachineObject *sm) {
+    int                 type;
+    Py_ssize_t          pending;
+    void                *item;
+    PyObject            *event;
+    PyObject            *batch = NULL;
+    PyObject            *batch_item;
 
-        /* Shift queue */
-        i = 0;
-        do {
-            sm->IncomingSMSQueue[i] = sm->IncomingSMSQueue[i + 1];
-            i++;
-        } while (i < MAX_EVENTS && sm->IncomingSMSQueue[i] != NULL);
+    /* Keep events queued until there is callback to deliver them to */
+    if (sm->IncomingCallback == NULL) return;
 
-        arglist = Py_BuildValue("(OsO)", sm, "SMS", event);
-        Py_DECREF(event);
-        if (arglist == NULL) {
-            pyg_error("Discarding incoming SMS event due to error while building params!\n");
+    if (sm->incoming_batch) {
+        batch = PyList_New(0);
+        if (batch == NULL) {
             PyErr_WriteUnraisable((PyObject *)sm);
             return;
         }
-
-        sm->in_callback = 1;
-        PyObject_Call(sm->IncomingCallback, arglist, NULL);
-        sm->in_callback = 0;
-
-        Py_DECREF(arglist);
     }
 
-    if (sm->IncomingCBQueue[0] != NULL) {
-        event = CBToPython(sm->IncomingCBQueue[0]);
-        if (event == NULL) {
-            pyg_error("Discarding incoming CB event due to conversion error!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
-        }
+    for (type = 0; type < EVENT_LAST; type++) {
+        /* Process only events which were already queued */
+        LOCK_EVENT_QUEUE(sm)
+        pending = sm->IncomingQueue[type].count;
+        UNLOCK_EVENT_QUEUE(sm)
 
-        arglist = Py_BuildValue("(OsO)", sm, "CB", event);
-        Py_DECREF(event);
+        while (pending > 0) {
+            pending--;
 
-        free(sm->IncomingCBQueue[0]);
+            /* Callback might have been removed while handling previous event */
+            if (batch == NULL && sm->IncomingCallback == NULL) return;
 
-        /* Shift queue */
-        i = 0;
-        do {
-            sm->IncomingCBQueue[i] = sm->IncomingCBQueue[i + 1];
-            i++;
-        } while (i < MAX_EVENTS && sm->IncomingCBQueue[i] != NULL);
+            LOCK_EVENT_QUEUE(sm)
+            item = EventQueuePop(&(sm->IncomingQueue[type]));
+            UNLOCK_EVENT_QUEUE(sm)
 
-        if (arglist == NULL) {
-            pyg_error("Discarding incoming CB event due to error while building params!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
-        }
+            if (item == NULL) break;
 
-        sm->in_callback = 1;
-        PyObject_Call(sm->IncomingCallback, arglist, NULL);
-        sm->in_callback = 0;
+            event = IncomingEventToPython(type, item);
+            free(item);
+            if (event == NULL) {
+                pyg_error("Discarding incoming %s event due to conversion error!\n", IncomingEventNames[type]);
+                PyErr_WriteUnraisable((PyObject *)sm);
+                continue;
+            }
 
-        Py_DECREF(arglist);
-    }
+            if (batch != NULL) {
+                /* Collect events to be delivered at once */
+                batch_item = Py_BuildValue("(sO)", IncomingEventNames[type], event);
+                Py_DECREF(event);
+                if (batch_item == NULL || PyList_Append(batch, batch_item) != 0) {
+                    pyg_error("Discarding incoming %s event due to error while building params!\n", IncomingEventNames[type]);
+                    PyErr_WriteUnraisable((PyObject *)sm);
+                }
+                Py_XDECREF(batch_item);
+                continue;
+            }
 
-    if (sm->IncomingUSSDQueue[0] != NULL) {
-        event = USSDToPython(sm->IncomingUSSDQueue[0]);
-        if (event == NULL) {
-            pyg_error("Discarding incoming USSD event due to conversion error!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
+            if (!CallIncomingCallback(sm, IncomingEventNames[type], event)) {
+                /* Leave the exception for the caller */
+                Py_DECREF(event);
+                return;
+            }
+            Py_DECREF(event);
         }
+    }
 
-        arglist = Py_BuildValue("(OsO)", sm, "USSD", event);
-        Py_DECREF(event);
-
-        free(sm->IncomingUSSDQueue[0]);
-
-        /* Shift queue */
-        i = 0;
-        do {
-            sm->IncomingUSSDQueue[i] = sm->IncomingUSSDQueue[i + 1];
-            i++;
-        } while (i < MAX_EVENTS && sm->IncomingUSSDQueue[i] != NULL);
-
-        if (arglist == NULL) {
-            pyg_error("Discarding incoming USSD event due to error while building params!\n");
-            PyErr_WriteUnraisable((PyObject *)sm);
-            return;
+    if (batch != NULL) {
+        if (PyList_GET_SIZE(batch) > 0) {
+            CallIncomingCallback(sm, "Batch", batch);
         }
-
-        sm->in_callback = 1;
-        PyObject_Call(sm->IncomingCallback, arglist, NULL);
-        sm->in_callback = 0;
+        Py_DECREF(batch);
     }
 }
 
@@ -908,81 +1000,420 @@ StateMachine_ReadDevice(StateMachineObject *self, PyObject *args, PyObject *kwds
 }
 
 
-/*******************/
-/* GetManufacturer */
-/*******************/
-
-static char StateMachine_GetManufacturer__doc__[] =
-"GetManufacturer()\n\n"
-"Reads manufacturer from phone.\n\n"
-"@return: String with manufacturer name\n"
-"@rtype: string\n"
-;
+/*************/
+/* Iterators */
+/*************/
 
-static PyObject *
-StateMachine_GetManufacturer(StateMachineObject *self, PyObject *args, PyObject *kwds) {
-    GSM_Error           error;
-    char value[GSM_MAX_MANUFACTURER_LENGTH + 1];
+/* Default number of entries read from phone while holding the lock */
+#define DEFAULT_ITERATOR_BATCH 20
 
-    if (!PyArg_ParseTuple(args, ""))
-        return NULL;
+/* Number of consecutive empty locations after which reading by location
+ * stops when phone does not report memory size */
+#define MAX_ITERATOR_EMPTY_RUN 200
 
-    BEGIN_PHONE_COMM
-    error = GSM_GetManufacturer(self->s, value);
-    END_PHONE_COMM
+typedef enum {
+    ITERATOR_SMS = 1,
+    ITERATOR_MEMORY,
+} StateMachineIteratorKind;
 
-    if (!checkError(error, "GetManufacturer")) return NULL;
+/**
+ * Parses Lazy parameter, None keeps setting of SetLazySMS.
+ */
+static int
+LazyConverter(PyObject *o, void *address)
+{
+    int *lazy = (int *)address;
 
-    return Py_BuildValue("s", value);
+    if (o == Py_None) {
+        *lazy = -1;
+        return 1;
+    }
+    *lazy = PyObject_IsTrue(o);
+    return *lazy >= 0;
 }
 
-/************/
-/* GetModel */
-/************/
+/* Declarations for objects of type StateMachineIterator */
+typedef struct {
+    PyObject_HEAD
 
-static char StateMachine_GetModel__doc__[] =
-"GetModel()\n\n"
-"Reads model from phone.\n\n"
-"@return: Tuple containing gammu identification and real model returned by phone.\n"
-"@rtype: tuple\n"
-;
+    StateMachineObject          *sm;
+    StateMachineIteratorKind    kind;
+    int                         batch;
+    int                         folder;
+    GSM_MemoryType              memory_type;
+    int                         fallback;
+    int                         by_location;
+    int                         max_location;
+    int                         location;
+    int                         empty_run;
+    int                         lazy;
+    int                         start;
+    int                         finished;
+    GSM_Error                   error;
+    const char                  *where;
+    int                         read;
+    int                         total;
+} StateMachineIteratorObject;
 
 static PyObject *
-StateMachine_GetModel(StateMachineObject *self, PyObject *args, PyObject *kwds) {
-    GSM_Error           error;
-    char value[GSM_MAX_MODEL_LENGTH + 1];
-
-    if (!PyArg_ParseTuple(args, ""))
-        return NULL;
+StateMachineIterator_NextSMS(StateMachineIteratorObject *it)
+{
+    StateMachineObject  *self = it->sm;
+    GSM_MultiSMSMessage *sms;
+    GSM_SMSMemoryStatus status;
+    GSM_Error           error = ERR_NONE;
+    int                 count = 0;
+    int                 i;
+    PyObject            *result;
+    PyObject            *item;
 
     BEGIN_PHONE_COMM
-    error = GSM_GetModel(self->s, value);
-    END_PHONE_COMM
-
-    if (!checkError(error, "GetModel")) return NULL;
+    sms = (GSM_MultiSMSMessage *)malloc(it->batch * sizeof(GSM_MultiSMSMessage));
+    if (sms != NULL) {
+        /* Figure out total count for progress reporting */
+        if (it->start && it->folder == 0) {
+            if (GSM_GetSMSStatus(self->s, &status) == ERR_NONE) {
+                it->total = status.SIMUsed + status.PhoneUsed + status.TemplatesUsed;
+            }
+        }
+        while (count < it->batch) {
+            /* Clear SMS structure */
+            for (i = 0; i < GSM_MAX_MULTI_SMS; i++) {
+                GSM_SetDefaultSMSData(&sms[count].SMS[i]);
+            }
+            sms[count].SMS[0].Folder = it->folder;
+            sms[count].SMS[0].Location = it->location;
+            sms[count].Number = 0;
 
-    return Py_BuildValue("ss", GSM_GetModelInfo(self->s)->model, value);
-}
+            error = GSM_GetNextSMS(self->s, &sms[count], it->start);
+            if (error != ERR_NONE) break;
 
-/***************/
-/* GetFirmware */
-/***************/
+            it->start = FALSE;
+            it->location = sms[count].SMS[0].Location;
+            it->read += sms[count].Number;
+            count++;
+        }
+    }
+    END_PHONE_COMM
 
-static char StateMachine_GetFirmware__doc__[] =
-"GetFirmware()\n\n"
-"Reads firmware information from phone.\n\n"
-"@return: Tuple from version, date and numeric version.\n"
-"@rtype: tuple\n"
-;
+    if (sms == NULL) return PyErr_NoMemory();
 
-static PyObject *
-StateMachine_GetFirmware(StateMachineObject *self, PyObject *args, PyObject *kwds) {
-    GSM_Error           error;
-    char firmware[GSM_MAX_VERSION_LENGTH + 1];
-    char date[GSM_MAX_VERSION_DATE_LENGTH + 1];
-    double ver;
+    if (error == ERR_EMPTY) {
+        it->finished = 1;
+    } else if (error != ERR_NONE) {
+        /* Report error once already read messages are returned */
+        it->error = error;
+    }
 
-    if (!PyArg_ParseTuple(args, ""))
+    if (count == 0) {
+        free(sms);
+        if (it->error != ERR_NONE) {
+            it->finished = 1;
+            checkError(it->error, it->where);
+        }
+        return NULL;
+    }
+
+    result = PyList_New(count);
+    if (result == NULL) {
+        free(sms);
+        return NULL;
+    }
+
+    for (i = 0; i < count; i++) {
+        item = MultiSMSToPythonLazy(&sms[i], it->lazy);
+        if (item == NULL) {
+            Py_DECREF(result);
+            free(sms);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, item);
+    }
+    free(sms);
+
+    return result;
+}
+
+static PyObject *
+StateMachineIterator_NextMemory(StateMachineIteratorObject *it)
+{
+    StateMachineObject  *self = it->sm;
+    GSM_MemoryEntry     *entries;
+    GSM_MemoryStatus    status;
+    GSM_Error           error = ERR_NONE;
+    int                 count = 0;
+    int                 i;
+    PyObject            *result;
+    PyObject            *item;
+
+    BEGIN_PHONE_COMM
+    entries = (GSM_MemoryEntry *)malloc(it->batch * sizeof(GSM_MemoryEntry));
+    if (entries != NULL) {
+        /* Figure out total count for progress reporting and fallback */
+        if (it->start && !it->by_location) {
+            status.MemoryType = it->memory_type;
+            if (GSM_GetMemoryStatus(self->s, &status) == ERR_NONE) {
+                it->total = status.MemoryUsed;
+                it->max_location = status.MemoryUsed + status.MemoryFree;
+            }
+        }
+        while (count < it->batch) {
+            entries[count].MemoryType = it->memory_type;
+
+            if (it->by_location) {
+                if ((it->total >= 0 && it->read >= it->total) || it->location >= it->max_location) {
+                    error = ERR_EMPTY;
+                    break;
+                }
+                it->location++;
+                entries[count].Location = it->location;
+                error = GSM_GetMemory(self->s, &entries[count]);
+                if (error == ERR_EMPTY) {
+                    /* Without known memory size give up after long gap */
+                    if (it->max_location == INT_MAX && ++it->empty_run >= MAX_ITERATOR_EMPTY_RUN) break;
+                    continue;
+                }
+                it->empty_run = 0;
+                /* Reached end of memory */
+                if (error == ERR_INVALIDLOCATION) error = ERR_EMPTY;
+            } else {
+                entries[count].Location = it->location;
+                error = GSM_GetNextMemory(self->s, &entries[count], it->start);
+                if (it->fallback && it->start && (error == ERR_NOTSUPPORTED || error == ERR_NOTIMPLEMENTED)) {
+                    /* Read entries location by location */
+                    it->by_location = TRUE;
+                    it->location = 0;
+                    continue;
+                }
+            }
+            if (error != ERR_NONE) break;
+
+            it->start = FALSE;
+            it->location = entries[count].Location;
+            it->read++;
+            count++;
+        }
+    }
+    END_PHONE_COMM
+
+    if (entries == NULL) return PyErr_NoMemory();
+
+    if (error == ERR_EMPTY) {
+        it->finished = 1;
+    } else if (error != ERR_NONE) {
+        /* Report error once already read entries are returned */
+        it->error = error;
+    }
+
+    result = NULL;
+    if (count == 0) {
+        if (it->error != ERR_NONE) {
+            it->finished = 1;
+            checkError(it->error, it->where);
+        }
+    } else {
+        result = PyList_New(count);
+    }
+
+    for (i = 0; i < count; i++) {
+        if (result != NULL) {
+            item = MemoryEntryToPython(&entries[i]);
+            if (item == NULL) {
+                Py_CLEAR(result);
+            } else {
+                PyList_SET_ITEM(result, i, item);
+            }
+        }
+        GSM_FreeMemoryEntry(&entries[i]);
+    }
+    free(entries);
+
+    return result;
+}
+
+static PyObject *
+StateMachineIterator_next(StateMachineIteratorObject *it)
+{
+    if (it->finished) return NULL;
+
+    if (it->error != ERR_NONE) {
+        it->finished = 1;
+        checkError(it->error, it->where);
+        return NULL;
+    }
+
+    switch (it->kind) {
+        case ITERATOR_SMS:
+            return StateMachineIterator_NextSMS(it);
+        case ITERATOR_MEMORY:
+            return StateMachineIterator_NextMemory(it);
+    }
+
+    PyErr_SetString(PyExc_SystemError, "Invalid iterator kind");
+    return NULL;
+}
+
+static void
+StateMachineIterator_dealloc(StateMachineIteratorObject *it)
+{
+    Py_XDECREF(it->sm);
+    Py_TYPE(it)->tp_free((PyObject*)it);
+}
+
+static PyMemberDef StateMachineIterator_members[] = {
+    {"Read",    T_INT, offsetof(StateMachineIteratorObject, read),  READONLY, "Number of entries (or SMS parts) read so far."},
+    {"Total",   T_INT, offsetof(StateMachineIteratorObject, total), READONLY, "Total number of entries as reported by phone, -1 if not known."},
+    {NULL}  /* Sentinel */
+};
+
+static char StateMachineIteratorType__doc__[] =
+"Iterator returning batches of entries read from the phone.\n\n"
+"Progress can be watched using Read and Total attributes.\n"
+;
+
+static PyTypeObject StateMachineIteratorType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_gammu.StateMachineIterator",		/*tp_name*/
+    sizeof(StateMachineIteratorObject),	/*tp_basicsize*/
+    0,				/*tp_itemsize*/
+    /* methods */
+    (destructor)StateMachineIterator_dealloc,	/*tp_dealloc*/
+    (printfunc)0,		/*tp_print*/
+    0,	/*tp_getattr*/
+    0,	/*tp_setattr*/
+    0,
+    0,
+    0,			/*tp_as_number*/
+    0,		/*tp_as_sequence*/
+    0,		/*tp_as_mapping*/
+    (hashfunc)0,		/*tp_hash*/
+    (ternaryfunc)0,		/*tp_call*/
+    0,
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+    StateMachineIteratorType__doc__, /* Documentation string */
+    0,		               /* tp_traverse */
+    0,		               /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    PyObject_SelfIter,         /* tp_iter */
+    (iternextfunc)StateMachineIterator_next, /* tp_iternext */
+    0,                         /* tp_methods */
+    StateMachineIterator_members, /* tp_members */
+};
+
+static StateMachineIteratorObject *
+StateMachineIterator_create(StateMachineObject *sm, StateMachineIteratorKind kind, const char *where, int batch)
+{
+    StateMachineIteratorObject *it;
+
+    if (batch <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Batch has to be positive");
+        return NULL;
+    }
+
+    it = PyObject_New(StateMachineIteratorObject, &StateMachineIteratorType);
+    if (it == NULL) return NULL;
+
+    Py_INCREF(sm);
+    it->sm = sm;
+    it->kind = kind;
+    it->batch = batch;
+    it->folder = 0;
+    it->memory_type = 0;
+    it->fallback = FALSE;
+    it->by_location = FALSE;
+    it->max_location = INT_MAX;
+    it->location = -1;
+    it->empty_run = 0;
+    it->lazy = 0;
+    it->start = TRUE;
+    it->finished = 0;
+    it->error = ERR_NONE;
+    it->where = where;
+    it->read = 0;
+    it->total = -1;
+
+    return it;
+}
+
+/*******************/
+/* GetManufacturer */
+/*******************/
+
+static char StateMachine_GetManufacturer__doc__[] =
+"GetManufacturer()\n\n"
+"Reads manufacturer from phone.\n\n"
+"@return: String with manufacturer name\n"
+"@rtype: string\n"
+;
+
+static PyObject *
+StateMachine_GetManufacturer(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    GSM_Error           error;
+    char value[GSM_MAX_MANUFACTURER_LENGTH + 1];
+
+    if (!PyArg_ParseTuple(args, ""))
+        return NULL;
+
+    BEGIN_PHONE_COMM
+    error = GSM_GetManufacturer(self->s, value);
+    END_PHONE_COMM
+
+    if (!checkError(error, "GetManufacturer")) return NULL;
+
+    return Py_BuildValue("s", value);
+}
+
+/************/
+/* GetModel */
+/************/
+
+static char StateMachine_GetModel__doc__[] =
+"GetModel()\n\n"
+"Reads model from phone.\n\n"
+"@return: Tuple containing gammu identification and real model returned by phone.\n"
+"@rtype: tuple\n"
+;
+
+static PyObject *
+StateMachine_GetModel(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    GSM_Error           error;
+    char value[GSM_MAX_MODEL_LENGTH + 1];
+
+    if (!PyArg_ParseTuple(args, ""))
+        return NULL;
+
+    BEGIN_PHONE_COMM
+    error = GSM_GetModel(self->s, value);
+    END_PHONE_COMM
+
+    if (!checkError(error, "GetModel")) return NULL;
+
+    return Py_BuildValue("ss", GSM_GetModelInfo(self->s)->model, value);
+}
+
+/***************/
+/* GetFirmware */
+/***************/
+
+static char StateMachine_GetFirmware__doc__[] =
+"GetFirmware()\n\n"
+"Reads firmware information from phone.\n\n"
+"@return: Tuple from version, date and numeric version.\n"
+"@rtype: tuple\n"
+;
+
+static PyObject *
+StateMachine_GetFirmware(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    GSM_Error           error;
+    char firmware[GSM_MAX_VERSION_LENGTH + 1];
+    char date[GSM_MAX_VERSION_DATE_LENGTH + 1];
+    double ver;
+
+    if (!PyArg_ParseTuple(args, ""))
         return NULL;
 
     BEGIN_PHONE_COMM
@@ -2177,6 +2608,48 @@ StateMachine_GetNextMemory(StateMachineObject *self, PyObject *args, PyObject *k
     return result;
 }
 
+/**************/
+/* IterMemory */
+/**************/
+
+static char StateMachine_IterMemory__doc__[] =
+"IterMemory(Type, Batch, Fallback)\n\n"
+"Iterates over all entries in memory (phonebooks or calls) using L{GetNextMemory}. Entries are read in batches while holding the phone lock.\n\n"
+"@param Type: Memory type, one of 'ME', 'SM', 'ON', 'DC', 'RC', 'MC', 'MT', 'FD', 'VM'\n"
+"@type Type: string\n"
+"@param Batch: Number of entries read at once, defaults to 20\n"
+"@type Batch: int\n"
+"@param Fallback: Whether to read entries by location using L{GetMemory} when phone does not support L{GetNextMemory}, defaults to False. When phone does not report memory size either, reading stops after 200 consecutive empty locations.\n"
+"@type Fallback: boolean\n"
+"@return: Iterator returning lists of memory entries, each of them in same format as returned by L{GetMemory}. Its Read and Total attributes can be used to watch progress.\n"
+"@rtype: iterator\n"
+;
+
+static PyObject *
+StateMachine_IterMemory(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    static char         *kwlist[] = {"Type", "Batch", "Fallback", NULL};
+    char                *s;
+    int                 batch = DEFAULT_ITERATOR_BATCH;
+    int                 fallback = FALSE;
+    GSM_MemoryType      memory_type;
+    StateMachineIteratorObject *it;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|ip", kwlist,
+                &s, &batch, &fallback))
+        return NULL;
+
+    memory_type = StringToMemoryType(s);
+    if (memory_type == 0) return NULL;
+
+    it = StateMachineIterator_create(self, ITERATOR_MEMORY, "IterMemory", batch);
+    if (it == NULL) return NULL;
+
+    it->memory_type = memory_type;
+    it->fallback = fallback;
+
+    return (PyObject *)it;
+}
+
 /*************/
 /* SetMemory */
 /*************/
@@ -2555,12 +3028,14 @@ StateMachine_GetSMSStatus(StateMachineObject *self, PyObject *args, PyObject *kw
 /**********/
 
 static char StateMachine_GetSMS__doc__[] =
-"GetSMS(Folder, Location)\n\n"
+"GetSMS(Folder, Location, Lazy = None)\n\n"
 "Reads SMS message.\n\n"
 "@param Folder: Folder where to read entry (0 is emulated flat memory)\n"
 "@type Folder: int\n"
 "@param Location: Location of entry to read\n"
 "@type Location: int\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
 "@return: Hash with SMS data\n"
 "@rtype: hash\n"
 ;
@@ -2570,14 +3045,15 @@ StateMachine_GetSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
     GSM_Error           error;
     GSM_MultiSMSMessage sms;
     int                 i;
-    static char         *kwlist[] = {"Folder", "Location", NULL};
+    int                 lazy = -1;
+    static char         *kwlist[] = {"Folder", "Location", "Lazy", NULL};
 
     /* Clear SMS structure */
     for (i = 0; i < GSM_MAX_MULTI_SMS; i++) {
         GSM_SetDefaultSMSData(&sms.SMS[i]);
     }
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "II", kwlist, &(sms.SMS[0].Folder), &(sms.SMS[0].Location)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "II|O&", kwlist, &(sms.SMS[0].Folder), &(sms.SMS[0].Location), LazyConverter, &lazy))
         return NULL;
 
     sms.Number = 0;
@@ -2588,7 +3064,7 @@ StateMachine_GetSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
 
     if (!checkError(error, "GetSMS")) return NULL;
 
-    return MultiSMSToPython(&sms);
+    return MultiSMSToPythonLazy(&sms, lazy);
 }
 
 
@@ -2597,7 +3073,7 @@ StateMachine_GetSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
 /**************/
 
 static char StateMachine_GetNextSMS__doc__[] =
-"GetNextSMS(Folder, Start, Location)\n\n"
+"GetNextSMS(Folder, Start, Location, Lazy = None)\n\n"
 "Reads next (or first if start set) SMS message. This might befaster for some phones than using L{GetSMS} for each message.\n\n"
 "@param Folder: Folder where to read entry (0 is emulated flat memory)\n"
 "@type Folder: int\n"
@@ -2605,6 +3081,8 @@ static char StateMachine_GetNextSMS__doc__[] =
 "@type Start: boolean\n"
 "@param Location: Location last read entry. This can not be used together with Start\n"
 "@type Location: int\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
 "@return: Hash with SMS data\n"
 "@rtype: hash\n"
 ;
@@ -2614,8 +3092,9 @@ StateMachine_GetNextSMS(StateMachineObject *self, PyObject *args, PyObject *kwds
     GSM_Error           error;
     GSM_MultiSMSMessage sms;
     int                 i;
-    static char         *kwlist[] = {"Folder", "Start", "Location", NULL};
+    static char         *kwlist[] = {"Folder", "Start", "Location", "Lazy", NULL};
     int                 start = FALSE;
+    int                 lazy = -1;
 
     /* Clear SMS structure */
     for (i = 0; i < GSM_MAX_MULTI_SMS; i++) {
@@ -2626,8 +3105,8 @@ StateMachine_GetNextSMS(StateMachineObject *self, PyObject *args, PyObject *kwds
     sms.SMS[0].Folder = -1;
     sms.Number = 0;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|ii", kwlist,
-                &(sms.SMS[0].Folder), &start, &(sms.SMS[0].Location)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|iiO&", kwlist,
+                &(sms.SMS[0].Folder), &start, &(sms.SMS[0].Location), LazyConverter, &lazy))
         return NULL;
 
     if (!start && sms.SMS[0].Location == -1) {
@@ -2641,7 +3120,52 @@ StateMachine_GetNextSMS(StateMachineObject *self, PyObject *args, PyObject *kwds
 
     if (!checkError(error, "GetNextSMS")) return NULL;
 
-    return MultiSMSToPython(&sms);
+    return MultiSMSToPythonLazy(&sms, lazy);
+}
+
+/***********/
+/* IterSMS */
+/***********/
+
+static char StateMachine_IterSMS__doc__[] =
+"IterSMS(Folder, Batch, Lazy = None)\n\n"
+"Iterates over all SMS messages using L{GetNextSMS}. Messages are read in batches while holding the phone lock, what is much faster than reading them one by one from Python.\n\n"
+"@param Folder: Folder where to read entries (0 is emulated flat memory), defaults to 0\n"
+"@type Folder: int\n"
+"@param Batch: Number of messages read at once, defaults to 20\n"
+"@type Batch: int\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
+"@return: Iterator returning lists of messages, each of them in same format as returned by L{GetNextSMS}. Its Read and Total attributes can be used to watch progress.\n"
+"@rtype: iterator\n"
+;
+
+static PyObject *
+StateMachine_IterSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    static char         *kwlist[] = {"Folder", "Batch", "Lazy", NULL};
+    PyObject            *folder = Py_None;
+    int                 batch = DEFAULT_ITERATOR_BATCH;
+    int                 lazy = -1;
+    StateMachineIteratorObject *it;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OiO&", kwlist,
+                &folder, &batch, LazyConverter, &lazy))
+        return NULL;
+
+    it = StateMachineIterator_create(self, ITERATOR_SMS, "IterSMS", batch);
+    if (it == NULL) return NULL;
+
+    it->lazy = lazy < 0 ? SMSRecordGetLazy() : lazy;
+
+    if (folder != Py_None) {
+        it->folder = PyLong_AsLong(folder);
+        if (it->folder == -1 && PyErr_Occurred()) {
+            Py_DECREF(it);
+            return NULL;
+        }
+    }
+
+    return (PyObject *)it;
 }
 
 /**********/
@@ -2664,8 +3188,8 @@ StateMachine_SetSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
     PyObject            *value;
     static char         *kwlist[] = {"Value", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!", kwlist,
-                &PyDict_Type, &(value)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&", kwlist,
+                SMSObjectConverter, &(value)))
         return NULL;
 
     if (!SMSFromPython(value, &sms, 1, 1, 0)) return NULL;
@@ -2699,8 +3223,8 @@ StateMachine_AddSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
     PyObject            *value;
     static char         *kwlist[] = {"Value", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!", kwlist,
-                &PyDict_Type, &(value)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&", kwlist,
+                SMSObjectConverter, &(value)))
         return NULL;
 
     if (!SMSFromPython(value, &sms, 0, 1, 0)) return NULL;
@@ -2770,8 +3294,8 @@ StateMachine_SendSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
     static char         *kwlist[] = {"Value", NULL};
     int                 i = 0;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!", kwlist,
-                &PyDict_Type, &(value)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&", kwlist,
+                SMSObjectConverter, &(value)))
         return NULL;
 
     if (!SMSFromPython(value, &sms, 0, 0, 1)) return NULL;
@@ -2799,40 +3323,336 @@ StateMachine_SendSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
     return PyLong_FromLong(self->MessageReference);
 }
 
+/****************/
+/* SendSMSBatch */
+/****************/
 
-static char StateMachine_SendSavedSMS__doc__[] =
-"SendSavedSMS(Folder, Location)\n\n"
-"Sends SMS saved in phone.\n\n"
-"@param Folder: Folder where to read entry (0 is emulated flat memory)\n"
-"@type Folder: int\n"
-"@param Location: Location of entry to send\n"
-"@type Location: int\n"
-"@return: Message reference as integer\n"
-"@rtype: int\n"
-;
+/**
+ * Sleeps for given number of milliseconds.
+ */
+static void
+SleepMilliseconds(long ms)
+{
+#ifdef _WIN32
+    Sleep(ms);
+#else
+    struct timespec ts;
 
-static PyObject *
-StateMachine_SendSavedSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    ts.tv_sec = ms / 1000;
+    ts.tv_nsec = (ms % 1000) * 1000000;
+    nanosleep(&ts, NULL);
+#endif
+}
+
+/**
+ * Sends SMS and waits for its status, phone lock has to be held.
+ */
+static GSM_Error
+SendSMSAndWait(StateMachineObject *self, GSM_SMSMessage *sms)
+{
     GSM_Error           error;
-    int                 Folder;
-    int                 Location;
-    static char         *kwlist[] = {"Folder", "Location", NULL};
-    int                 i = 0;
+    int                 i;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "ii", kwlist,
-                &Folder, &Location))
-        return NULL;
+    self->SMSStatus = ERR_TIMEOUT;
 
-    BEGIN_PHONE_COMM
-    error = GSM_SendSavedSMS(self->s, Folder, Location);
-    END_PHONE_COMM
+    error = GSM_SendSMS(self->s, sms);
+    if (error != ERR_NONE) return error;
 
-    self->SMSStatus = ERR_TIMEOUT;
+    for (i = 0; i < 100 && self->SMSStatus == ERR_TIMEOUT; i++) {
+        GSM_ReadDevice(self->s, TRUE);
+    }
 
-    if (!checkError(error, "SendSavedSMS")) return NULL;
+    return self->SMSStatus;
+}
 
-    while (self->SMSStatus != ERR_NONE) {
-        i++;
+/**
+ * Encodes message described same as for EncodeSMS for sending in batch.
+ */
+static int
+SMSBatchEncode(PyObject *item, GSM_MultiSMSMessage *sms)
+{
+    GSM_MultiPartSMSInfo        smsinfo;
+    GSM_SMSC                    smsc;
+    PyObject                    *value;
+    unsigned char               number[(GSM_MAX_NUMBER_LENGTH + 1) * 2];
+    GSM_Error                   error;
+    int                         i;
+
+    if (!CopyStringFromDict(item, "Number", GSM_MAX_NUMBER_LENGTH, number))
+        return 0;
+    if (number[0] == 0 && number[1] == 0) {
+        PyErr_Format(PyExc_ValueError, "Missing SMS number!");
+        return 0;
+    }
+
+    value = PyDict_GetItemString(item, "SMSC");
+    if (value != NULL && !SMSCFromPython(value, &smsc, FALSE)) return 0;
+
+    if (!SMSInfoFromPython(item, &smsinfo)) return 0;
+
+    memset(sms, 0, sizeof(GSM_MultiSMSMessage));
+    error = GSM_EncodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, sms);
+    GSM_FreeMultiPartSMSInfo(&smsinfo);
+    if (!checkError(error, "EncodeMultiPartSMS")) return 0;
+
+    for (i = 0; i < sms->Number; i++) {
+        CopyUnicodeString(sms->SMS[i].Number, number);
+        if (value != NULL) {
+            sms->SMS[i].SMSC = smsc;
+        }
+    }
+
+    return 1;
+}
+
+/**
+ * Frees messages encoded by SMSBatchEncode.
+ */
+static void
+SMSBatchFreeEncoded(GSM_MultiSMSMessage **encoded, Py_ssize_t count)
+{
+    Py_ssize_t          i;
+
+    if (encoded == NULL) return;
+    for (i = 0; i < count; i++) {
+        free(encoded[i]);
+    }
+    free(encoded);
+}
+
+static char StateMachine_SendSMSBatch__doc__[] =
+"SendSMSBatch(Messages, StopOnError = False, Rate = 0)\n\n"
+"Sends several SMS messages, phone is locked for whole batch.\n\n"
+"Messages can be passed already encoded or described same as for "
+"L{EncodeSMS}, such messages are encoded before the phone is locked.\n\n"
+"@param Messages: List of messages to send, every message is either SMS data, "
+"list of SMS data for multipart message (as returned by L{EncodeSMS} with "
+"filled in number) or message description for L{EncodeSMS} with Entries, "
+"Number and optional SMSC keys\n"
+"@type Messages: list\n"
+"@param StopOnError: Whether to stop sending after first failed message\n"
+"@type StopOnError: boolean\n"
+"@param Rate: Maximal number of sent SMS per second, 0 for no limit\n"
+"@type Rate: float\n"
+"@return: List of tuples (MessageReference, Error) for every processed "
+"message, MessageReference is list for multipart and encoded messages, "
+"Error is None "
+"or name of error. When stopped on error, remaining messages are not "
+"included.\n"
+"@rtype: list\n"
+;
+
+static PyObject *
+StateMachine_SendSMSBatch(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    static char         *kwlist[] = {"Messages", "StopOnError", "Rate", NULL};
+    PyObject            *value;
+    PyObject            *seq;
+    PyObject            *item;
+    PyObject            *reference;
+    PyObject            *result = NULL;
+    int                 stop_on_error = 0;
+    double              rate = 0;
+    long                delay = 0;
+    const char          *name;
+    Py_ssize_t          count, total = 0, processed = 0, offset, i, j;
+    Py_ssize_t          *parts = NULL;
+    Py_ssize_t          *sent = NULL;
+    GSM_SMSMessage      *sms = NULL;
+    GSM_MultiSMSMessage **encoded = NULL;
+    GSM_Error           *errors = NULL;
+    int                 *references = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|pd", kwlist,
+                &value, &stop_on_error, &rate))
+        return NULL;
+
+    if (rate < 0) {
+        PyErr_SetString(PyExc_ValueError, "Rate can not be negative!");
+        return NULL;
+    }
+    if (rate > 0) {
+        delay = (long)(1000.0 / rate);
+    }
+
+    if (self->in_callback) {
+        PyErr_SetString(PyExc_RuntimeError, "Can not call Gammu functions from within callback");
+        return NULL;
+    }
+
+    seq = PySequence_Fast(value, "Messages has to be iterable");
+    if (seq == NULL)
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+
+    parts = (Py_ssize_t *)malloc((count + 1) * sizeof(Py_ssize_t));
+    sent = (Py_ssize_t *)malloc((count + 1) * sizeof(Py_ssize_t));
+    errors = (GSM_Error *)malloc((count + 1) * sizeof(GSM_Error));
+    encoded = (GSM_MultiSMSMessage **)calloc(count + 1, sizeof(GSM_MultiSMSMessage *));
+    if (parts == NULL || sent == NULL || errors == NULL || encoded == NULL) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (PyDict_Check(item) && PyDict_GetItemString(item, "Entries") != NULL) {
+            encoded[i] = (GSM_MultiSMSMessage *)malloc(sizeof(GSM_MultiSMSMessage));
+            if (encoded[i] == NULL) {
+                PyErr_NoMemory();
+                goto fail;
+            }
+            if (!SMSBatchEncode(item, encoded[i])) goto fail;
+            parts[i] = encoded[i]->Number;
+        } else if (PyDict_Check(item) || SMSRecordCheck(item)) {
+            parts[i] = 1;
+        } else if (PyList_Check(item) && PyList_GET_SIZE(item) > 0) {
+            parts[i] = PyList_GET_SIZE(item);
+        } else {
+            PyErr_Format(PyExc_TypeError, "Element %" PY_FORMAT_SIZE_T "d in Messages is not dictionary or non empty list", i);
+            goto fail;
+        }
+        total += parts[i];
+    }
+
+    sms = (GSM_SMSMessage *)malloc((total + 1) * sizeof(GSM_SMSMessage));
+    references = (int *)malloc((total + 1) * sizeof(int));
+    if (sms == NULL || references == NULL) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    /* Convert everything before locking the phone */
+    offset = 0;
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (encoded[i] != NULL) {
+            for (j = 0; j < parts[i]; j++) {
+                sms[offset++] = encoded[i]->SMS[j];
+            }
+        } else if (PyDict_Check(item) || SMSRecordCheck(item)) {
+            if (!SMSFromPython(item, &(sms[offset++]), 0, 0, 1)) goto fail;
+        } else {
+            for (j = 0; j < parts[i]; j++) {
+                if (!SMSFromPython(PyList_GET_ITEM(item, j), &(sms[offset++]), 0, 0, 1)) goto fail;
+            }
+        }
+    }
+
+    BEGIN_PHONE_COMM
+    offset = 0;
+    for (i = 0; i < count; i++) {
+        errors[i] = ERR_NONE;
+        for (j = 0; j < parts[i]; j++) {
+            if (delay > 0 && offset + j > 0) {
+                SleepMilliseconds(delay);
+            }
+            errors[i] = SendSMSAndWait(self, &(sms[offset + j]));
+            if (errors[i] != ERR_NONE) break;
+            references[offset + j] = self->MessageReference;
+        }
+        sent[i] = j;
+        offset += parts[i];
+        processed = i + 1;
+        if (errors[i] != ERR_NONE && stop_on_error) break;
+    }
+    END_PHONE_COMM
+
+    result = PyList_New(processed);
+    if (result == NULL)
+        goto fail;
+
+    offset = 0;
+    for (i = 0; i < processed; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (encoded[i] == NULL && (PyDict_Check(item) || SMSRecordCheck(item))) {
+            if (errors[i] == ERR_NONE) {
+                reference = PyLong_FromLong(references[offset]);
+            } else {
+                Py_INCREF(Py_None);
+                reference = Py_None;
+            }
+        } else {
+            reference = PyList_New(0);
+            for (j = 0; reference != NULL && j < sent[i]; j++) {
+                item = PyLong_FromLong(references[offset + j]);
+                if (item == NULL || PyList_Append(reference, item) != 0) {
+                    Py_XDECREF(item);
+                    Py_CLEAR(reference);
+                    break;
+                }
+                Py_DECREF(item);
+            }
+        }
+        if (reference == NULL)
+            goto fail;
+        offset += parts[i];
+
+        if (errors[i] == ERR_NONE) {
+            item = Py_BuildValue("(NO)", reference, Py_None);
+        } else {
+            name = GSM_ErrorName(errors[i]);
+            item = Py_BuildValue("(Ns)", reference, name == NULL ? "ERR_UNKNOWN" : name);
+        }
+        if (item == NULL)
+            goto fail;
+        PyList_SET_ITEM(result, i, item);
+    }
+
+    free(parts);
+    free(sent);
+    free(errors);
+    free(sms);
+    free(references);
+    SMSBatchFreeEncoded(encoded, count);
+    Py_DECREF(seq);
+    return result;
+
+fail:
+    free(parts);
+    free(sent);
+    free(errors);
+    free(sms);
+    free(references);
+    SMSBatchFreeEncoded(encoded, count);
+    Py_DECREF(seq);
+    Py_XDECREF(result);
+    return NULL;
+}
+
+
+static char StateMachine_SendSavedSMS__doc__[] =
+"SendSavedSMS(Folder, Location)\n\n"
+"Sends SMS saved in phone.\n\n"
+"@param Folder: Folder where to read entry (0 is emulated flat memory)\n"
+"@type Folder: int\n"
+"@param Location: Location of entry to send\n"
+"@type Location: int\n"
+"@return: Message reference as integer\n"
+"@rtype: int\n"
+;
+
+static PyObject *
+StateMachine_SendSavedSMS(StateMachineObject *self, PyObject *args, PyObject *kwds) {
+    GSM_Error           error;
+    int                 Folder;
+    int                 Location;
+    static char         *kwlist[] = {"Folder", "Location", NULL};
+    int                 i = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "ii", kwlist,
+                &Folder, &Location))
+        return NULL;
+
+    BEGIN_PHONE_COMM
+    error = GSM_SendSavedSMS(self->s, Folder, Location);
+    END_PHONE_COMM
+
+    self->SMSStatus = ERR_TIMEOUT;
+
+    if (!checkError(error, "SendSavedSMS")) return NULL;
+
+    while (self->SMSStatus != ERR_NONE) {
+        i++;
         BEGIN_PHONE_COMM
         GSM_ReadDevice(self->s,TRUE);
         END_PHONE_COMM
@@ -5248,11 +6068,133 @@ StateMachine_SetDebugLevel(StateMachineObject *self, PyObject *args, PyObject *k
     Py_RETURN_NONE;
 }
 
+static char StateMachine_SetEventQueue__doc__[] =
+"SetEventQueue(Capacity, Overflow)\n\n"
+"Configures queues holding incoming events until they are passed to the callback set by L{SetIncomingCallback}. Each event type (Call, SMS, CB and USSD) has its own queue.\n\n"
+"@param Capacity: Number of events each queue can hold, defaults to 16. When using Grow policy, this is only initial size of the queue.\n"
+"@type Capacity: int\n"
+"@param Overflow: What to do when queue is full, one of 'Grow' (enlarge the queue, this is the default), 'DropOldest' (discard oldest queued event) or 'DropNewest' (discard incoming event)\n"
+"@type Overflow: string\n"
+"@return: None\n"
+"@rtype: None\n"
+;
+
+static PyObject *
+StateMachine_SetEventQueue(StateMachineObject *self, PyObject *args, PyObject *kwds)
+{
+    static char         *kwlist[] = {"Capacity", "Overflow", NULL};
+    Py_ssize_t          capacity;
+    char                *overflow = NULL;
+    EventQueuePolicy    policy;
+    EventQueue          *q;
+    Py_ssize_t          size;
+    int                 i;
+    int                 failed = 0;
+
+    capacity = self->event_queue_capacity;
+    policy = self->event_queue_policy;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|ns", kwlist, &capacity, &overflow))
+        return NULL;
+
+    if (capacity <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Capacity has to be positive");
+        return NULL;
+    }
+
+    if (overflow != NULL) {
+        if (strcmp(overflow, "Grow") == 0) {
+            policy = QUEUE_GROW;
+        } else if (strcmp(overflow, "DropOldest") == 0) {
+            policy = QUEUE_DROP_OLDEST;
+        } else if (strcmp(overflow, "DropNewest") == 0) {
+            policy = QUEUE_DROP_NEWEST;
+        } else {
+            PyErr_Format(PyExc_ValueError, "Bad value for Overflow: '%s'", overflow);
+            return NULL;
+        }
+    }
+
+    LOCK_EVENT_QUEUE(self)
+    self->event_queue_capacity = capacity;
+    self->event_queue_policy = policy;
+    for (i = 0; i < EVENT_LAST; i++) {
+        q = &(self->IncomingQueue[i]);
+        /* Discard events which do not fit into new capacity */
+        while (policy != QUEUE_GROW && q->count > capacity) {
+            if (policy == QUEUE_DROP_OLDEST) {
+                free(EventQueuePop(q));
+            } else {
+                free(EventQueuePopNewest(q));
+            }
+            q->dropped++;
+        }
+        size = capacity;
+        if (size < q->count) size = q->count;
+        if (size != q->allocated && !EventQueueResize(q, size)) {
+            failed = 1;
+        }
+    }
+    UNLOCK_EVENT_QUEUE(self)
+
+    if (failed) return PyErr_NoMemory();
+
+    Py_RETURN_NONE;
+}
+
+static char StateMachine_GetEventQueueStats__doc__[] =
+"GetEventQueueStats()\n\n"
+"Gets statistics of incoming events queues, see L{SetEventQueue}.\n\n"
+"@return: Hash with statistics for each event type (Call, SMS, CB, USSD). Each of them is hash with Pending, Capacity, Enqueued, Dropped and HighWater values.\n"
+"@rtype: hash\n"
+;
+
+static PyObject *
+StateMachine_GetEventQueueStats(StateMachineObject *self, PyObject *args, PyObject *kwds)
+{
+    EventQueue          stats[EVENT_LAST];
+    Py_ssize_t          capacity;
+    PyObject            *result;
+    PyObject            *item;
+    int                 i;
+
+    LOCK_EVENT_QUEUE(self)
+    memcpy(stats, self->IncomingQueue, sizeof(stats));
+    capacity = self->event_queue_capacity;
+    UNLOCK_EVENT_QUEUE(self)
+
+    result = PyDict_New();
+    if (result == NULL) return NULL;
+
+    for (i = 0; i < EVENT_LAST; i++) {
+        item = Py_BuildValue("{s:n,s:n,s:n,s:n,s:n}",
+                "Pending", stats[i].count,
+                "Capacity", stats[i].allocated > capacity ? stats[i].allocated : capacity,
+                "Enqueued", stats[i].enqueued,
+                "Dropped", stats[i].dropped,
+                "HighWater", stats[i].high_water);
+        if (item == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        if (PyDict_SetItemString(result, IncomingEventNames[i], item) != 0) {
+            Py_DECREF(item);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(item);
+    }
+
+    return result;
+}
+
 static char StateMachine_SetIncomingCallback__doc__[] =
-"SetIncomingCallback(Callback)\n\n"
+"SetIncomingCallback(Callback, Batch)\n\n"
 "Sets callback function which is called whenever any (enabled) incoming event appears. Please note that you have to enable each event type by calling SetIncoming* functions.\n\n"
-"@param Callback: callback function or None for disabling\n"
+"@param Callback: callback function or None for disabling. Events received while there is no callback are kept in queues configured by L{SetEventQueue} and delivered once callback is set.\n"
 "@type Callback: function, it will get three params: StateMachine object, event type and it's data in dictionary\n"
+"@param Batch: Whether to deliver all pending events at once, defaults to False. In this case callback is called with event type 'Batch' and list of tuples (event type, data) as data.\n"
+"@type Batch: boolean\n"
 "@return: None\n"
 "@rtype: None\n"
 ;
@@ -5260,10 +6202,11 @@ static char StateMachine_SetIncomingCallback__doc__[] =
 static PyObject *
 StateMachine_SetIncomingCallback(StateMachineObject *self, PyObject *args, PyObject *kwds)
 {
-    static char         *kwlist[] = {"Callback", NULL};
+    static char         *kwlist[] = {"Callback", "Batch", NULL};
     PyObject            *temp;
+    int                 batch = FALSE;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &temp))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|p", kwlist, &temp, &batch))
         return NULL;
 
     if (temp == Py_None) {
@@ -5277,6 +6220,7 @@ StateMachine_SetIncomingCallback(StateMachineObject *self, PyObject *args, PyObj
     Py_XDECREF(self->IncomingCallback);
     self->IncomingCallback = temp;
     Py_XINCREF(self->IncomingCallback);
+    self->incoming_batch = batch;
 
     Py_RETURN_NONE;
 }
@@ -5321,6 +6265,7 @@ static struct PyMethodDef StateMachine_methods[] = {
     {"GetMemoryStatus",	(PyCFunction)StateMachine_GetMemoryStatus,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetMemoryStatus__doc__},
     {"GetMemory",	(PyCFunction)StateMachine_GetMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetMemory__doc__},
     {"GetNextMemory",	(PyCFunction)StateMachine_GetNextMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetNextMemory__doc__},
+    {"IterMemory",	(PyCFunction)StateMachine_IterMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_IterMemory__doc__},
     {"SetMemory",	(PyCFunction)StateMachine_SetMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SetMemory__doc__},
     {"AddMemory",	(PyCFunction)StateMachine_AddMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_AddMemory__doc__},
     {"DeleteMemory",	(PyCFunction)StateMachine_DeleteMemory,	METH_VARARGS|METH_KEYWORDS,	StateMachine_DeleteMemory__doc__},
@@ -5332,10 +6277,12 @@ static struct PyMethodDef StateMachine_methods[] = {
     {"GetSMSStatus",	(PyCFunction)StateMachine_GetSMSStatus,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetSMSStatus__doc__},
     {"GetSMS",	(PyCFunction)StateMachine_GetSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetSMS__doc__},
     {"GetNextSMS",	(PyCFunction)StateMachine_GetNextSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_GetNextSMS__doc__},
+    {"IterSMS",	(PyCFunction)StateMachine_IterSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_IterSMS__doc__},
     {"SetSMS",	(PyCFunction)StateMachine_SetSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SetSMS__doc__},
     {"AddSMS",	(PyCFunction)StateMachine_AddSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_AddSMS__doc__},
     {"DeleteSMS",	(PyCFunction)StateMachine_DeleteSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_DeleteSMS__doc__},
     {"SendSMS",	(PyCFunction)StateMachine_SendSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SendSMS__doc__},
+    {"SendSMSBatch",	(PyCFunction)StateMachine_SendSMSBatch,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SendSMSBatch__doc__},
     {"SendSavedSMS",	(PyCFunction)StateMachine_SendSavedSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SendSavedSMS__doc__},
     {"SetIncomingSMS",	(PyCFunction)StateMachine_SetIncomingSMS,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SetIncomingSMS__doc__},
     {"SetIncomingCB",	(PyCFunction)StateMachine_SetIncomingCB,	METH_VARARGS|METH_KEYWORDS,	StateMachine_SetIncomingCB__doc__},
@@ -5417,6 +6364,8 @@ static struct PyMethodDef StateMachine_methods[] = {
     {"SetDebugLevel",   (PyCFunction)StateMachine_SetDebugLevel,   METH_VARARGS|METH_KEYWORDS,   StateMachine_SetDebugLevel__doc__},
 
     {"SetIncomingCallback",   (PyCFunction)StateMachine_SetIncomingCallback,   METH_VARARGS|METH_KEYWORDS,   StateMachine_SetIncomingCallback__doc__},
+    {"SetEventQueue",   (PyCFunction)StateMachine_SetEventQueue,   METH_VARARGS|METH_KEYWORDS,   StateMachine_SetEventQueue__doc__},
+    {"GetEventQueueStats",   (PyCFunction)StateMachine_GetEventQueueStats,   METH_VARARGS|METH_KEYWORDS,   StateMachine_GetEventQueueStats__doc__},
 
     {NULL,		NULL, 0, NULL}		/* sentinel */
 };
@@ -5471,6 +6420,8 @@ StateMachine_str(StateMachineObject *self)
 static void
 StateMachine_dealloc(StateMachineObject *self)
 {
+    int i;
+
     if (self->in_callback) {
         PyObject *error_type = NULL;
         PyObject *error_value = NULL;
@@ -5499,6 +6450,10 @@ StateMachine_dealloc(StateMachineObject *self)
     }
     GSM_FreeStateMachine(self->s);
     self->s = NULL;
+    /* Discard events which were not delivered */
+    for (i = 0; i < EVENT_LAST; i++) {
+        EventQueueFree(&(self->IncomingQueue[i]));
+    }
     END_PHONE_COMM
 
     if (self->DebugFile != NULL) {
@@ -5508,6 +6463,7 @@ StateMachine_dealloc(StateMachineObject *self)
 
 #ifdef WITH_THREAD
     PyThread_free_lock(self->mutex);
+    PyThread_free_lock(self->queue_mutex);
 #endif
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
@@ -5524,15 +6480,17 @@ StateMachine_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->DebugFile         = NULL;
     self->IncomingCallback  = NULL;
     self->in_callback       = 0;
+    self->incoming_batch    = 0;
 
-    self->IncomingCallQueue[0] = NULL;
-    self->IncomingSMSQueue[0] = NULL;
-    self->IncomingCBQueue[0] = NULL;
-    self->IncomingUSSDQueue[0] = NULL;
+    /* Incoming events queues */
+    memset(self->IncomingQueue, 0, sizeof(self->IncomingQueue));
+    self->event_queue_capacity = DEFAULT_EVENT_QUEUE_CAPACITY;
+    self->event_queue_policy = QUEUE_GROW;
 
     /* Create phone communication lock */
 #ifdef WITH_THREAD
     self->mutex = PyThread_allocate_lock();
+    self->queue_mutex = PyThread_allocate_lock();
 #endif
 
     return (PyObject *)self;
@@ -5705,6 +6663,21 @@ gammu_SetDebugLevel(PyObject *self, PyObject *args, PyObject *kwds)
     Py_RETURN_NONE;
 }
 
+/**
+ * Frees NULL terminated list of multipart messages.
+ */
+static void
+FreeMultiSMSList(GSM_MultiSMSMessage **list)
+{
+    int i = 0;
+
+    while(list[i] != NULL) {
+        free(list[i]);
+        i++;
+    }
+    free(list);
+}
+
 static char gammu_LinkSMS__doc__[] =
 "LinkSMS(Messages, EMS)\n\n"
 "Links multi part SMS messages.\n\n"
@@ -5727,7 +6700,6 @@ gammu_LinkSMS(PyObject *self, PyObject *args, PyObject *kwds)
     PyObject            *value;
     PyObject            *ret;
     Py_ssize_t          len;
-    int                 i;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|I", kwlist,
                 &PyList_Type, &(value), &ems))
@@ -5739,26 +6711,114 @@ gammu_LinkSMS(PyObject *self, PyObject *args, PyObject *kwds)
 
     smsout = (GSM_MultiSMSMessage **)malloc((len + 1) * sizeof(GSM_MultiSMSMessage *));
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_LinkSMS(GSM_GetGlobalDebug(), smsin, smsout, ems);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "LinkSMS")) return NULL;
 
     ret = MultiSMSListToPython(smsout);
 
-    i = 0;
-    while(smsout[i] != NULL) {
-        free(smsout[i]);
-        i++;
+    FreeMultiSMSList(smsout);
+    FreeMultiSMSList(smsin);
+
+    return ret;
+}
+
+static char gammu_LinkAndDecodeSMS__doc__[] =
+"LinkAndDecodeSMS(Messages, EMS)\n\n"
+"Links multi part SMS messages and decodes them, this is equivalent to "
+"calling DecodeSMS on every message returned by LinkSMS.\n\n"
+"@type Messages: list\n"
+"@type EMS: boolean\n"
+"@param Messages: List of messages to link\n"
+"@param EMS: Whether to detect ems, defaults to True\n"
+"@return: List of tuples with linked message and multi part message "
+"information (None if message can not be decoded)\n"
+"@rtype: list\n"
+;
+
+static PyObject *
+gammu_LinkAndDecodeSMS(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    int                 ems = 1;
+    GSM_MultiSMSMessage **smsin;
+    GSM_MultiSMSMessage **smsout;
+    GSM_MultiPartSMSInfo smsinfo;
+    static char         *kwlist[] = {"Messages", "EMS", NULL};
+    GSM_Error           error;
+    PyObject            *value;
+    PyObject            *ret;
+    PyObject            *multi;
+    PyObject            *info;
+    PyObject            *item;
+    Py_ssize_t          len;
+    int                 i;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|I", kwlist,
+                &PyList_Type, &(value), &ems))
+        return NULL;
+
+    len = PyList_Size(value);
+
+    if (!MultiSMSListFromPython(value, &smsin)) return NULL;
+
+    smsout = (GSM_MultiSMSMessage **)calloc(len + 1, sizeof(GSM_MultiSMSMessage *));
+    if (smsout == NULL) {
+        FreeMultiSMSList(smsin);
+        return PyErr_NoMemory();
     }
-    free(smsout);
 
-    i = 0;
-    while(smsin[i] != NULL) {
-        free(smsin[i]);
-        i++;
+    Py_BEGIN_ALLOW_THREADS
+    error = GSM_LinkSMS(GSM_GetGlobalDebug(), smsin, smsout, ems);
+    Py_END_ALLOW_THREADS
+
+    FreeMultiSMSList(smsin);
+    if (!checkError(error, "LinkSMS")) {
+        FreeMultiSMSList(smsout);
+        return NULL;
+    }
+
+    ret = PyList_New(0);
+    if (ret == NULL) {
+        FreeMultiSMSList(smsout);
+        return NULL;
+    }
+
+    for (i = 0; smsout[i] != NULL; i++) {
+        multi = MultiSMSToPython(smsout[i]);
+        if (multi == NULL)
+            goto fail;
+
+        if (GSM_DecodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, smsout[i], ems)) {
+            info = SMSInfoToPython(&smsinfo);
+        } else {
+            Py_INCREF(Py_None);
+            info = Py_None;
+        }
+        GSM_FreeMultiPartSMSInfo(&smsinfo);
+        if (info == NULL) {
+            Py_DECREF(multi);
+            goto fail;
+        }
+
+        item = Py_BuildValue("(NN)", multi, info);
+        if (item == NULL)
+            goto fail;
+        if (PyList_Append(ret, item) != 0) {
+            Py_DECREF(item);
+            goto fail;
+        }
+        Py_DECREF(item);
     }
-    free(smsin);
 
+    FreeMultiSMSList(smsout);
     return ret;
+
+fail:
+    FreeMultiSMSList(smsout);
+    Py_DECREF(ret);
+    return NULL;
 }
 
 static char gammu_DecodeSMS__doc__[] =
@@ -5781,6 +6841,7 @@ gammu_DecodeSMS(PyObject *self, PyObject *args, PyObject *kwds)
     static char                 *kwlist[] = {"Messages", "EMS", NULL};
     PyObject                    *value;
     PyObject                    *res;
+    gboolean                    decoded;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|I", kwlist,
                 &PyList_Type, &(value), &ems))
@@ -5788,7 +6849,11 @@ gammu_DecodeSMS(PyObject *self, PyObject *args, PyObject *kwds)
 
     if (!MultiSMSFromPython(value, &smsin)) return NULL;
 
-    if (!GSM_DecodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, &smsin, ems)) {
+    Py_BEGIN_ALLOW_THREADS
+    decoded = GSM_DecodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, &smsin, ems);
+    Py_END_ALLOW_THREADS
+
+    if (!decoded) {
         GSM_FreeMultiPartSMSInfo(&smsinfo);
         Py_RETURN_NONE;
     }
@@ -5815,6 +6880,7 @@ gammu_EncodeSMS(PyObject *self, PyObject *args, PyObject *kwds)
     GSM_MultiPartSMSInfo        smsinfo;
     static char                 *kwlist[] = {"MessagesInfo", NULL};
     PyObject                    *value;
+    GSM_Error                   error;
 
     memset(&smsout, 0, sizeof(GSM_MultiSMSMessage));
 
@@ -5824,7 +6890,11 @@ gammu_EncodeSMS(PyObject *self, PyObject *args, PyObject *kwds)
 
     if (!SMSInfoFromPython(value, &smsinfo)) return NULL;
 
-    if (!GSM_EncodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, &smsout)) {
+    Py_BEGIN_ALLOW_THREADS
+    error = GSM_EncodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, &smsout);
+    Py_END_ALLOW_THREADS
+
+    if (!error) {
         GSM_FreeMultiPartSMSInfo(&smsinfo);
         Py_RETURN_NONE;
     }
@@ -5856,7 +6926,10 @@ gammu_DecodeVCARD(PyObject *self, PyObject *args, PyObject *kwds)
                 &buffer))
         return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_DecodeVCARD(GSM_GetGlobalDebug(), buffer, &pos, &entry, SonyEricsson_VCard21);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "DecodeVCARD")) return NULL;
 
     result = MemoryEntryToPython(&entry);
@@ -5922,7 +6995,10 @@ gammu_DecodeVCS(PyObject *self, PyObject *args, PyObject *kwds)
     todo_entry.Location = 0;
     calendar_entry.Location = 0;
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_DecodeVCALENDAR_VTODO(GSM_GetGlobalDebug(), buffer, &pos, &calendar_entry, &todo_entry, SonyEricsson_VCalendar, SonyEricsson_VToDo);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "DecodeVCS")) return NULL;
 
     if (calendar_entry.EntriesNum > 0) {
@@ -5958,7 +7034,10 @@ gammu_DecodeICS(PyObject *self, PyObject *args, PyObject *kwds)
                 &buffer))
         return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_DecodeVCALENDAR_VTODO(GSM_GetGlobalDebug(), buffer, &pos, &calendar_entry, &todo_entry, Mozilla_iCalendar, Mozilla_VToDo);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "DecodeICS")) return NULL;
 
     if (calendar_entry.EntriesNum > 0) {
@@ -6211,8 +7290,9 @@ static char gammu_SaveBackup__doc__[] =
 "Saves backup into file.\n\n"
 "@param Filename: Name of file to read backup from\n"
 "@type Filename: string\n"
-"@param Backup: Backup data, see L{ReadBackup} for description\n"
-"@type Backup: dict\n"
+"@param Backup: Backup data, see L{ReadBackup} for description, "
+"L{BackupRecord} is saved as it was read\n"
+"@type Backup: dict or L{BackupRecord}\n"
 "@param Format: File format to use (default is AutoUnicode)\n"
 "@type Format: string (Auto, AutoUnicode, LMB, VCalendar, VCard, LDIF, ICS, Gammu, GammuUnicode)\n"
 "@return: None\n"
@@ -6232,8 +7312,8 @@ gammu_SaveBackup(PyObject *self, PyObject *args, PyObject *kwds)
 
     GSM_ClearBackup(&backup);
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO!|s", kwlist,
-                &filename, &PyDict_Type, &(value), &s))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO&|s", kwlist,
+                &filename, BackupObjectConverter, &(value), &s))
         return NULL;
 
     if (s != NULL) {
@@ -6242,27 +7322,39 @@ gammu_SaveBackup(PyObject *self, PyObject *args, PyObject *kwds)
         }
     }
 
-    if (!BackupFromPython(value, &backup))
+    if (BackupRecordCheck(value)) {
+        /* Entries are owned by the record, only header is changed */
+        backup = *BackupRecordGetBackup(value);
+    } else if (!BackupFromPython(value, &backup)) {
         return NULL;
+    }
 
     GSM_GetCurrentDateTime(&backup.DateTime);
     backup.DateTimeAvailable = TRUE;
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_SaveBackupFile(filename, &backup, format);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "SaveBackup")) return NULL;
 
-    GSM_FreeBackup(&backup);
+    if (!BackupRecordCheck(value)) {
+        GSM_FreeBackup(&backup);
+    }
 
     Py_RETURN_NONE;
 }
 
 static char gammu_ReadBackup__doc__[] =
-"ReadBackup(Filename, Format)\n\n"
+"ReadBackup(Filename, Format, Lazy)\n\n"
 "Reads backup into file.\n\n"
 "@param Filename: Name of file where backup is stored\n"
 "@type Filename: string\n"
 "@param Format: File format to use (default is AutoUnicode)\n"
 "@type Format: string (Auto, AutoUnicode, LMB, VCalendar, VCard, LDIF, ICS, Gammu, GammuUnicode)\n"
+"@param Lazy: Whether to return L{BackupRecord}, which converts sections "
+"only when they are accessed, defaults to False\n"
+"@type Lazy: boolean\n"
 "@return: Dictionary of read entries, it contains following keys, each might be empty:\n"
 " - IMEI\n"
 " - Model\n"
@@ -6278,18 +7370,17 @@ static char gammu_ReadBackup__doc__[] =
 static PyObject *
 gammu_ReadBackup(PyObject *self, PyObject *args, PyObject *kwds)
 {
-    static char                 *kwlist[] = {"Filename", "Format", NULL};
+    static char                 *kwlist[] = {"Filename", "Format", "Lazy", NULL};
     char                        *filename;
-    GSM_Backup                  backup;
+    GSM_Backup                  *backup;
     GSM_Error                   error;
     GSM_BackupFormat            format = GSM_Backup_AutoUnicode;
     char                        *s = NULL;
+    int                         lazy = 0;
     PyObject                    *result;
 
-    GSM_ClearBackup(&backup);
-
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|s", kwlist,
-                &filename, &s))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|zp", kwlist,
+                &filename, &s, &lazy))
         return NULL;
 
     if (s != NULL) {
@@ -6298,12 +7389,35 @@ gammu_ReadBackup(PyObject *self, PyObject *args, PyObject *kwds)
         }
     }
 
-    error = GSM_ReadBackupFile(filename, &backup, format);
-    if (!checkError(error, "ReadBackup")) return NULL;
+    /* Allocated as record takes ownership of it */
+    backup = (GSM_Backup *)malloc(sizeof(GSM_Backup));
+    if (backup == NULL) return PyErr_NoMemory();
+
+    GSM_ClearBackup(backup);
+
+    Py_BEGIN_ALLOW_THREADS
+    error = GSM_ReadBackupFile(filename, backup, format);
+    Py_END_ALLOW_THREADS
+
+    if (!checkError(error, "ReadBackup")) {
+        GSM_FreeBackup(backup);
+        free(backup);
+        return NULL;
+    }
+
+    if (lazy) {
+        result = BackupRecordFromBackup(backup);
+        if (result == NULL) {
+            GSM_FreeBackup(backup);
+            free(backup);
+        }
+        return result;
+    }
 
-    result = BackupToPython(&backup);
+    result = BackupToPython(backup);
 
-    GSM_FreeBackup(&backup);
+    GSM_FreeBackup(backup);
+    free(backup);
 
     return result;
 }
@@ -6336,229 +7450,1278 @@ gammu_SaveSMSBackup(PyObject *self, PyObject *args, PyObject *kwds)
     if (!SMSBackupFromPython(value, &backup))
         return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     error = GSM_AddSMSBackupFile(filename, &backup);
+    Py_END_ALLOW_THREADS
+
     if (!checkError(error, "SaveSMSBackup")) return NULL;
 
-    GSM_FreeSMSBackup(&backup);
-    Py_RETURN_NONE;
+    GSM_FreeSMSBackup(&backup);
+    Py_RETURN_NONE;
+}
+
+static char gammu_ReadSMSBackup__doc__[] =
+"ReadSMSBackup(Filename, Lazy = None)\n\n"
+"Reads SMS backup into file. Whole file is loaded at once and at most "
+"GSM_BACKUP_MAX_SMS messages can be read, use L{IterSMSBackup} for bigger "
+"files.\n\n"
+"@param Filename: Name of file where SMS backup is stored\n"
+"@type Filename: string\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
+"@return: List of messages read from file\n"
+"@rtype: list\n"
+;
+
+static PyObject *
+gammu_ReadSMSBackup(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char                 *kwlist[] = {"Filename", "Lazy", NULL};
+    char                        *filename;
+    int                         lazy = -1;
+    GSM_SMS_Backup              backup;
+    GSM_Error                   error;
+    PyObject                    *result;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O&", kwlist,
+                &filename, LazyConverter, &lazy))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    error = GSM_ReadSMSBackupFile(filename, &backup);
+    Py_END_ALLOW_THREADS
+
+    if (!checkError(error, "ReadSMSBackup")) return NULL;
+
+    result = SMSBackupToPythonLazy(&backup, lazy);
+    GSM_FreeSMSBackup(&backup);
+    return result;
+}
+
+/* Default number of messages returned at once from SMS backup */
+#define DEFAULT_SMS_BACKUP_CHUNK 100
+
+/* Prefix of section names of messages in SMS backup */
+#define SMS_BACKUP_SECTION "[SMSBackup"
+
+/* Size of buffer for reading SMS backup, longer lines are read in pieces */
+#define SMS_BACKUP_LINE 1024
+
+/**
+ * Checks whether line starts section of message in SMS backup.
+ */
+static int
+SMSBackupIsSection(const char *line)
+{
+    return PyOS_strnicmp(line, SMS_BACKUP_SECTION, strlen(SMS_BACKUP_SECTION)) == 0;
+}
+
+/**
+ * Counts message sections in SMS backup, starting at current position.
+ */
+static long
+SMSBackupCountSections(FILE *f)
+{
+    char                        line[SMS_BACKUP_LINE];
+    long                        count = 0;
+    int                         line_start = TRUE;
+
+    while (fgets(line, sizeof(line), f) != NULL) {
+        if (line_start && SMSBackupIsSection(line)) {
+            count++;
+        }
+        line_start = (strchr(line, '\n') != NULL);
+    }
+    return count;
+}
+
+/**
+ * Creates temporary file used for parsing chunks of SMS backup.
+ */
+static char *
+SMSBackupTempFile(void)
+{
+    PyObject                    *module;
+    PyObject                    *result;
+    PyObject                    *closed;
+    PyObject                    *path;
+    char                        *name = NULL;
+
+    module = PyImport_ImportModule("tempfile");
+    if (module == NULL) return NULL;
+    result = PyObject_CallMethod(module, "mkstemp", "s", ".smsbackup");
+    Py_DECREF(module);
+    if (result == NULL) return NULL;
+
+    /* Only name is needed, libgammu opens the file itself */
+    module = PyImport_ImportModule("os");
+    if (module == NULL) goto out;
+    closed = PyObject_CallMethod(module, "close", "O", PyTuple_GET_ITEM(result, 0));
+    Py_DECREF(module);
+    if (closed == NULL) goto out;
+    Py_DECREF(closed);
+
+    if (!PyUnicode_FSConverter(PyTuple_GET_ITEM(result, 1), &path)) goto out;
+    name = strdup(PyBytes_AS_STRING(path));
+    Py_DECREF(path);
+    if (name == NULL) PyErr_NoMemory();
+
+out:
+    Py_DECREF(result);
+    return name;
+}
+
+/* Declarations for objects of type SMSBackupIterator */
+typedef struct {
+    PyObject_HEAD
+
+    FILE                        *file;
+    char                        *chunk_file;
+    int                         chunk;
+    int                         lazy;
+    int                         read;
+    int                         total;
+} SMSBackupIteratorObject;
+
+/**
+ * Copies next chunk of sections from SMS backup to separate file.
+ *
+ * Sections are renumbered, so that duplicate section names created by
+ * appending to the backup do not hide messages. Returns number of copied
+ * sections or -1 on error.
+ */
+static int
+SMSBackupCopyChunk(SMSBackupIteratorObject *it)
+{
+    char                        line[SMS_BACKUP_LINE];
+    FILE                        *out;
+    fpos_t                      pos;
+    int                         sections = 0;
+    int                         line_start = TRUE;
+    int                         in_section = FALSE;
+
+    out = fopen(it->chunk_file, "wb");
+    if (out == NULL) return -1;
+
+    while (TRUE) {
+        if (fgetpos(it->file, &pos) != 0) break;
+        if (fgets(line, sizeof(line), it->file) == NULL) break;
+
+        if (line_start && line[0] == '[') {
+            in_section = SMSBackupIsSection(line);
+            if (in_section) {
+                if (sections == it->chunk) {
+                    /* Section belongs to next chunk */
+                    fsetpos(it->file, &pos);
+                    break;
+                }
+                fprintf(out, "[SMSBackup%03d]\n", sections++);
+                line_start = (strchr(line, '\n') != NULL);
+                continue;
+            }
+        }
+        line_start = (strchr(line, '\n') != NULL);
+
+        if (in_section) {
+            fputs(line, out);
+        }
+    }
+
+    if (ferror(it->file) || fclose(out) != 0) return -1;
+
+    return sections;
+}
+
+static PyObject *
+SMSBackupIterator_next(SMSBackupIteratorObject *it)
+{
+    PyObject                    *result;
+    PyObject                    *item;
+    GSM_SMS_Backup              *backup;
+    GSM_Error                   error = ERR_NONE;
+    int                         sections;
+    int                         i;
+
+    if (it->file == NULL) return NULL;
+
+    backup = (GSM_SMS_Backup *)malloc(sizeof(GSM_SMS_Backup));
+    if (backup == NULL) return PyErr_NoMemory();
+
+    Py_BEGIN_ALLOW_THREADS
+    sections = SMSBackupCopyChunk(it);
+    if (sections > 0) {
+        error = GSM_ReadSMSBackupFile(it->chunk_file, backup);
+    }
+    Py_END_ALLOW_THREADS
+
+    if (sections <= 0) {
+        free(backup);
+        fclose(it->file);
+        it->file = NULL;
+        if (sections < 0) {
+            checkError(ERR_CANTOPENFILE, "IterSMSBackup");
+        }
+        return NULL;
+    }
+
+    if (!checkError(error, "IterSMSBackup")) {
+        free(backup);
+        return NULL;
+    }
+
+    result = PyList_New(0);
+    for (i = 0; result != NULL && backup->SMS[i] != NULL; i++) {
+        item = SMSToPythonLazy(backup->SMS[i], it->lazy);
+        if (item == NULL || PyList_Append(result, item) != 0) {
+            Py_XDECREF(item);
+            Py_CLEAR(result);
+            break;
+        }
+        Py_DECREF(item);
+    }
+    it->read += i;
+
+    GSM_FreeSMSBackup(backup);
+    free(backup);
+    return result;
+}
+
+static void
+SMSBackupIterator_dealloc(SMSBackupIteratorObject *it)
+{
+    if (it->file != NULL) {
+        fclose(it->file);
+    }
+    if (it->chunk_file != NULL) {
+        remove(it->chunk_file);
+        free(it->chunk_file);
+    }
+    Py_TYPE(it)->tp_free((PyObject*)it);
+}
+
+static PyMemberDef SMSBackupIterator_members[] = {
+    {"Read",    T_INT, offsetof(SMSBackupIteratorObject, read),  READONLY, "Number of messages returned so far."},
+    {"Total",   T_INT, offsetof(SMSBackupIteratorObject, total), READONLY, "Number of message sections in backup, messages which can not be read are not returned."},
+    {NULL}  /* Sentinel */
+};
+
+static char SMSBackupIteratorType__doc__[] =
+"Iterator returning chunks of messages from SMS backup.\n\n"
+"Progress can be watched using Read and Total attributes.\n"
+;
+
+static PyTypeObject SMSBackupIteratorType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_gammu.SMSBackupIterator",		/*tp_name*/
+    sizeof(SMSBackupIteratorObject),	/*tp_basicsize*/
+    0,				/*tp_itemsize*/
+    /* methods */
+    (destructor)SMSBackupIterator_dealloc,	/*tp_dealloc*/
+    (printfunc)0,		/*tp_print*/
+    0,	/*tp_getattr*/
+    0,	/*tp_setattr*/
+    0,
+    0,
+    0,			/*tp_as_number*/
+    0,		/*tp_as_sequence*/
+    0,		/*tp_as_mapping*/
+    (hashfunc)0,		/*tp_hash*/
+    (ternaryfunc)0,		/*tp_call*/
+    0,
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+    SMSBackupIteratorType__doc__, /* Documentation string */
+    0,		               /* tp_traverse */
+    0,		               /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    PyObject_SelfIter,         /* tp_iter */
+    (iternextfunc)SMSBackupIterator_next, /* tp_iternext */
+    0,                         /* tp_methods */
+    SMSBackupIterator_members, /* tp_members */
+};
+
+static char gammu_IterSMSBackup__doc__[] =
+"IterSMSBackup(Filename, Chunk, Lazy = None)\n\n"
+"Reads SMS backup and returns iterator over chunks of messages. The file "
+"is split on message sections and only sections of requested chunk are "
+"parsed, so memory usage depends on chunk size and not on size of the "
+"backup. Unlike L{ReadSMSBackup}, files with more than "
+"GSM_BACKUP_MAX_SMS messages and files with duplicate section names "
+"(written by several calls to L{SaveSMSBackup}) can be read.\n\n"
+"@param Filename: Name of file where SMS backup is stored\n"
+"@type Filename: string\n"
+"@param Chunk: Number of messages in one chunk, defaults to 100, it is "
+"limited by GSM_BACKUP_MAX_SMS\n"
+"@type Chunk: int\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
+"@return: Iterator returning lists of messages\n"
+"@rtype: iterator\n"
+;
+
+static PyObject *
+gammu_IterSMSBackup(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char                 *kwlist[] = {"Filename", "Chunk", "Lazy", NULL};
+    char                        *filename;
+    int                         chunk = DEFAULT_SMS_BACKUP_CHUNK;
+    int                         lazy = -1;
+    long                        total = 0;
+    FILE                        *f;
+    SMSBackupIteratorObject     *it;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|iO&", kwlist,
+                &filename, &chunk, LazyConverter, &lazy))
+        return NULL;
+
+    if (chunk <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Chunk has to be positive");
+        return NULL;
+    }
+    if (chunk > GSM_BACKUP_MAX_SMS) {
+        chunk = GSM_BACKUP_MAX_SMS;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    f = fopen(filename, "rb");
+    if (f != NULL) {
+        total = SMSBackupCountSections(f);
+        rewind(f);
+    }
+    Py_END_ALLOW_THREADS
+
+    if (f == NULL) {
+        checkError(ERR_CANTOPENFILE, "IterSMSBackup");
+        return NULL;
+    }
+
+    it = PyObject_New(SMSBackupIteratorObject, &SMSBackupIteratorType);
+    if (it == NULL) {
+        fclose(f);
+        return NULL;
+    }
+
+    it->file = f;
+    it->chunk = chunk;
+    it->lazy = lazy < 0 ? SMSRecordGetLazy() : lazy;
+    it->read = 0;
+    it->total = (int)total;
+    it->chunk_file = SMSBackupTempFile();
+    if (it->chunk_file == NULL) {
+        Py_DECREF(it);
+        return NULL;
+    }
+
+    return (PyObject *)it;
+}
+
+static char gammu_CountSMSBackup__doc__[] =
+"CountSMSBackup(Filename)\n\n"
+"Estimates number of messages in SMS backup without parsing them.\n\n"
+"Only message section headers are counted, so the result is an upper "
+"bound. It is higher than number of messages actually read when the file "
+"contains sections which are skipped while reading, for example ones "
+"without a number. L{ReadSMSBackup} can additionally read less messages "
+"when the file contains duplicate section names (for example written by "
+"several calls to L{SaveSMSBackup}).\n\n"
+"@param Filename: Name of file where SMS backup is stored\n"
+"@type Filename: string\n"
+"@return: Number of message sections in file\n"
+"@rtype: int\n"
+;
+
+static PyObject *
+gammu_CountSMSBackup(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char                 *kwlist[] = {"Filename", NULL};
+    char                        *filename;
+    FILE                        *f;
+    long                        count = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s", kwlist,
+                &filename))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    f = fopen(filename, "rb");
+    if (f != NULL) {
+        count = SMSBackupCountSections(f);
+        fclose(f);
+    }
+    Py_END_ALLOW_THREADS
+
+    if (f == NULL) {
+        checkError(ERR_CANTOPENFILE, "CountSMSBackup");
+        return NULL;
+    }
+
+    return PyLong_FromLong(count);
+}
+#endif
+
+/**
+ * Parses UDH and coding parameters of SMS counter.
+ */
+static int
+SMSCounterParams(const char *udh_s, const char *coding_s, GSM_UDH *udh, GSM_Coding_Type *coding)
+{
+    if (udh_s[0] == 0) {
+        *udh = UDH_NoUDH;
+    } else {
+        *udh = StringToUDHType(udh_s);
+        if (*udh == 0) return 0;
+    }
+
+    if (coding_s[0] == 0) {
+        *coding = SMS_Coding_Default_No_Compression;
+    } else {
+        *coding = StringToSMSCoding(coding_s) ;
+        if (*coding == 0) return 0;
+    }
+
+    return 1;
+}
+
+static char gammu_SetLazySMS__doc__[] =
+"SetLazySMS(Lazy)\n\n"
+"Sets whether messages are returned as L{SMSRecord} objects instead of "
+"dictionaries. Records convert fields to Python only when accessed and "
+"are accepted everywhere where SMS dictionary is expected. Fields of "
+"records can be changed by item assignment same as in dictionaries. The "
+"setting is global for whole module and all threads, it is only used as "
+"default for functions which accept Lazy parameter, passing it to them is "
+"preferred over changing this setting.\n\n"
+"@param Lazy: Whether to return records\n"
+"@type Lazy: boolean\n"
+"@return: Previous setting\n"
+"@rtype: boolean\n"
+;
+
+static PyObject *
+gammu_SetLazySMS(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"Lazy", NULL};
+    int lazy;
+    int previous;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "p", kwlist, &lazy))
+        return NULL;
+
+    previous = SMSRecordGetLazy();
+    SMSRecordSetLazy(lazy);
+
+    return PyBool_FromLong(previous);
+}
+
+static char gammu_SMSCounter__doc__[] =
+"SMSCounter(Text, UDH = \"NoUDH\", Coding = \"Default\")\n\n"
+"Calculates number of SMS and free chars in SMS.\n\n"
+"@return: Number of messages and number of free chars\n"
+"@rtype: tuple\n"
+;
+
+static PyObject *
+gammu_SMSCounter(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"Text", "UDH", "Coding", NULL};
+    PyObject *o = Py_None;
+    const char *udh_s = "\0", *coding_s = "\0";
+    unsigned char *str;
+    GSM_UDH udh;
+    GSM_Coding_Type coding;
+    int SMSNum;
+    size_t CharsLeft;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U|ss", kwlist,
+                &o, &udh_s, &coding_s))
+        return NULL;
+
+    if (!SMSCounterParams(udh_s, coding_s, &udh, &coding)) return NULL;
+
+    str = StringPythonToGammu(o);
+    if (str == NULL) return NULL;
+
+    GSM_SMSCounter(GSM_GetGlobalDebug(), str, udh, coding, &SMSNum, &CharsLeft);
+    free(str);
+
+    return Py_BuildValue("(ii)", SMSNum, CharsLeft);
+}
+
+static char gammu_SMSCounterMany__doc__[] =
+"SMSCounterMany(Texts, UDH = \"NoUDH\", Coding = \"Default\")\n\n"
+"Calculates number of SMS and free chars in SMS for several texts.\n\n"
+"@param Texts: Texts to count\n"
+"@type Texts: iterable\n"
+"@return: Arrays (of type 'i') with number of messages and number of free chars\n"
+"@rtype: tuple\n"
+;
+
+static PyObject *
+gammu_SMSCounterMany(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"Texts", "UDH", "Coding", NULL};
+    PyObject *value;
+    PyObject *seq;
+    PyObject *item;
+    PyObject *array_module = NULL;
+    PyObject *numbers_array;
+    PyObject *chars_array;
+    PyObject *result = NULL;
+    const char *udh_s = "\0", *coding_s = "\0";
+    unsigned char **str = NULL;
+    int *numbers = NULL;
+    int *chars = NULL;
+    Py_ssize_t count, i;
+    GSM_UDH udh;
+    GSM_Coding_Type coding;
+    int SMSNum;
+    size_t CharsLeft;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|ss", kwlist,
+                &value, &udh_s, &coding_s))
+        return NULL;
+
+    if (!SMSCounterParams(udh_s, coding_s, &udh, &coding)) return NULL;
+
+    seq = PySequence_Fast(value, "Texts has to be iterable");
+    if (seq == NULL) return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+
+    str = (unsigned char **)calloc(count + 1, sizeof(unsigned char *));
+    numbers = (int *)malloc((count + 1) * sizeof(int));
+    chars = (int *)malloc((count + 1) * sizeof(int));
+    if (str == NULL || numbers == NULL || chars == NULL) {
+        PyErr_NoMemory();
+        goto out;
+    }
+
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (!PyUnicode_Check(item)) {
+            PyErr_Format(PyExc_TypeError, "Element %" PY_FORMAT_SIZE_T "d in Texts is not string", i);
+            goto out;
+        }
+        str[i] = StringPythonToGammu(item);
+        if (str[i] == NULL) goto out;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < count; i++) {
+        GSM_SMSCounter(GSM_GetGlobalDebug(), str[i], udh, coding, &SMSNum, &CharsLeft);
+        numbers[i] = SMSNum;
+        chars[i] = (int)CharsLeft;
+    }
+    Py_END_ALLOW_THREADS
+
+    array_module = PyImport_ImportModule("array");
+    if (array_module == NULL) goto out;
+
+    numbers_array = PyObject_CallMethod(array_module, "array", "sy#", "i",
+            (char *)numbers, (Py_ssize_t)(count * sizeof(int)));
+    if (numbers_array == NULL) goto out;
+
+    chars_array = PyObject_CallMethod(array_module, "array", "sy#", "i",
+            (char *)chars, (Py_ssize_t)(count * sizeof(int)));
+    if (chars_array == NULL) {
+        Py_DECREF(numbers_array);
+        goto out;
+    }
+
+    result = Py_BuildValue("(NN)", numbers_array, chars_array);
+
+out:
+    if (str != NULL) {
+        for (i = 0; i < count; i++) {
+            free(str[i]);
+        }
+    }
+    free(str);
+    free(numbers);
+    free(chars);
+    Py_XDECREF(array_module);
+    Py_DECREF(seq);
+    return result;
+}
+
+/**
+ * Parses SMSC flag for PDU decoding.
+ */
+static int
+SMSCFlagFromPython(PyObject *o, gboolean *smsc)
+{
+    if (o == Py_None) {
+        *smsc = TRUE;
+    } else if (o == Py_False) {
+        *smsc = FALSE;
+    } else if (o == Py_True) {
+        *smsc = TRUE;
+    } else {
+        PyErr_SetString(PyExc_TypeError, "use None or boolean as SMSC!");
+        return 0;
+    }
+    return 1;
+}
+
+static char gammu_DecodePDU__doc__[] =
+"DecodePDU(Data, SMSC = False, Lazy = None)\n\n"
+"Parses PDU packet.\n\n"
+"@param Data: PDU data, need to be binary not hex encoded\n"
+"@type Data: string\n"
+"@param SMSC: Whether PDU includes SMSC.\n"
+"@type SMSC: boolean\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
+"@return: Message data\n"
+"@rtype: dict\n"
+;
+
+static PyObject *
+gammu_DecodePDU(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"Data", "SMSC", "Lazy", NULL};
+    GSM_Error error;
+    PyObject *result;
+    PyObject *o = Py_None;
+    gboolean smsc;
+    int lazy = -1;
+    const unsigned char *pdu;
+    Py_ssize_t pdulen;
+	size_t parse_len = 0;
+    GSM_SMSMessage sms;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s#|OO&", kwlist,
+                &pdu, &pdulen, &o, LazyConverter, &lazy))
+        return NULL;
+
+    if (!SMSCFlagFromPython(o, &smsc))
+        return NULL;
+
+    GSM_SetDefaultSMSData(&sms);
+
+    Py_BEGIN_ALLOW_THREADS
+	error = GSM_DecodePDUFrame(NULL, &sms,  pdu, pdulen, &parse_len, smsc);
+    Py_END_ALLOW_THREADS
+
+    if (!checkError(error, "DecodePDUFrame")) return NULL;
+
+    result = SMSToPythonLazy(&sms, lazy);
+    return result;
+}
+
+/* Number of PDUs decoded at once without holding GIL */
+#define PDU_BATCH_CHUNK 64
+
+enum PDUBatchErrors {
+    PDU_ERRORS_RAISE = 1,
+    PDU_ERRORS_SKIP,
+    PDU_ERRORS_COLLECT
+};
+
+static char gammu_DecodePDUBatch__doc__[] =
+"DecodePDUBatch(Data, SMSC = False, Errors = \"raise\", Lazy = None)\n\n"
+"Parses several PDU packets at once.\n\n"
+"@param Data: Iterable of PDU data, need to be binary not hex encoded\n"
+"@type Data: iterable\n"
+"@param SMSC: Whether PDUs include SMSC.\n"
+"@type SMSC: boolean\n"
+"@param Errors: How to handle PDUs which can not be decoded, \"raise\" "
+"raises exception for first of them, \"skip\" leaves them out from result "
+"and \"collect\" puts None into result and reports errors separately.\n"
+"@type Errors: string\n"
+"@param Lazy: Whether to return L{SMSRecord} objects instead of dictionaries, defaults to setting of L{SetLazySMS}\n"
+"@type Lazy: boolean\n"
+"@return: List of messages data, for \"collect\" tuple of list of messages "
+"and list of (index, error name) tuples\n"
+"@rtype: list or tuple\n"
+;
+
+static PyObject *
+gammu_DecodePDUBatch(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"Data", "SMSC", "Errors", "Lazy", NULL};
+    PyObject *data;
+    PyObject *o = Py_None;
+    PyObject *seq;
+    PyObject *item;
+    PyObject *result = NULL;
+    PyObject *errors = NULL;
+    const char *errors_s = "raise";
+    int lazy = -1;
+    const char *name;
+    enum PDUBatchErrors mode;
+    gboolean smsc;
+    Py_ssize_t count, start, len, i;
+    Py_buffer *buffers = NULL;
+    GSM_Error *codes = NULL;
+    GSM_SMSMessage *sms = NULL;
+    size_t parse_len;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OsO&", kwlist,
+                &data, &o, &errors_s, LazyConverter, &lazy))
+        return NULL;
+
+    if (!SMSCFlagFromPython(o, &smsc))
+        return NULL;
+
+    if (strcmp(errors_s, "raise") == 0) {
+        mode = PDU_ERRORS_RAISE;
+    } else if (strcmp(errors_s, "skip") == 0) {
+        mode = PDU_ERRORS_SKIP;
+    } else if (strcmp(errors_s, "collect") == 0) {
+        mode = PDU_ERRORS_COLLECT;
+    } else {
+        PyErr_Format(PyExc_ValueError, "Wrong value for errors handling: %s", errors_s);
+        return NULL;
+    }
+
+    seq = PySequence_Fast(data, "Data has to be iterable");
+    if (seq == NULL)
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+
+    result = PyList_New(0);
+    if (result == NULL)
+        goto fail;
+    if (mode == PDU_ERRORS_COLLECT) {
+        errors = PyList_New(0);
+        if (errors == NULL)
+            goto fail;
+    }
+
+    buffers = (Py_buffer *)malloc(PDU_BATCH_CHUNK * sizeof(Py_buffer));
+    codes = (GSM_Error *)malloc(PDU_BATCH_CHUNK * sizeof(GSM_Error));
+    sms = (GSM_SMSMessage *)malloc(PDU_BATCH_CHUNK * sizeof(GSM_SMSMessage));
+    if (buffers == NULL || codes == NULL || sms == NULL) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    for (start = 0; start < count; start += PDU_BATCH_CHUNK) {
+        len = count - start;
+        if (len > PDU_BATCH_CHUNK) {
+            len = PDU_BATCH_CHUNK;
+        }
+
+        /* Buffers keep the data alive while GIL is released */
+        for (i = 0; i < len; i++) {
+            item = PySequence_Fast_GET_ITEM(seq, start + i);
+            if (PyObject_GetBuffer(item, &(buffers[i]), PyBUF_SIMPLE) != 0) {
+                while (i > 0) {
+                    PyBuffer_Release(&(buffers[--i]));
+                }
+                goto fail;
+            }
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+        for (i = 0; i < len; i++) {
+            parse_len = 0;
+            GSM_SetDefaultSMSData(&(sms[i]));
+            codes[i] = GSM_DecodePDUFrame(NULL, &(sms[i]),
+                    (const unsigned char *)buffers[i].buf,
+                    (size_t)buffers[i].len, &parse_len, smsc);
+        }
+        Py_END_ALLOW_THREADS
+
+        for (i = 0; i < len; i++) {
+            PyBuffer_Release(&(buffers[i]));
+        }
+
+        for (i = 0; i < len; i++) {
+            if (codes[i] == ERR_NONE) {
+                item = SMSToPythonLazy(&(sms[i]), lazy);
+                if (item == NULL)
+                    goto fail;
+            } else if (mode == PDU_ERRORS_RAISE) {
+                checkError(codes[i], "DecodePDUFrame");
+                goto fail;
+            } else if (mode == PDU_ERRORS_SKIP) {
+                continue;
+            } else {
+                name = GSM_ErrorName(codes[i]);
+                item = Py_BuildValue("(ns)", start + i,
+                        name == NULL ? "ERR_UNKNOWN" : name);
+                if (item == NULL)
+                    goto fail;
+                if (PyList_Append(errors, item) != 0) {
+                    Py_DECREF(item);
+                    goto fail;
+                }
+                Py_DECREF(item);
+                Py_INCREF(Py_None);
+                item = Py_None;
+            }
+            if (PyList_Append(result, item) != 0) {
+                Py_DECREF(item);
+                goto fail;
+            }
+            Py_DECREF(item);
+        }
+    }
+
+    free(buffers);
+    free(codes);
+    free(sms);
+    Py_DECREF(seq);
+
+    if (mode == PDU_ERRORS_COLLECT) {
+        return Py_BuildValue("(NN)", result, errors);
+    }
+    return result;
+
+fail:
+    free(buffers);
+    free(codes);
+    free(sms);
+    Py_DECREF(seq);
+    Py_XDECREF(result);
+    Py_XDECREF(errors);
+    return NULL;
+}
+
+/* Size of buffers used for PDU encoding */
+#define PDU_BUFFER_SIZE 1000
+
+/**
+ * Converts layout name to layout structure.
+ */
+static GSM_SMSMessageLayout *
+SMSLayoutFromString(const char *layout)
+{
+    if (layout == NULL || strcmp(layout, "Submit") == 0) {
+        return &PHONE_SMSSubmit;
+    } else if(strcmp(layout, "Deliver") == 0) {
+        return &PHONE_SMSDeliver;
+    } else if(strcmp(layout, "StatusReport") == 0) {
+        return &PHONE_SMSStatusReport;
+    }
+    PyErr_Format(PyExc_ValueError, "Wrong value for SMS layout: %s", layout);
+    return NULL;
+}
+
+/**
+ * Copies PDU out of encoded SMS frame, returns length of PDU.
+ */
+static int
+PDUFromSMSFrame(const unsigned char *buffer, int length, GSM_SMSMessageLayout *msg_layout, unsigned char *req)
+{
+    int current = 0, i;
+
+    if (msg_layout == &PHONE_SMSDeliver) {
+        length = length - PHONE_SMSDeliver.Text;
+
+        for (i = 0;i < buffer[PHONE_SMSDeliver.SMSCNumber]+1;i++) {
+            req[current++]=buffer[PHONE_SMSDeliver.SMSCNumber+i];
+        }
+        req[current++]=buffer[PHONE_SMSDeliver.firstbyte];
+
+        for (i = 0;i<((buffer[PHONE_SMSDeliver.Number]+1)/2+1)+1;i++) {
+            req[current++]=buffer[PHONE_SMSDeliver.Number+i];
+        }
+        req[current++]=buffer[PHONE_SMSDeliver.TPPID];
+        req[current++]=buffer[PHONE_SMSDeliver.TPDCS];
+
+        for(i = 0;i < 7;i++) {
+            req[current++]=buffer[PHONE_SMSDeliver.DateTime+i];
+        }
+        req[current++]=buffer[PHONE_SMSDeliver.TPUDL];
+
+        for(i = 0;i < length;i++) {
+            req[current++]=buffer[PHONE_SMSDeliver.Text+i];
+        }
+    } else if (msg_layout == &PHONE_SMSSubmit) {
+        length = length - PHONE_SMSSubmit.Text;
+
+        for (i = 0;i < buffer[PHONE_SMSSubmit.SMSCNumber]+1;i++) {
+            req[current++]=buffer[PHONE_SMSSubmit.SMSCNumber+i];
+        }
+        req[current++]=buffer[PHONE_SMSSubmit.firstbyte];
+        req[current++]=buffer[PHONE_SMSSubmit.TPMR];
+
+        for (i = 0;i<((buffer[PHONE_SMSSubmit.Number]+1)/2+1)+1;i++) {
+            req[current++]=buffer[PHONE_SMSSubmit.Number+i];
+        }
+        req[current++]=buffer[PHONE_SMSSubmit.TPPID];
+        req[current++]=buffer[PHONE_SMSSubmit.TPDCS];
+        req[current++]=buffer[PHONE_SMSSubmit.TPVP];
+        req[current++]=buffer[PHONE_SMSSubmit.TPUDL];
+
+        for(i = 0;i < length;i++) {
+            req[current++]=buffer[PHONE_SMSSubmit.Text+i];
+        }
+        req[current+1]='\0';
+    }
+
+    return current;
+}
+
+static char gammu_EncodePDU__doc__[] =
+"EncodePDU(SMS, Layout = Submit)\n\n"
+"Creates PDU packet.\n\n"
+"@param SMS: SMS dictionary\n"
+"@type SMS: dict\n"
+"@param Layout: Layout (one of Submit, Deliver, StatusReport), Submit is default\n"
+"@type Layout: string\n"
+"@return: Message data\n"
+"@rtype: string\n"
+;
+
+static PyObject *
+gammu_EncodePDU(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"SMS", "Layout", NULL};
+    GSM_Error error;
+    PyObject *value;
+    unsigned char buffer[PDU_BUFFER_SIZE];
+    unsigned char req[PDU_BUFFER_SIZE];
+    int length = 0, current;
+    GSM_SMSMessage sms;
+    char *layout = NULL;
+    GSM_SMSMessageLayout *msg_layout;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&|s", kwlist,
+                SMSObjectConverter, &(value), &layout))
+        return NULL;
+
+    if (!SMSFromPython(value, &sms, 0, 1, 0)) return NULL;
+
+    msg_layout = SMSLayoutFromString(layout);
+    if (msg_layout == NULL) return NULL;
+
+    error = GSM_EncodeSMSFrame(NULL, &sms, buffer, *msg_layout, &length, TRUE);
+    if (!checkError(error, "EncodeSMSFrame")) return NULL;
+
+    current = PDUFromSMSFrame(buffer, length, msg_layout, req);
+
+    return PyBytes_FromStringAndSize((char *)req, current);
 }
 
-static char gammu_ReadSMSBackup__doc__[] =
-"ReadSMSBackup(Filename)\n\n"
-"Reads SMS backup into file.\n\n"
-"@param Filename: Name of file where SMS backup is stored\n"
-"@type Filename: string\n"
-"@return: List of messages read from file\n"
+static char gammu_EncodePDUBatch__doc__[] =
+"EncodePDUBatch(SMS, Layout = Submit)\n\n"
+"Creates PDU packets for several messages at once.\n\n"
+"@param SMS: List of SMS dictionaries\n"
+"@type SMS: list\n"
+"@param Layout: Layout (one of Submit, Deliver, StatusReport), Submit is default\n"
+"@type Layout: string\n"
+"@return: List of messages data\n"
 "@rtype: list\n"
 ;
 
 static PyObject *
-gammu_ReadSMSBackup(PyObject *self, PyObject *args, PyObject *kwds)
+gammu_EncodePDUBatch(PyObject *self, PyObject *args, PyObject *kwds)
 {
-    static char                 *kwlist[] = {"Filename", NULL};
-    char                        *filename;
-    GSM_SMS_Backup              backup;
-    GSM_Error                   error;
-    PyObject                    *result;
+    static char *kwlist[] = {"SMS", "Layout", NULL};
+    PyObject *data;
+    PyObject *seq;
+    PyObject *item;
+    PyObject *result = NULL;
+    unsigned char buffer[PDU_BUFFER_SIZE];
+    unsigned char *pdus = NULL;
+    int *lengths = NULL;
+    int length;
+    char *layout = NULL;
+    GSM_SMSMessageLayout *msg_layout;
+    Py_ssize_t count, start, len, i;
+    GSM_Error *codes = NULL;
+    GSM_SMSMessage *sms = NULL;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s", kwlist,
-                &filename))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|s", kwlist,
+                &data, &layout))
         return NULL;
 
-    error = GSM_ReadSMSBackupFile(filename, &backup);
-    if (!checkError(error, "ReadSMSBackup")) return NULL;
+    msg_layout = SMSLayoutFromString(layout);
+    if (msg_layout == NULL) return NULL;
 
-    result = SMSBackupToPython(&backup);
-    GSM_FreeSMSBackup(&backup);
+    seq = PySequence_Fast(data, "SMS has to be iterable");
+    if (seq == NULL)
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+
+    result = PyList_New(count);
+    if (result == NULL)
+        goto fail;
+
+    pdus = (unsigned char *)malloc(PDU_BATCH_CHUNK * PDU_BUFFER_SIZE);
+    lengths = (int *)malloc(PDU_BATCH_CHUNK * sizeof(int));
+    codes = (GSM_Error *)malloc(PDU_BATCH_CHUNK * sizeof(GSM_Error));
+    sms = (GSM_SMSMessage *)malloc(PDU_BATCH_CHUNK * sizeof(GSM_SMSMessage));
+    if (pdus == NULL || lengths == NULL || codes == NULL || sms == NULL) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    for (start = 0; start < count; start += PDU_BATCH_CHUNK) {
+        len = count - start;
+        if (len > PDU_BATCH_CHUNK) {
+            len = PDU_BATCH_CHUNK;
+        }
+
+        for (i = 0; i < len; i++) {
+            item = PySequence_Fast_GET_ITEM(seq, start + i);
+            if (!PyDict_Check(item) && !SMSRecordCheck(item)) {
+                PyErr_Format(PyExc_TypeError, "Element %" PY_FORMAT_SIZE_T "d in SMS is not dictionary", start + i);
+                goto fail;
+            }
+            if (!SMSFromPython(item, &(sms[i]), 0, 1, 0))
+                goto fail;
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+        for (i = 0; i < len; i++) {
+            length = 0;
+            codes[i] = GSM_EncodeSMSFrame(NULL, &(sms[i]), buffer, *msg_layout, &length, TRUE);
+            if (codes[i] == ERR_NONE) {
+                lengths[i] = PDUFromSMSFrame(buffer, length, msg_layout, pdus + i * PDU_BUFFER_SIZE);
+            }
+        }
+        Py_END_ALLOW_THREADS
+
+        for (i = 0; i < len; i++) {
+            if (!checkError(codes[i], "EncodeSMSFrame"))
+                goto fail;
+            item = PyBytes_FromStringAndSize((char *)(pdus + i * PDU_BUFFER_SIZE), lengths[i]);
+            if (item == NULL)
+                goto fail;
+            PyList_SET_ITEM(result, start + i, item);
+        }
+    }
+
+    free(pdus);
+    free(lengths);
+    free(codes);
+    free(sms);
+    Py_DECREF(seq);
     return result;
+
+fail:
+    free(pdus);
+    free(lengths);
+    free(codes);
+    free(sms);
+    Py_DECREF(seq);
+    Py_XDECREF(result);
+    return NULL;
 }
-#endif
 
-static char gammu_SMSCounter__doc__[] =
-"SMSCounter(Text, UDH = \"NoUDH\", Coding = \"Default\")\n\n"
-"Calculates number of SMS and free chars in SMS.\n\n"
-"@return: Number of messages and number of free chars\n"
-"@rtype: tuple\n"
-;
+/*********************/
+/* EncodeSMSTemplate */
+/*********************/
 
-static PyObject *
-gammu_SMSCounter(PyObject *self, PyObject *args, PyObject *kwds)
+typedef struct {
+    PyObject_HEAD
+    /* Encoded message, only number is changed on rendering */
+    GSM_MultiSMSMessage sms;
+} EncodeSMSTemplateObject;
+
+/**
+ * Sets recipient number in all parts of message.
+ */
+static int
+EncodeSMSTemplate_SetNumber(EncodeSMSTemplateObject *self, PyObject *number)
 {
-    static char *kwlist[] = {"Text", "UDH", "Coding", NULL};
-    PyObject *o = Py_None;
-    const char *udh_s = "\0", *coding_s = "\0";
     unsigned char *str;
-    GSM_UDH udh;
-    GSM_Coding_Type coding;
-    int SMSNum;
-    size_t CharsLeft;
-
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U|ss", kwlist,
-                &o, &udh_s, &coding_s))
-        return NULL;
+    int i;
 
-    str = StringPythonToGammu(o);
-    if (str == NULL) return NULL;
+    str = StringPythonToGammu(number);
+    if (str == NULL) return 0;
 
-    if (udh_s[0] == 0) {
-        udh = UDH_NoUDH;
-    } else {
-        udh = StringToUDHType(udh_s);
-        if (udh == 0) return NULL;
+    if (UnicodeLength(str) > GSM_MAX_NUMBER_LENGTH) {
+        free(str);
+        PyErr_Format(PyExc_ValueError, "Number is too long, maximal length is %d", GSM_MAX_NUMBER_LENGTH);
+        return 0;
     }
 
-    if (coding_s[0] == 0) {
-        coding = SMS_Coding_Default_No_Compression;
-    } else {
-        coding = StringToSMSCoding(coding_s) ;
-        if (coding == 0) return NULL;
+    for (i = 0; i < self->sms.Number; i++) {
+        CopyUnicodeString(self->sms.SMS[i].Number, str);
     }
-
-    GSM_SMSCounter(GSM_GetGlobalDebug(), str, udh, coding, &SMSNum, &CharsLeft);
     free(str);
 
-    return Py_BuildValue("(ii)", SMSNum, CharsLeft);
+    return 1;
 }
 
-static char gammu_DecodePDU__doc__[] =
-"DecodePDU(Data, SMSC = False)\n\n"
-"Parses PDU packet.\n\n"
-"@param Data: PDU data, need to be binary not hex encoded\n"
-"@type Data: string\n"
-"@param SMSC: Whether PDU includes SMSC.\n"
-"@type SMSC: boolean\n"
-"@return: Message data\n"
-"@rtype: dict\n"
+static char EncodeSMSTemplate_Render__doc__[] =
+"Render(Number)\n\n"
+"Creates message for given recipient.\n\n"
+"@param Number: Recipient number\n"
+"@type Number: string\n"
+"@return: List of messages, same as L{EncodeSMS} returns\n"
+"@rtype: list\n"
 ;
 
 static PyObject *
-gammu_DecodePDU(PyObject *self, PyObject *args, PyObject *kwds)
+EncodeSMSTemplate_Render(EncodeSMSTemplateObject *self, PyObject *args, PyObject *kwds)
 {
-    static char *kwlist[] = {"Data", "SMSC", NULL};
-    GSM_Error error;
-    PyObject *result;
-    PyObject *o = Py_None;
-    gboolean smsc;
-    const unsigned char *pdu;
-    Py_ssize_t pdulen;
-	size_t parse_len = 0;
-    GSM_SMSMessage sms;
+    static char *kwlist[] = {"Number", NULL};
+    PyObject *number;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s#|O", kwlist,
-                &pdu, &pdulen, &o))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U", kwlist, &number))
         return NULL;
 
-    if (o == Py_None) {
-        smsc = TRUE;
-    } else if (o == Py_False) {
-        smsc = FALSE;
-    } else if (o == Py_True) {
-        smsc = TRUE;
-    } else {
-        PyErr_SetString(PyExc_TypeError, "use None or boolean as SMSC!");
-        return NULL;
-    }
-
-    GSM_SetDefaultSMSData(&sms);
-	error = GSM_DecodePDUFrame(NULL, &sms,  pdu, pdulen, &parse_len, smsc);
-    if (!checkError(error, "DecodePDUFrame")) return NULL;
+    if (!EncodeSMSTemplate_SetNumber(self, number)) return NULL;
 
-    result = SMSToPython(&sms);
-    return result;
+    return MultiSMSToPython(&(self->sms));
 }
 
-static char gammu_EncodePDU__doc__[] =
-"EncodePDU(SMS, Layout = Submit)\n\n"
-"Creates PDU packet.\n\n"
-"@param SMS: SMS dictionary\n"
-"@type SMS: dict\n"
+static char EncodeSMSTemplate_RenderPDU__doc__[] =
+"RenderPDU(Number, Layout = Submit)\n\n"
+"Creates PDU packets for given recipient.\n\n"
+"@param Number: Recipient number\n"
+"@type Number: string\n"
 "@param Layout: Layout (one of Submit, Deliver, StatusReport), Submit is default\n"
 "@type Layout: string\n"
-"@return: Message data\n"
-"@rtype: string\n"
+"@return: List of PDU packets, one for every part of message\n"
+"@rtype: list\n"
 ;
 
 static PyObject *
-gammu_EncodePDU(PyObject *self, PyObject *args, PyObject *kwds)
+EncodeSMSTemplate_RenderPDU(EncodeSMSTemplateObject *self, PyObject *args, PyObject *kwds)
 {
-    static char *kwlist[] = {"SMS", "Layout", NULL};
-    GSM_Error error;
-    PyObject *value;
-    unsigned char buffer[1000];
-    char req[1000];
-    int length = 0, current = 0, i;
-    GSM_SMSMessage sms;
+    static char *kwlist[] = {"Number", "Layout", NULL};
+    PyObject *number;
+    PyObject *result;
+    PyObject *item;
     char *layout = NULL;
     GSM_SMSMessageLayout *msg_layout;
+    GSM_Error error;
+    unsigned char buffer[PDU_BUFFER_SIZE];
+    unsigned char req[PDU_BUFFER_SIZE];
+    int length, current, i;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|s", kwlist,
-                &PyDict_Type, &(value), &layout))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U|s", kwlist, &number, &layout))
         return NULL;
 
-    if (!SMSFromPython(value, &sms, 0, 1, 0)) return NULL;
+    msg_layout = SMSLayoutFromString(layout);
+    if (msg_layout == NULL) return NULL;
 
-    if (layout == NULL || strcmp(layout, "Submit") == 0) {
-        msg_layout = &PHONE_SMSSubmit;
-    } else if(strcmp(layout, "Deliver") == 0) {
-        msg_layout = &PHONE_SMSDeliver;
-    } else if(strcmp(layout, "StatusReport") == 0) {
-        msg_layout = &PHONE_SMSStatusReport;
-    } else {
-        PyErr_Format(PyExc_ValueError, "Wrong value for SMS layout: %s", layout);
-        return NULL;
+    if (!EncodeSMSTemplate_SetNumber(self, number)) return NULL;
+
+    result = PyList_New(self->sms.Number);
+    if (result == NULL) return NULL;
+
+    for (i = 0; i < self->sms.Number; i++) {
+        length = 0;
+        error = GSM_EncodeSMSFrame(NULL, &(self->sms.SMS[i]), buffer, *msg_layout, &length, TRUE);
+        if (!checkError(error, "EncodeSMSFrame")) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        current = PDUFromSMSFrame(buffer, length, msg_layout, req);
+        item = PyBytes_FromStringAndSize((char *)req, current);
+        if (item == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, item);
     }
 
-    error = GSM_EncodeSMSFrame(NULL, &sms, buffer, *msg_layout, &length, TRUE);
-    if (!checkError(error, "EncodeSMSFrame")) return NULL;
+    return result;
+}
 
-    if (msg_layout == &PHONE_SMSDeliver) {
-        length = length - PHONE_SMSDeliver.Text;
+static PyObject *
+EncodeSMSTemplate_GetParts(EncodeSMSTemplateObject *self, void *closure)
+{
+    return PyLong_FromLong(self->sms.Number);
+}
 
-        for (i = 0;i < buffer[PHONE_SMSDeliver.SMSCNumber]+1;i++) {
-            req[current++]=buffer[PHONE_SMSDeliver.SMSCNumber+i];
-        }
-        req[current++]=buffer[PHONE_SMSDeliver.firstbyte];
+static struct PyMethodDef EncodeSMSTemplate_methods[] = {
+    {"Render",	(PyCFunction)EncodeSMSTemplate_Render,	METH_VARARGS|METH_KEYWORDS,	EncodeSMSTemplate_Render__doc__},
+    {"RenderPDU",	(PyCFunction)EncodeSMSTemplate_RenderPDU,	METH_VARARGS|METH_KEYWORDS,	EncodeSMSTemplate_RenderPDU__doc__},
+    {NULL,		NULL, 0, NULL}		/* sentinel */
+};
 
-        for (i = 0;i<((buffer[PHONE_SMSDeliver.Number]+1)/2+1)+1;i++) {
-            req[current++]=buffer[PHONE_SMSDeliver.Number+i];
-        }
-        req[current++]=buffer[PHONE_SMSDeliver.TPPID];
-        req[current++]=buffer[PHONE_SMSDeliver.TPDCS];
+static PyGetSetDef EncodeSMSTemplate_getset[] = {
+    {"Parts", (getter)EncodeSMSTemplate_GetParts, NULL, "Number of messages needed for the text.", NULL},
+    {NULL, NULL, NULL, NULL, NULL}		/* sentinel */
+};
 
-        for(i = 0;i < 7;i++) {
-            req[current++]=buffer[PHONE_SMSDeliver.DateTime+i];
-        }
-        req[current++]=buffer[PHONE_SMSDeliver.TPUDL];
+static int
+EncodeSMSTemplate_init(EncodeSMSTemplateObject *self, PyObject *args, PyObject *kwds)
+{
+    static char                 *kwlist[] = {"MessageInfo", "SMSC", NULL};
+    PyObject                    *value;
+    PyObject                    *smsc = Py_None;
+    GSM_MultiPartSMSInfo        smsinfo;
+    GSM_SMSC                    smsc_data;
+    GSM_Error                   error;
+    int                         i;
 
-        for(i = 0;i < length;i++) {
-            req[current++]=buffer[PHONE_SMSDeliver.Text+i];
-        }
-    } else if (msg_layout == &PHONE_SMSSubmit) {
-        length = length - PHONE_SMSSubmit.Text;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|O", kwlist,
+                &PyDict_Type, &(value), &smsc))
+        return -1;
 
-        for (i = 0;i < buffer[PHONE_SMSSubmit.SMSCNumber]+1;i++) {
-            req[current++]=buffer[PHONE_SMSSubmit.SMSCNumber+i];
-        }
-        req[current++]=buffer[PHONE_SMSSubmit.firstbyte];
-        req[current++]=buffer[PHONE_SMSSubmit.TPMR];
+    if (smsc != Py_None && !SMSCFromPython(smsc, &smsc_data, FALSE)) return -1;
 
-        for (i = 0;i<((buffer[PHONE_SMSSubmit.Number]+1)/2+1)+1;i++) {
-            req[current++]=buffer[PHONE_SMSSubmit.Number+i];
-        }
-        req[current++]=buffer[PHONE_SMSSubmit.TPPID];
-        req[current++]=buffer[PHONE_SMSSubmit.TPDCS];
-        req[current++]=buffer[PHONE_SMSSubmit.TPVP];
-        req[current++]=buffer[PHONE_SMSSubmit.TPUDL];
+    if (!SMSInfoFromPython(value, &smsinfo)) return -1;
 
-        for(i = 0;i < length;i++) {
-            req[current++]=buffer[PHONE_SMSSubmit.Text+i];
+    memset(&(self->sms), 0, sizeof(GSM_MultiSMSMessage));
+    error = GSM_EncodeMultiPartSMS(GSM_GetGlobalDebug(), &smsinfo, &(self->sms));
+    GSM_FreeMultiPartSMSInfo(&smsinfo);
+    if (!checkError(error, "EncodeMultiPartSMS")) return -1;
+
+    if (smsc != Py_None) {
+        for (i = 0; i < self->sms.Number; i++) {
+            self->sms.SMS[i].SMSC = smsc_data;
         }
-        req[current+1]='\0';
     }
 
-    return PyBytes_FromStringAndSize(req, current);
+    return 0;
 }
 
+static char EncodeSMSTemplateType__doc__[] =
+"EncodeSMSTemplate(MessageInfo, SMSC = None)\n\n"
+"Message encoded once and rendered for any number of recipients, "
+"see L{EncodeSMS} for description of MessageInfo.\n\n"
+"@param MessageInfo: Description of message\n"
+"@type MessageInfo: dict\n"
+"@param SMSC: SMSC to use in messages\n"
+"@type SMSC: dict\n"
+;
+
+static PyTypeObject EncodeSMSTemplateType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_gammu.EncodeSMSTemplate",		/*tp_name*/
+    sizeof(EncodeSMSTemplateObject),	/*tp_basicsize*/
+    0,				/*tp_itemsize*/
+    /* methods */
+    0,				/*tp_dealloc*/
+    (printfunc)0,		/*tp_print*/
+    0,	/*tp_getattr*/
+    0,	/*tp_setattr*/
+    0,
+    0,
+    0,			/*tp_as_number*/
+    0,		/*tp_as_sequence*/
+    0,		/*tp_as_mapping*/
+    (hashfunc)0,		/*tp_hash*/
+    (ternaryfunc)0,		/*tp_call*/
+    0,
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+    EncodeSMSTemplateType__doc__, /* Documentation string */
+    0,		               /* tp_traverse */
+    0,		               /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    0,		               /* tp_iter */
+    0,		               /* tp_iternext */
+    EncodeSMSTemplate_methods,   /* tp_methods */
+    0,                         /* tp_members */
+    EncodeSMSTemplate_getset,  /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)EncodeSMSTemplate_init, /* tp_init */
+    0,                         /* tp_alloc */
+    PyType_GenericNew,         /* tp_new */
+};
+
 /* List of methods defined in the module */
 
 static struct PyMethodDef gammu_methods[] = {
@@ -6568,6 +8731,7 @@ static struct PyMethodDef gammu_methods[] = {
 
     {"LinkSMS",         (PyCFunction)gammu_LinkSMS,         METH_VARARGS|METH_KEYWORDS,   gammu_LinkSMS__doc__},
     {"DecodeSMS",       (PyCFunction)gammu_DecodeSMS,       METH_VARARGS|METH_KEYWORDS,   gammu_DecodeSMS__doc__},
+    {"LinkAndDecodeSMS", (PyCFunction)gammu_LinkAndDecodeSMS, METH_VARARGS|METH_KEYWORDS,   gammu_LinkAndDecodeSMS__doc__},
     {"EncodeSMS",       (PyCFunction)gammu_EncodeSMS,       METH_VARARGS|METH_KEYWORDS,   gammu_EncodeSMS__doc__},
 
     {"DecodeVCARD",     (PyCFunction)gammu_DecodeVCARD,     METH_VARARGS|METH_KEYWORDS,   gammu_DecodeVCARD__doc__},
@@ -6590,12 +8754,18 @@ static struct PyMethodDef gammu_methods[] = {
 
     {"SaveSMSBackup",   (PyCFunction)gammu_SaveSMSBackup,   METH_VARARGS|METH_KEYWORDS,   gammu_SaveSMSBackup__doc__},
     {"ReadSMSBackup",   (PyCFunction)gammu_ReadSMSBackup,   METH_VARARGS|METH_KEYWORDS,   gammu_ReadSMSBackup__doc__},
+    {"IterSMSBackup",   (PyCFunction)gammu_IterSMSBackup,   METH_VARARGS|METH_KEYWORDS,   gammu_IterSMSBackup__doc__},
+    {"CountSMSBackup",  (PyCFunction)gammu_CountSMSBackup,  METH_VARARGS|METH_KEYWORDS,   gammu_CountSMSBackup__doc__},
 #endif
 
+    {"SetLazySMS",       (PyCFunction)gammu_SetLazySMS,       METH_VARARGS|METH_KEYWORDS,   gammu_SetLazySMS__doc__},
     {"SMSCounter",       (PyCFunction)gammu_SMSCounter,       METH_VARARGS|METH_KEYWORDS,   gammu_SMSCounter__doc__},
+    {"SMSCounterMany",   (PyCFunction)gammu_SMSCounterMany,   METH_VARARGS|METH_KEYWORDS,   gammu_SMSCounterMany__doc__},
 
     {"DecodePDU",       (PyCFunction)gammu_DecodePDU,       METH_VARARGS|METH_KEYWORDS,   gammu_DecodePDU__doc__},
+    {"DecodePDUBatch",  (PyCFunction)gammu_DecodePDUBatch,  METH_VARARGS|METH_KEYWORDS,   gammu_DecodePDUBatch__doc__},
     {"EncodePDU",       (PyCFunction)gammu_EncodePDU,       METH_VARARGS|METH_KEYWORDS,   gammu_EncodePDU__doc__},
+    {"EncodePDUBatch",  (PyCFunction)gammu_EncodePDUBatch,  METH_VARARGS|METH_KEYWORDS,   gammu_EncodePDUBatch__doc__},
 
     {NULL,	 (PyCFunction)NULL, 0, NULL}		/* sentinel */
 };
@@ -6649,6 +8819,43 @@ PyInit__gammu(void)
     if (PyModule_AddObject(module, "StateMachine", (PyObject *)&StateMachineType) < 0)
         return NULL;
 
+    if (PyType_Ready(&StateMachineIteratorType) < 0)
+        return NULL;
+
+#ifdef GSM_ENABLE_BACKUP
+    if (PyType_Ready(&SMSBackupIteratorType) < 0)
+        return NULL;
+
+    /* Limit of messages saved at once by SaveSMSBackup */
+    if (PyModule_AddIntConstant(module, "GSM_BACKUP_MAX_SMS", GSM_BACKUP_MAX_SMS) < 0)
+        return NULL;
+#endif
+
+    if (PyType_Ready(&EncodeSMSTemplateType) < 0)
+        return NULL;
+    Py_INCREF(&EncodeSMSTemplateType);
+
+    if (PyModule_AddObject(module, "EncodeSMSTemplate", (PyObject *)&EncodeSMSTemplateType) < 0)
+        return NULL;
+
+    /* Enum lookup tables */
+    if (!gammu_enums_init())
+        return NULL;
+
+    /* Datetime conversions */
+    if (!gammu_datetime_init())
+        return NULL;
+
+    /* Lazy SMS records */
+    if (!gammu_smsrecord_init(module))
+        return NULL;
+
+#ifdef GSM_ENABLE_BACKUP
+    /* Lazy backup records */
+    if (!gammu_backuprecord_init(module))
+        return NULL;
+#endif
+
     /* SMSD object */
     if (!gammu_smsd_init(module))
         return NULL;
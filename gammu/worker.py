@@ -25,11 +25,29 @@ Mostly you should use only L{GammuWorker} class, others are only helpers
 which are used by this class.
 """
 
+from __future__ import annotations
+
+import functools
+import itertools
 import queue
 import threading
+import time
 
 import gammu
 
+# Default interval in seconds for reading incoming events from the device
+POLL_INTERVAL = 10
+
+# Task priorities, tasks with higher priority are executed first
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+# Termination is done after all other tasks
+PRIORITY_TERMINATE = float("-inf")
+
+# Sequence numbers keeping order of tasks with same priority
+_task_counter = itertools.count()
+
 
 class InvalidCommand(Exception):
     """Exception indicating invalid command."""
@@ -94,7 +112,7 @@ class GammuCommand:
 class GammuTask:
     """Storage of tasks for gammu."""
 
-    def __init__(self, name, commands) -> None:
+    def __init__(self, name, commands, priority=PRIORITY_NORMAL, deadline=None) -> None:
         """
         Creates single command instance.
 
@@ -102,10 +120,20 @@ class GammuTask:
         @type name: string
         @param commands: List of commands to execute.
         @type commands: list of tuples or strings
+        @param priority: Priority of task, tasks with higher priority are
+        executed first.
+        @type priority: int
+        @param deadline: Time (as returned by L{time.monotonic}) after
+        which the task is not executed anymore.
+        @type deadline: float
         """
         self._name = name
         self._list = []
         self._pointer = 0
+        self._priority = priority
+        self._deadline = deadline
+        self._cancelled = False
+        self._sequence = next(_task_counter)
         for i in range(len(commands)):
             if isinstance(commands[i], tuple):
                 cmd = commands[i][0]
@@ -129,23 +157,71 @@ class GammuTask:
         """Returns task name."""
         return self._name
 
+    def get_priority(self):
+        """Returns task priority."""
+        return self._priority
+
+    def is_finished(self):
+        """Returns whether all commands were executed."""
+        return self._pointer >= len(self._list)
+
+    def cancel(self) -> None:
+        """Cancels task, remaining commands will not be executed."""
+        self._cancelled = True
+
+    def get_error(self):
+        """Returns error code if the task should not continue."""
+        if self._cancelled:
+            return "ERR_CANCELED"
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            return "ERR_TIMEOUT"
+        return None
+
+    def __lt__(self, other) -> bool:
+        """Orders tasks in the queue by priority."""
+        return (-self._priority, self._sequence) < (
+            -other._priority,
+            other._sequence,
+        )
+
 
 def gammu_pull_device(state_machine) -> None:
     state_machine.ReadDevice()
 
 
+class _Arguments:
+    """Storage of both positional and keyword arguments of command."""
+
+    def __init__(self, args, kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        """Returns textual representation."""
+        return f"{self.args!r} {self.kwargs!r}"
+
+
 def _execute_command(func, params):
     if params is None:
         return func()
     if isinstance(params, dict):
         return func(**params)
+    if isinstance(params, _Arguments):
+        return func(*params.args, **params.kwargs)
     return func(*params)
 
 
 class GammuThread(threading.Thread):
     """Thread for phone communication."""
 
-    def __init__(self, queue, config, callback, pull_func=gammu_pull_device) -> None:
+    def __init__(
+        self,
+        queue,
+        config,
+        callback,
+        pull_func=gammu_pull_device,
+        poll_interval=POLL_INTERVAL,
+    ) -> None:
         """
         Initialises thread data.
 
@@ -163,6 +239,15 @@ class GammuThread(threading.Thread):
         overall operation. This callback is called from different
         thread, so please take care of various threading issues in other
         modules you use.
+
+        @param pull_func: Function which reads incoming events from the
+        device.
+        @type pull_func: Function, needs to accept StateMachine object.
+
+        @param poll_interval: Maximal interval in seconds between two
+        device reads. The device is read even when commands keep coming,
+        so the latency of incoming events is bounded by this value.
+        @type poll_interval: float
         """
         super().__init__()
         self._kill = False
@@ -172,14 +257,30 @@ class GammuThread(threading.Thread):
         self._queue = queue
         self._sm.SetConfig(0, config)
         self._pull_func = pull_func
+        self._poll_interval = poll_interval
+        self._next_pull = time.monotonic() + poll_interval
+        # Task and command being executed, guarded by the lock for abort
+        self._abort_lock = threading.Lock()
+        self._task = None
+        self._executing = False
+
+    def _execute(self, cmd, params):
+        """Executes command on phone, it can be interrupted by L{abort}."""
+        func = getattr(self._sm, cmd)
+        with self._abort_lock:
+            self._executing = True
+        try:
+            return _execute_command(func, params)
+        finally:
+            with self._abort_lock:
+                self._executing = False
 
     def _do_command(self, name, cmd, params, percentage=100) -> None:
         """Executes single command on phone."""
-        func = getattr(self._sm, cmd)
         error = "ERR_NONE"
         result = None
         try:
-            result = _execute_command(func, params)
+            result = self._execute(cmd, params)
         except gammu.GSMError as info:
             errcode = info.args[0]["Code"]
             error = gammu.ErrorNumbers[errcode]
@@ -203,18 +304,48 @@ class GammuThread(threading.Thread):
             # Ignore malformed tasks and duplicate queue acknowledgements.
             pass
 
+    def _is_preempted(self, task):
+        """Checks whether more urgent task is waiting in the queue."""
+        with self._queue.mutex:
+            pending = self._queue.queue
+            return bool(pending) and pending[0].get_priority() > task.get_priority()
+
     def _do_task(self, task) -> None:
+        with self._abort_lock:
+            self._task = task
         try:
-            while True:
-                self._do_next_command(task)
-        except IndexError:
-            self._finish_task(task)
+            self._do_task_commands(task)
+        finally:
+            with self._abort_lock:
+                self._task = None
+        self._finish_task(task)
+
+    def _do_task_commands(self, task) -> None:
+        while not task.is_finished():
+            error = task.get_error()
+            if error is not None:
+                # Task was cancelled or has expired
+                self._callback(task.get_name(), None, error, 100)
+                break
+            self._do_next_command(task)
+            if not task.is_finished() and self._is_preempted(task):
+                # Continue with remaining commands after more urgent task
+                self._queue.put(task)
+                break
 
     def _get_task(self, start):
         if start:
             return GammuTask("Init", ["Init"])
-        # Wait at most ten seconds for next command
-        return self._queue.get(True, 10)
+        # Wait for next command at most until the device should be read
+        return self._queue.get(True, max(0, self._next_pull - time.monotonic()))
+
+    def _pull_device(self) -> None:
+        self._next_pull = time.monotonic() + self._poll_interval
+        # Read the device to catch possible incoming events
+        try:
+            self._pull_func(self._sm)
+        except Exception as ex:  # ruff: ignore[blind-except]
+            self._callback("ReadDevice", None, ex, 0)
 
     def run(self) -> None:
         """
@@ -223,6 +354,7 @@ class GammuThread(threading.Thread):
         This should not be used from outside.
         """
         start = True
+        self._next_pull = time.monotonic() + self._poll_interval
         while not self._kill:
             try:
                 task = self._get_task(start)
@@ -231,16 +363,34 @@ class GammuThread(threading.Thread):
             except queue.Empty:
                 if self._terminate:
                     break
-                # Read the device to catch possible incoming events
-                try:
-                    self._pull_func(self._sm)
-                except Exception as ex:  # ruff: ignore[blind-except]
-                    self._callback("ReadDevice", None, ex, 0)
+                self._pull_device()
+            else:
+                if task.get_name() == "Terminate":
+                    # Phone is disconnected, there is nothing to read anymore
+                    self._terminate = True
+                elif time.monotonic() >= self._next_pull:
+                    # Do not starve incoming events under steady load
+                    self._pull_device()
 
     def kill(self) -> None:
         """Forces thread end without emptying queue."""
         self._kill = True
 
+    def abort(self) -> None:
+        """
+        Aborts task which is currently being executed.
+
+        Remaining commands of the task are not executed and the command
+        which is currently running is interrupted. The phone is not
+        touched when there is no command running, as libgammu would
+        otherwise abort the next command.
+        """
+        with self._abort_lock:
+            if self._task is not None:
+                self._task.cancel()
+            if self._executing:
+                self._sm.Abort()
+
     def join(self, timeout=None) -> None:
         """Terminates thread and waits for it."""
         self._terminate = True
@@ -255,20 +405,33 @@ class GammuWorker:
     is done, caller is notified via callback.
     """
 
-    def __init__(self, callback, pull_func=gammu_pull_device) -> None:
+    def __init__(
+        self, callback, pull_func=gammu_pull_device, poll_interval=POLL_INTERVAL
+    ) -> None:
         """
         Initializes worker class.
 
         @param callback: See L{GammuThread.__init__} for description.
+        @param pull_func: See L{GammuThread.__init__} for description.
+        @param poll_interval: See L{GammuThread.__init__} for description.
         """
         self._thread = None
         self._callback = callback
         self._config = {}
         self._lock = threading.Lock()
-        self._queue = queue.Queue()
+        self._queue = queue.PriorityQueue()
         self._pull_func = pull_func
+        self._poll_interval = poll_interval
+
+    def _put(self, name, commands, priority, timeout):
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        task = GammuTask(name, commands, priority, deadline)
+        self._queue.put(task)
+        return task
 
-    def enqueue_command(self, command, params) -> None:
+    def enqueue_command(self, command, params, priority=PRIORITY_NORMAL, timeout=None):
         """
         Enqueues command.
 
@@ -277,10 +440,17 @@ class GammuWorker:
         @type command: tuple of list of tuples
         @param params: Parameters to command.
         @type params: tuple or string
+        @param priority: Priority of the task, see L{GammuTask.__init__}.
+        @type priority: int
+        @param timeout: Number of seconds after which the task expires
+        when it was not executed.
+        @type timeout: float
+        @return: Enqueued task, it can be used for cancelling.
+        @rtype: L{GammuTask}
         """
-        self._queue.put(GammuTask(command, [(command, params)]))
+        return self._put(command, [(command, params)], priority, timeout)
 
-    def enqueue_task(self, command, commands) -> None:
+    def enqueue_task(self, command, commands, priority=PRIORITY_NORMAL, timeout=None):
         """
         Enqueues task.
 
@@ -289,10 +459,24 @@ class GammuWorker:
         @type command: tuple of list of tuples
         @param commands: List of commands to execute.
         @type commands: list of tuples or strings
+        @param priority: Priority of the task, see L{GammuTask.__init__}.
+        @type priority: int
+        @param timeout: Number of seconds after which the task expires
+        when it was not executed.
+        @type timeout: float
+        @return: Enqueued task, it can be used for cancelling.
+        @rtype: L{GammuTask}
         """
-        self._queue.put(GammuTask(command, commands))
-
-    def enqueue(self, command, params=None, commands=None) -> None:
+        return self._put(command, commands, priority, timeout)
+
+    def enqueue(
+        self,
+        command,
+        params=None,
+        commands=None,
+        priority=PRIORITY_NORMAL,
+        timeout=None,
+    ):
         """
         Enqueues command or task.
 
@@ -304,11 +488,30 @@ class GammuWorker:
         @param commands: List of commands to execute. When this is not
         none, params are ignored and command is taken as task name.
         @type commands: list of tuples or strings
+        @param priority: Priority of the task, see L{GammuTask.__init__}.
+        @type priority: int
+        @param timeout: Number of seconds after which the task expires
+        when it was not executed. Expired task is reported to the
+        callback with ERR_TIMEOUT error.
+        @type timeout: float
+        @return: Enqueued task, it can be used for cancelling.
+        @rtype: L{GammuTask}
         """
         if commands is not None:
-            self.enqueue_task(command, commands)
-        else:
-            self.enqueue_command(command, params)
+            return self.enqueue_task(command, commands, priority, timeout)
+        return self.enqueue_command(command, params, priority, timeout)
+
+    def cancel(self, task) -> None:
+        """
+        Cancels enqueued task.
+
+        Commands of the task which were not yet executed are skipped and
+        the task is reported to the callback with ERR_CANCELED error.
+
+        @param task: Task returned by L{enqueue}.
+        @type task: L{GammuTask}
+        """
+        task.cancel()
 
     def configure(self, config) -> None:
         """
@@ -320,19 +523,276 @@ class GammuWorker:
         """
         self._config = config
 
-    def abort(self):
-        """Aborts any remaining operations."""
-        raise NotImplementedError
+    def abort(self) -> None:
+        """
+        Aborts any remaining operations.
+
+        Tasks waiting in the queue are reported to the callback with
+        ERR_CANCELED error and task which is currently being executed is
+        interrupted, see L{GammuThread.abort}. Pending termination of the
+        worker is kept.
+        """
+        pending = []
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task.get_name() == "Terminate":
+                pending.append(task)
+            else:
+                task.cancel()
+                self._callback(task.get_name(), None, "ERR_CANCELED", 100)
+            self._queue.task_done()
+
+        for task in pending:
+            self._queue.put(task)
+
+        if self._thread is not None:
+            self._thread.abort()
+
+    def qsize(self):
+        """Returns approximate number of tasks waiting in the queue."""
+        return self._queue.qsize()
 
     def initiate(self) -> None:
         """Connects to phone."""
         self._thread = GammuThread(
-            self._queue, self._config, self._callback, self._pull_func
+            self._queue,
+            self._config,
+            self._callback,
+            self._pull_func,
+            self._poll_interval,
         )
         self._thread.start()
 
-    def terminate(self, timeout=None) -> None:
-        """Terminates phone connection."""
-        self.enqueue("Terminate")
+    def join(self, timeout=None) -> None:
+        """
+        Waits for the worker thread to finish.
+
+        @param timeout: Maximal time to wait in seconds.
+        @type timeout: float
+        """
+        if self._thread is None:
+            return
         self._thread.join(timeout)
         self._thread = None
+
+    def terminate(self, timeout=None, *, wait=True) -> None:
+        """
+        Terminates phone connection.
+
+        @param timeout: Maximal time to wait in seconds.
+        @type timeout: float
+        @param wait: Whether to wait for the worker thread, otherwise
+        L{join} has to be called later.
+        @type wait: bool
+        """
+        if self._thread is None:
+            return
+        self.enqueue("Terminate", priority=PRIORITY_TERMINATE)
+        if wait:
+            self.join(timeout)
+
+
+# Routing strategies for GammuWorkerPool
+ROUTING_ROUND_ROBIN = "round-robin"
+ROUTING_LEAST_QUEUE = "least-queue"
+ROUTING_AFFINITY = "affinity"
+ROUTINGS = (ROUTING_ROUND_ROBIN, ROUTING_LEAST_QUEUE, ROUTING_AFFINITY)
+
+
+class GammuWorkerPool:
+    """
+    Pool of workers communicating with several phones.
+
+    Each phone is handled by own L{GammuWorker} and thread. Commands are
+    routed to the workers according to chosen strategy and results from
+    all workers are passed to single callback.
+    """
+
+    def __init__(
+        self,
+        callback,
+        configs,
+        routing=ROUTING_ROUND_ROBIN,
+        pull_func=gammu_pull_device,
+        poll_interval=POLL_INTERVAL,
+    ) -> None:
+        """
+        Initializes worker pool.
+
+        @param callback: Function which will be called upon operation
+        completing.
+        @type callback: Function, needs to accept five params: index of
+        worker which has executed the operation followed by params
+        described in L{GammuThread.__init__}.
+        @param configs: Gammu configurations, one for each phone, same as
+        L{StateMachine.SetConfig} accepts.
+        @type configs: list of hashes
+        @param routing: Routing strategy, one of "round-robin" (commands
+        are distributed evenly), "least-queue" (command goes to worker
+        with least queued tasks) or "affinity" (commands with same key
+        are always handled by same worker).
+        @type routing: string
+        @param pull_func: See L{GammuThread.__init__} for description.
+        @param poll_interval: See L{GammuThread.__init__} for description.
+        """
+        if routing not in ROUTINGS:
+            msg = f"Invalid routing: {routing}"
+            raise ValueError(msg)
+        if not configs:
+            msg = "At least one configuration is needed"
+            raise ValueError(msg)
+        self._callback = callback
+        self._routing = routing
+        self._lock = threading.Lock()
+        self._next = 0
+        self._affinity = {}
+        self._workers = []
+        for index, config in enumerate(configs):
+            worker = GammuWorker(
+                functools.partial(self._worker_callback, index),
+                pull_func,
+                poll_interval,
+            )
+            worker.configure(config)
+            self._workers.append(worker)
+
+    @classmethod
+    def from_config(
+        cls, callback, sections, filename=None, **kwargs
+    ) -> GammuWorkerPool:
+        """
+        Creates pool from sections of gammurc.
+
+        @param callback: See L{__init__} for description.
+        @param sections: Indexes of configuration sections to use, one for
+        each phone.
+        @type sections: list of int
+        @param filename: Path to configuration file (otherwise it is
+        autodetected).
+        @type filename: string
+        """
+        state_machine = gammu.StateMachine()
+        configs = []
+        for section in sections:
+            if filename is None:
+                state_machine.ReadConfig(Section=section, Configuration=0)
+            else:
+                state_machine.ReadConfig(
+                    Section=section, Configuration=0, Filename=filename
+                )
+            configs.append(state_machine.GetConfig(0))
+        return cls(callback, configs, **kwargs)
+
+    def __len__(self) -> int:
+        """Returns number of workers in the pool."""
+        return len(self._workers)
+
+    def _worker_callback(self, index, name, result, error, percents) -> None:
+        self._callback(index, name, result, error, percents)
+
+    def _least_queue(self):
+        return min(
+            range(len(self._workers)),
+            key=lambda index: self._workers[index].qsize(),
+        )
+
+    def _route(self, key):
+        with self._lock:
+            if self._routing == ROUTING_AFFINITY and key is not None:
+                if key not in self._affinity:
+                    self._affinity[key] = self._least_queue()
+                return self._affinity[key]
+            if self._routing == ROUTING_ROUND_ROBIN:
+                index = self._next
+                self._next = (self._next + 1) % len(self._workers)
+                return index
+            return self._least_queue()
+
+    def set_affinity(self, key, index) -> None:
+        """
+        Binds affinity key to worker.
+
+        @param key: Affinity key, for example IMSI of SIM card.
+        @type key: hashable
+        @param index: Index of worker.
+        @type index: int
+        """
+        if not 0 <= index < len(self._workers):
+            msg = f"Invalid worker index: {index}"
+            raise IndexError(msg)
+        with self._lock:
+            self._affinity[key] = index
+
+    def enqueue(
+        self, command, params=None, commands=None, key=None, worker=None, **kwargs
+    ):
+        """
+        Enqueues command or task to one of the workers.
+
+        @param command: See L{GammuWorker.enqueue} for description.
+        @param params: See L{GammuWorker.enqueue} for description.
+        @param commands: See L{GammuWorker.enqueue} for description.
+        @param key: Affinity key used with affinity routing.
+        @type key: hashable
+        @param worker: Index of worker to use, overrides routing.
+        @type worker: int
+        @param kwargs: Priority and timeout, see L{GammuWorker.enqueue}.
+        @return: Index of worker which will execute the command and
+        enqueued task, which can be used for cancelling.
+        @rtype: tuple of int and L{GammuTask}
+        """
+        index = self._route(key) if worker is None else worker
+        task = self._workers[index].enqueue(command, params, commands, **kwargs)
+        return index, task
+
+    def cancel(self, task) -> None:
+        """
+        Cancels enqueued task.
+
+        @param task: Task returned by L{enqueue}.
+        @type task: L{GammuTask}
+        """
+        task.cancel()
+
+    def broadcast(self, command, params=None, commands=None) -> None:
+        """
+        Enqueues command or task to all workers.
+
+        @param command: See L{GammuWorker.enqueue} for description.
+        @param params: See L{GammuWorker.enqueue} for description.
+        @param commands: See L{GammuWorker.enqueue} for description.
+        """
+        for worker in self._workers:
+            worker.enqueue(command, params, commands)
+
+    def set_incoming_callback(self, callback) -> None:
+        """
+        Sets callback for incoming events on all phones.
+
+        @param callback: Function which will be called on incoming event.
+        @type callback: Function, needs to accept four params: index of
+        worker followed by params described in
+        L{StateMachine.SetIncomingCallback}.
+        """
+        for index, worker in enumerate(self._workers):
+            worker.enqueue("SetIncomingCallback", (functools.partial(callback, index),))
+
+    def abort(self) -> None:
+        """Aborts any remaining operations on all phones."""
+        for worker in self._workers:
+            worker.abort()
+
+    def initiate(self) -> None:
+        """Connects to all phones."""
+        for worker in self._workers:
+            worker.initiate()
+
+    def terminate(self, timeout=None) -> None:
+        """Terminates all phone connections."""
+        for worker in self._workers:
+            worker.terminate(wait=False)
+        for worker in self._workers:
+            worker.join(timeout)
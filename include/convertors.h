@@ -52,6 +52,56 @@
  */
 #define ENUM_INVALID (99999)
 
+/**
+ * Enums which have precomputed lookup tables.
+ */
+typedef enum {
+    GAMMU_ENUM_UDH_TYPE = 0,
+    GAMMU_ENUM_SMS_TYPE,
+    GAMMU_ENUM_SMS_CODING,
+    GAMMU_ENUM_SMS_STATE,
+    GAMMU_ENUM_SMS_VALIDITY,
+    GAMMU_ENUM_MEMORY_TYPE,
+    GAMMU_ENUM_CALENDAR_TYPE,
+    GAMMU_ENUM_LAST
+} GammuEnum;
+
+/**
+ * Size of lookup tables, relative SMS validity is stored as is.
+ */
+#define GAMMU_ENUM_MAX_VALUE (257)
+
+/**
+ * Lookup table value for not available SMS validity.
+ */
+#define GAMMU_ENUM_VALIDITY_NA (256)
+
+/**
+ * Builds lookup tables, needs to be called before any enum conversion.
+ */
+int gammu_enums_init(void);
+
+/**
+ * Converts enum value to interned Python string.
+ */
+PyObject *EnumToPython(GammuEnum kind, int value);
+
+/**
+ * Looks up enum value for Python string, returns -1 if it is not known.
+ */
+int EnumFromPython(GammuEnum kind, PyObject * o);
+
+/**
+ * Looks up enum value for dictionary item, returns -1 if it is missing
+ * or not known, so that caller can fall back to string parsing.
+ */
+int GetEnumFromDict(PyObject * dict, const char *key, GammuEnum kind);
+
+/**
+ * Loads datetime C API, needs to be called before any time conversion.
+ */
+int gammu_datetime_init(void);
+
 /**
  * Creates Python datetime.datetime from GSM_DateTime.
  */
@@ -189,6 +239,13 @@ GSM_DateTime GetDateFromDict(PyObject * dict, const char *key);
  */
 char *GetCharFromDict(PyObject * dict, const char *key);
 
+/**
+ * Copies at most maxlen bytes of any bytes-like object from dictionary dict
+ * with key key, len is set to length of the object.
+ */
+int CopyDataFromDict(PyObject * dict, const char *key, Py_ssize_t maxlen,
+		     unsigned char *dest, Py_ssize_t * len);
+
 /**
  * Gets char* with length (may contain NULs) from dictionary dict with key key. (doesn't allocate it!)
  */
@@ -240,10 +297,86 @@ PyObject *SMSCToPython(GSM_SMSC * smsc);
 int SMSCFromPython(PyObject * dict, GSM_SMSC * smsc, gboolean complete);
 
 /**
- * Converts SMS to python object.
+ * Converts SMS to python object, either dictionary or lazy record.
  */
 PyObject *SMSToPython(GSM_SMSMessage * sms);
 
+/**
+ * Converts SMS to python object, lazy record is created when lazy is
+ * positive, negative value uses global setting.
+ */
+PyObject *SMSToPythonLazy(GSM_SMSMessage * sms, int lazy);
+
+/**
+ * Converts SMS to python dictionary.
+ */
+PyObject *SMSToPythonDict(GSM_SMSMessage * sms);
+
+/**
+ * Converts UDH to python dictionary.
+ */
+PyObject *UDHToPython(GSM_UDHHeader * udh);
+
+/**
+ * Converts SMS type to string.
+ */
+char *SMSTypeToString(GSM_SMSMessageType type);
+
+/**
+ * Converts SMS coding to string.
+ */
+char *SMSCodingToString(GSM_Coding_Type type);
+
+/**
+ * Converts SMS state to string.
+ */
+char *SMSStateToString(GSM_SMS_State type);
+
+/**
+ * Sets whether SMSToPython creates lazy records.
+ */
+void SMSRecordSetLazy(int lazy);
+
+/**
+ * Returns whether SMSToPython creates lazy records.
+ */
+int SMSRecordGetLazy(void);
+
+/**
+ * Creates lazy SMS record.
+ */
+PyObject *SMSRecordFromSMS(const GSM_SMSMessage * sms);
+
+/**
+ * Checks whether object is lazy SMS record.
+ */
+int SMSRecordCheck(PyObject * o);
+
+/**
+ * Returns message stored in lazy SMS record.
+ */
+GSM_SMSMessage *SMSRecordGetSMS(PyObject * o);
+
+/**
+ * Checks whether some field of lazy SMS record was assigned.
+ */
+int SMSRecordIsModified(PyObject * o);
+
+/**
+ * Converts lazy SMS record to python dictionary, including assigned fields.
+ */
+PyObject *SMSRecordToDict(PyObject * o);
+
+/**
+ * Argument converter accepting SMS dictionary or lazy SMS record.
+ */
+int SMSObjectConverter(PyObject * o, void *address);
+
+/**
+ * Initialisation of SMS record type.
+ */
+int gammu_smsrecord_init(PyObject * m);
+
 /**
  * Creates SMS from python object.
  */
@@ -255,6 +388,11 @@ int SMSFromPython(PyObject * dict, GSM_SMSMessage * sms, int needslocation,
  */
 PyObject *MultiSMSToPython(GSM_MultiSMSMessage * sms);
 
+/**
+ * Converts MultiSMS to list of python objects, see SMSToPythonLazy.
+ */
+PyObject *MultiSMSToPythonLazy(GSM_MultiSMSMessage * sms, int lazy);
+
 /**
  * Converts MultiSMS from list of python objects.
  */
@@ -276,6 +414,11 @@ PyObject *MultiSMSListToPython(GSM_MultiSMSMessage ** sms);
  */
 PyObject *SMSBackupToPython(GSM_SMS_Backup * sms);
 
+/**
+ * Converts SMS backup to list of Python objects, see SMSToPythonLazy.
+ */
+PyObject *SMSBackupToPythonLazy(GSM_SMS_Backup * sms, int lazy);
+
 /**
  * Converts SMS backup from list of Python objects.
  */
@@ -373,6 +516,32 @@ int BackupFromPython(PyObject * dict, GSM_Backup * backup);
  * Converts backup format from string to Gammu.
  */
 int BackupFormatFromString(const char *s, GSM_BackupFormat * format);
+
+/**
+ * Creates lazy backup record, it takes ownership of the backup, which has
+ * to be allocated by malloc.
+ */
+PyObject *BackupRecordFromBackup(GSM_Backup * backup);
+
+/**
+ * Checks whether object is lazy backup record.
+ */
+int BackupRecordCheck(PyObject * o);
+
+/**
+ * Returns backup stored in lazy backup record.
+ */
+GSM_Backup *BackupRecordGetBackup(PyObject * o);
+
+/**
+ * Argument converter accepting backup dictionary or lazy backup record.
+ */
+int BackupObjectConverter(PyObject * o, void *address);
+
+/**
+ * Initialisation of backup record type.
+ */
+int gammu_backuprecord_init(PyObject * m);
 #endif
 
 /**
@@ -420,6 +589,11 @@ int WAPBookmarkFromPython(PyObject * dict, GSM_WAPBookmark * wap);
  */
 GSM_UDH StringToUDHType(const char *s);;
 
+/**
+ * Converts UDH type value to string.
+ */
+char *UDHTypeToString(GSM_UDH type);
+
 /**
  * Converts GSM coding string to value.
  */
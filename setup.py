@@ -171,13 +171,16 @@ def get_module():
             "gammu/src/convertors/string.c",
             "gammu/src/convertors/time.c",
             "gammu/src/convertors/base.c",
+            "gammu/src/convertors/enums.c",
             "gammu/src/convertors/sms.c",
+            "gammu/src/convertors/smsrecord.c",
             "gammu/src/convertors/memory.c",
             "gammu/src/convertors/todo.c",
             "gammu/src/convertors/calendar.c",
             "gammu/src/convertors/bitmap.c",
             "gammu/src/convertors/ringtone.c",
             "gammu/src/convertors/backup.c",
+            "gammu/src/convertors/backuprecord.c",
             "gammu/src/convertors/file.c",
             "gammu/src/convertors/call.c",
             "gammu/src/convertors/wap.c",
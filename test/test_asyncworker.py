@@ -19,6 +19,7 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 import asyncio
+import inspect
 
 import pytest
 
@@ -113,3 +114,43 @@ class AsyncWorkerDummyTest(DummyTest):
         self.results.append(("Terminate", await worker.terminate_async()))
         self.maxDiff = None
         assert self.results == WORKER_EXPECT
+
+    @async_test
+    async def test_async_state_machine(self) -> None:
+        state_machine = gammu.asyncworker.AsyncStateMachine()
+        state_machine.configure(self.get_statemachine().GetConfig())
+        await state_machine.Init()
+        assert await state_machine.GetIMEI() == "999999999999999"
+        assert await state_machine.GetModel() == ("unknown", "Dummy")
+        status = await state_machine.GetMemoryStatus(Type="ME")
+        assert status["Used"] == 3
+        entry = await state_machine.GetNextMemory(Type="ME", Start=True)
+        assert entry["MemoryType"] == "ME"
+        with pytest.raises(gammu.GSMError):
+            await state_machine.GetMemory(Type="ME", Location=100)
+        entry = await state_machine.GetMemory("ME", Location=1)
+        assert entry["Location"] == 1
+        await state_machine.Terminate()
+
+    def test_async_state_machine_methods(self) -> None:
+        for name in ("GetNextSMS", "DeleteSMS", "GetMemory", "GetFilePart"):
+            assert inspect.iscoroutinefunction(
+                getattr(gammu.asyncworker.AsyncStateMachine, name)
+            )
+        assert not hasattr(gammu.asyncworker.AsyncStateMachine, "IterSMS")
+
+    @async_test
+    async def test_async_abort(self) -> None:
+        state_machine = gammu.asyncworker.AsyncStateMachine()
+        state_machine.configure(self.get_statemachine().GetConfig())
+        future = asyncio.ensure_future(state_machine.GetIMEI())
+        await asyncio.sleep(0)
+        state_machine.abort()
+        with pytest.raises(asyncio.CancelledError):
+            await future
+
+        future = asyncio.ensure_future(state_machine.GetModel())
+        await asyncio.sleep(0)
+        await state_machine.Abort()
+        with pytest.raises(asyncio.CancelledError):
+            await future
@@ -18,11 +18,16 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
+import re
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 import gammu
+import gammu.backup
 
 TEST_DIR = Path(__file__).parent / "data"
 TEST_FILES_CALENDAR = [*TEST_DIR.glob("*.ics"), *TEST_DIR.glob("*.vcs")]
@@ -31,6 +36,14 @@ TEST_CONTACTS = (".lmb", ".vcf", ".backup")
 TEST_CALENDAR = (".vcs", ".ics", ".backup")
 
 
+def without_location(messages):
+    """Drops message locations, which depend on how the backup was parsed."""
+    return [
+        {key: value for key, value in message.items() if key != "Location"}
+        for message in messages
+    ]
+
+
 class BackupTest(unittest.TestCase):
     def perform_test(self, filename: Path, extensions: tuple[str, ...]) -> None:
         out_files = [
@@ -114,3 +127,177 @@ class BackupTest(unittest.TestCase):
         entry2 = gammu.DecodeVCARD(vc_entry)
 
         assert entry == entry2
+
+    def test_lazy(self) -> None:
+        filename = (TEST_DIR / "gammu.vcf").as_posix()
+        expected = gammu.ReadBackup(filename)
+        backup = gammu.ReadBackup(filename, Lazy=True)
+
+        assert isinstance(backup, gammu.BackupRecord)
+        assert list(backup) == list(expected)
+        assert backup["PhonePhonebook"] == expected["PhonePhonebook"]
+        assert backup.PhonePhonebook is backup["PhonePhonebook"]
+        assert list(backup.IterSection("PhonePhonebook")) == expected["PhonePhonebook"]
+        assert backup.ToDict() == expected
+
+        with pytest.raises(KeyError):
+            backup["SMS"]
+        with pytest.raises(ValueError, match="Bad value for Section: 'IMEI'"):
+            backup.IterSection("IMEI")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = (Path(tmpdir) / "out.vcf").as_posix()
+            gammu.SaveBackup(out, backup)
+            assert len(gammu.ReadBackup(out)["PhonePhonebook"]) == len(
+                expected["PhonePhonebook"]
+            )
+
+    def test_convert_many(self) -> None:
+        paths = [*TEST_DIR.glob("*.vcf"), TEST_DIR / "missing.vcf"]
+        reported = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            results = gammu.backup.convert_many(
+                paths,
+                "backup",
+                workers=2,
+                output_dir=tmpdir,
+                progress=lambda done, total, result: reported.append(
+                    (done, total, result.source)
+                ),
+            )
+
+            assert [result.source for result in results] == [
+                str(path) for path in paths
+            ]
+            assert [done for done, _total, _source in reported] == list(
+                range(1, len(paths) + 1)
+            )
+            assert {source for _done, _total, source in reported} == {
+                result.source for result in results
+            }
+            for result in results[:-1]:
+                assert result.ok, result.error
+                assert len(gammu.ReadBackup(result.target)["PhonePhonebook"]) == len(
+                    gammu.ReadBackup(result.source)["PhonePhonebook"]
+                )
+            assert isinstance(results[-1].error, gammu.GSMError)
+
+            source = Path(tmpdir) / "nested" / ".." / paths[0].name
+            (Path(tmpdir) / "nested").mkdir()
+            source.write_bytes(paths[0].read_bytes())
+            results = gammu.backup.convert_many(
+                [source, paths[0]], "vcf", output_dir=tmpdir
+            )
+            assert [str(result.error) for result in results] == [
+                f"Conversion would overwrite {source}!",
+                f"Conversion would overwrite {results[1].target} twice!",
+            ]
+
+    def test_threads(self) -> None:
+        filenames = [filename.as_posix() for filename in TEST_FILES_CALENDAR]
+        expected = [gammu.ReadBackup(filename) for filename in filenames]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = list(executor.map(gammu.ReadBackup, filenames * 4))
+
+        assert result == expected * 4
+
+    def test_sms_backup_iter(self) -> None:
+        messages = gammu.EncodeSMS(
+            {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": "x" * 500}]}
+        )
+        for message in messages:
+            message["Number"] = "123456"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = (Path(tmpdir) / "test.smsbackup").as_posix()
+            gammu.SaveSMSBackup(filename, messages)
+            expected = gammu.ReadSMSBackup(filename)
+
+            assert gammu.CountSMSBackup(filename) == len(expected) == 4
+
+            iterator = gammu.IterSMSBackup(filename, Chunk=3)
+            assert iterator.Total == 4
+            chunks = list(iterator)
+            assert [len(chunk) for chunk in chunks] == [3, 1]
+            assert without_location(
+                message for chunk in chunks for message in chunk
+            ) == without_location(expected)
+            assert iterator.Read == 4
+
+            lazy = gammu.ReadSMSBackup(filename, Lazy=True)
+            assert [message.ToDict() for message in lazy] == expected
+            chunks = list(gammu.IterSMSBackup(filename, Chunk=3, Lazy=True))
+            assert isinstance(chunks[0][0], gammu.SMSRecord)
+
+            # Appending creates duplicate section names, chunks renumber them
+            gammu.SaveSMSBackup(filename, messages[:2])
+            iterator = gammu.IterSMSBackup(filename, Chunk=5)
+            appended = [message for chunk in iterator for message in chunk]
+            assert without_location(appended) == without_location(
+                expected + expected[:2]
+            )
+            assert iterator.Total == iterator.Read == 6
+
+            with pytest.raises(ValueError, match="Chunk has to be positive"):
+                gammu.IterSMSBackup(filename, Chunk=0)
+
+            with pytest.raises(gammu.ERR_CANTOPENFILE):
+                gammu.CountSMSBackup((Path(tmpdir) / "missing").as_posix())
+
+    def test_sms_backup_writer(self) -> None:
+        texts = [f"Message {i}" for i in range(4)]
+        messages = [
+            gammu.EncodeSMS({"Entries": [{"ID": "Text", "Buffer": text}]})[0]
+            for text in texts
+        ]
+        for message in messages:
+            message["Number"] = "123456"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = Path(tmpdir) / "test.smsbackup"
+            with gammu.SMSBackupWriter(filename, batch=3) as writer:
+                writer.write_many(messages[:2])
+                assert len(writer) == 2
+                assert not filename.exists()
+                writer.write_many(messages[2:])
+                assert len(writer) == 1
+                assert writer.written == 3
+                assert gammu.CountSMSBackup(filename.as_posix()) == 3
+
+            assert writer.closed
+            assert writer.written == 4
+            backup = gammu.ReadSMSBackup(filename.as_posix())
+            assert [message["Text"] for message in backup] == texts
+            assert gammu.CountSMSBackup(filename.as_posix()) == 4
+
+            with gammu.SMSBackupWriter(filename, batch=3) as writer:
+                writer.write(messages[0])
+            backup = gammu.ReadSMSBackup(filename.as_posix())
+            assert [message["Text"] for message in backup] == [*texts, texts[0]]
+
+            with pytest.raises(ValueError, match="Writing to closed SMS backup"):
+                writer.write(messages[0])
+
+    def test_sms_backup_writer_sections(self) -> None:
+        texts = [f"Message {i}" for i in range(3)]
+        messages = [
+            gammu.EncodeSMS({"Entries": [{"ID": "Text", "Buffer": text}]})[0]
+            for text in texts
+        ]
+        for message in messages:
+            message["Number"] = "123456"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = Path(tmpdir) / "test.smsbackup"
+            gammu.SaveSMSBackup(filename.as_posix(), messages[:1])
+            filename.write_bytes(
+                filename.read_bytes().replace(b"[SMSBackup000]", b"[SMSBackup005]")
+            )
+
+            with gammu.SMSBackupWriter(filename) as writer:
+                writer.write_many(messages[1:])
+
+            sections = re.findall(
+                rb"^\[SMSBackup(\d+)\]", filename.read_bytes(), re.MULTILINE
+            )
+            assert sections == [b"005", b"006", b"007"]
+            backup = gammu.ReadSMSBackup(filename.as_posix())
+            assert [message["Text"] for message in backup] == texts
@@ -159,6 +159,22 @@ class BasicDummyTest(DummyTest):  # ruff: ignore[too-many-public-methods]
                 )
             remain -= 1
 
+    def test_iter_memory(self) -> None:
+        state_machine = self.get_statemachine()
+        iterator = state_machine.IterMemory("ME", Batch=2)
+
+        batches = list(iterator)
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert iterator.Read == 3
+        assert iterator.Total == 3
+        assert all(entry["MemoryType"] == "ME" for entry in batches[0])
+
+    def test_iter_memory_invalid(self) -> None:
+        state_machine = self.get_statemachine()
+        with pytest.raises(ValueError, match="Bad value for memory type"):
+            state_machine.IterMemory("XX")
+
     def test_getmemory(self) -> None:
         state_machine = self.get_statemachine()
 
@@ -222,6 +238,38 @@ class BasicDummyTest(DummyTest):  # ruff: ignore[too-many-public-methods]
             if message is None:
                 assert item[0]["UDH"]["Type"] == "NoUDH"
 
+    def test_iter_sms(self) -> None:
+        state_machine = self.get_statemachine()
+        iterator = state_machine.IterSMS(Batch=4)
+
+        batches = list(iterator)
+
+        assert all(0 < len(batch) <= 4 for batch in batches)
+        assert sum(len(sms) for batch in batches for sms in batch) == 6
+        assert iterator.Read == 6
+        assert iterator.Total == 6
+
+        data = gammu.LinkSMS([sms for batch in batches for sms in batch])
+        assert data
+
+        lazy = list(state_machine.IterSMS(Batch=4, Lazy=True))
+        assert all(
+            isinstance(part, gammu.SMSRecord)
+            for batch in lazy
+            for sms in batch
+            for part in sms
+        )
+        assert [[part.ToDict() for part in sms] for batch in lazy for sms in batch] == [
+            sms for batch in batches for sms in batch
+        ]
+        sms = state_machine.GetNextSMS(Folder=0, Start=True, Lazy=True)
+        assert isinstance(sms[0], gammu.SMSRecord)
+
+    def test_iter_sms_batch(self) -> None:
+        state_machine = self.get_statemachine()
+        with pytest.raises(ValueError, match="Batch has to be positive"):
+            state_machine.IterSMS(Batch=0)
+
     def test_todo(self) -> None:
         state_machine = self.get_statemachine()
         status = state_machine.GetToDoStatus()
@@ -295,6 +343,59 @@ class BasicDummyTest(DummyTest):  # ruff: ignore[too-many-public-methods]
             # Actually send the message
             state_machine.SendSMS(message)
 
+    def test_sendsms_lazy(self) -> None:
+        state_machine = self.get_statemachine()
+        smsinfo = {"Entries": [{"ID": "Text", "Buffer": "python-gammu testing"}]}
+        previous = gammu.SetLazySMS(True)
+        try:
+            message = gammu.EncodeSMS(smsinfo)[0]
+        finally:
+            gammu.SetLazySMS(previous)
+
+        with pytest.raises(ValueError, match="Missing SMS number"):
+            state_machine.SendSMS(message)
+
+        message["SMSC"] = {"Location": 1}
+        message["Number"] = "123456"
+        state_machine.SendSMS(message)
+
+    def test_sendsms_batch(self) -> None:
+        state_machine = self.get_statemachine()
+        message = {
+            "Text": "python-gammu testing message",
+            "SMSC": {"Location": 1},
+            "Number": "123456",
+        }
+        smsinfo = {
+            "Entries": [
+                {"ID": "ConcatenatedTextLong", "Buffer": "Long message. " * 20}
+            ],
+        }
+        encoded = gammu.EncodeSMS(smsinfo)
+        for part in encoded:
+            part["SMSC"] = {"Location": 1}
+            part["Number"] = "123456"
+
+        result = state_machine.SendSMSBatch([message, encoded, message], Rate=100)
+        assert len(result) == 3
+        assert isinstance(result[0][0], int)
+        assert len(result[1][0]) == len(encoded)
+        assert [error for _reference, error in result] == [None, None, None]
+
+        info = dict(smsinfo, Number="123456", SMSC={"Location": 1})
+        result = state_machine.SendSMSBatch([info, message])
+        assert len(result[0][0]) == len(encoded)
+        assert isinstance(result[1][0], int)
+        assert [error for _reference, error in result] == [None, None]
+        with pytest.raises(ValueError, match="Missing key in dictionary: Number"):
+            state_machine.SendSMSBatch([smsinfo])
+
+        assert state_machine.SendSMSBatch([]) == []
+        with pytest.raises(TypeError):
+            state_machine.SendSMSBatch([42])
+        with pytest.raises(ValueError, match="Rate can not be negative"):
+            state_machine.SendSMSBatch([message], Rate=-1)
+
     def test_filesystem(self) -> None:
         state_machine = self.get_statemachine()
         fs_info = state_machine.GetFileSystemStatus()
@@ -474,6 +575,83 @@ class BasicDummyTest(DummyTest):  # ruff: ignore[too-many-public-methods]
         state_machine.GetSignalQuality()
         assert self._called
 
+    def test_incoming_call_batch(self) -> None:
+        events = []
+
+        def batch_callback(state_machine, response, data) -> None:
+            assert response == "Batch"
+            events.extend(data)
+
+        state_machine = self.get_statemachine()
+        state_machine.SetIncomingCallback(batch_callback, Batch=True)
+        state_machine.SetIncomingCall()
+        state_machine.GetSignalQuality()
+        assert not events
+        self.fake_incoming_call()
+        state_machine.GetSignalQuality()
+        assert len(events) == 1
+        assert events[0][0] == "Call"
+        assert events[0][1]["Number"] == "+800123456"
+
+    def test_event_queue_stats(self) -> None:
+        self._called = False
+        state_machine = self.get_statemachine()
+        state_machine.SetEventQueue(Capacity=4, Overflow="DropOldest")
+        state_machine.SetIncomingCallback(self.call_callback)
+        state_machine.SetIncomingCall()
+        state_machine.GetSignalQuality()
+        self.fake_incoming_call()
+        state_machine.GetSignalQuality()
+        assert self._called
+
+        stats = state_machine.GetEventQueueStats()
+        assert set(stats) == {"Call", "SMS", "CB", "USSD"}
+        assert stats["Call"] == {
+            "Pending": 0,
+            "Capacity": 4,
+            "Enqueued": 1,
+            "Dropped": 0,
+            "HighWater": 1,
+        }
+        assert stats["SMS"]["Enqueued"] == 0
+
+    def check_event_queue_overflow(self, overflow, enqueued, expected) -> None:
+        texts = []
+        state_machine = self.get_statemachine()
+        state_machine.SetEventQueue(Capacity=2, Overflow=overflow)
+        state_machine.SetIncomingUSSD()
+        # Events are kept queued until there is callback
+        for i in range(4):
+            state_machine.DialService(str(i))
+
+        assert state_machine.GetEventQueueStats()["USSD"] == {
+            "Pending": 2,
+            "Capacity": 2,
+            "Enqueued": enqueued,
+            "Dropped": 2,
+            "HighWater": 2,
+        }
+
+        state_machine.SetIncomingCallback(
+            lambda _state_machine, _response, data: texts.append(data["Text"])
+        )
+        state_machine.GetSignalQuality()
+        assert texts == expected
+        assert state_machine.GetEventQueueStats()["USSD"]["Pending"] == 0
+
+    def test_event_queue_drop_oldest(self) -> None:
+        self.check_event_queue_overflow("DropOldest", 4, ["Reply for 2", "Reply for 3"])
+
+    def test_event_queue_drop_newest(self) -> None:
+        self.check_event_queue_overflow("DropNewest", 2, ["Reply for 0", "Reply for 1"])
+
+    def test_event_queue_invalid(self) -> None:
+        state_machine = self.get_statemachine()
+        with pytest.raises(ValueError, match="Capacity has to be positive"):
+            state_machine.SetEventQueue(Capacity=0)
+        with pytest.raises(ValueError, match="Bad value for Overflow"):
+            state_machine.SetEventQueue(Overflow="Block")
+
     def test_callback_reentrancy_protection(self) -> None:
         """Test that calling Gammu functions from within callback raises error."""
         self._reentrancy_error = None
@@ -0,0 +1,109 @@
+# vim: expandtab sw=4 ts=4 sts=4:
+#
+# Copyright © 2003 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of python-gammu <https://wammu.eu/python-gammu/>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+import unittest
+
+import pytest
+
+import gammu
+
+MESSAGE = "Long message which does not fit into single SMS. " * 10
+
+
+def get_parts(number="1234"):
+    smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+    parts = gammu.EncodeSMS(smsinfo)
+    for part in parts:
+        part["Number"] = number
+    return parts
+
+
+class LinkerTest(unittest.TestCase):
+    def test_link(self) -> None:
+        linker = gammu.SMSLinker()
+        parts = get_parts()
+        assert len(parts) > 2
+        for part in reversed(parts[1:]):
+            assert linker.add(part) is None
+        assert len(linker) == 1
+        linked = linker.add(parts[0])
+        assert linked == parts
+        assert len(linker) == 0
+        assert gammu.DecodeSMS(linked)["Entries"][0]["Buffer"] == MESSAGE
+
+    def test_single(self) -> None:
+        linker = gammu.SMSLinker()
+        message = {"Number": "1234", "Text": "Hello"}
+        assert linker.add(message) == [message]
+        assert len(linker) == 0
+
+    def test_out_of_range(self) -> None:
+        linker = gammu.SMSLinker()
+        parts = get_parts()
+        bogus = dict(parts[0])
+        bogus["UDH"] = dict(parts[0]["UDH"])
+        bogus["UDH"]["PartNumber"] = len(parts) + 1
+        assert linker.add(bogus) == [bogus]
+        for part in parts[1:]:
+            assert linker.add(part) is None
+        assert linker.add(parts[0]) == parts
+        assert len(linker) == 0
+
+    def test_senders(self) -> None:
+        linker = gammu.SMSLinker()
+        first = get_parts("1234")
+        second = get_parts("5678")
+        assert linker.add(first[0]) is None
+        assert linker.add(second[0]) is None
+        assert len(linker) == 2
+        assert linker.flush() == [first[:1], second[:1]]
+        assert len(linker) == 0
+
+    def test_expire(self) -> None:
+        expired = []
+        now = [0]
+        linker = gammu.SMSLinker(
+            ttl=10, expired_callback=expired.append, clock=lambda: now[0]
+        )
+        parts = get_parts()
+        linker.add(parts[0])
+        now[0] = 5
+        assert linker.expire() == 0
+        now[0] = 20
+        assert linker.expire() == 1
+        assert expired == [parts[:1]]
+        assert len(linker) == 0
+
+    def test_max_pending(self) -> None:
+        expired = []
+        linker = gammu.SMSLinker(max_pending=1, expired_callback=expired.append)
+        first = get_parts("1234")
+        second = get_parts("5678")
+        linker.add(first[0])
+        linker.add(second[0])
+        assert len(linker) == 1
+        assert expired == [first[:1]]
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="TTL can not be negative"):
+            gammu.SMSLinker(ttl=-1)
+        with pytest.raises(ValueError, match="Limit of pending messages"):
+            gammu.SMSLinker(max_pending=0)
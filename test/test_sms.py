@@ -19,12 +19,15 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+import array
 import binascii
 import datetime
 import os
 import sys
 import unittest
 
+import pytest
+
 import gammu
 
 PDU_DATA = binascii.unhexlify(
@@ -65,6 +68,68 @@ class PDUTest(unittest.TestCase):
         assert sms["Number"] == "604865888"
         assert sms["Text"] == "Delivered"
 
+    def test_decode_shared_strings(self) -> None:
+        first = gammu.DecodePDU(PDU_DATA)
+        second = gammu.DecodePDU(PDU_DATA)
+        assert first == second
+        assert first["Type"] is second["Type"]
+        assert first["Coding"] is second["Coding"]
+        assert first["UDH"]["Type"] is second["UDH"]["Type"]
+        assert first["SMSC"]["Validity"] is second["SMSC"]["Validity"]
+        for key, other in zip(first, second, strict=True):
+            assert key is other
+
+    def test_decode_batch(self) -> None:
+        expected = gammu.DecodePDU(PDU_DATA)
+        messages = gammu.DecodePDUBatch([PDU_DATA] * 100)
+        assert len(messages) == 100
+        assert messages[0] == expected
+        assert messages[-1] == expected
+
+        messages, errors = gammu.DecodePDUBatch(
+            (PDU_DATA, bytearray(PDU_DATA)), Errors="collect"
+        )
+        assert messages == [expected, expected]
+        assert errors == []
+
+    def test_decode_batch_errors(self) -> None:
+        expected = gammu.DecodePDU(PDU_DATA)
+        # Truncated PDU can not be decoded
+        data = [PDU_DATA, PDU_DATA[:3], PDU_DATA]
+
+        with pytest.raises(gammu.GSMError):
+            gammu.DecodePDUBatch(data)
+
+        assert gammu.DecodePDUBatch(data, Errors="skip") == [expected, expected]
+
+        messages, errors = gammu.DecodePDUBatch(data, Errors="collect")
+        assert messages == [expected, None, expected]
+        assert len(errors) == 1
+        assert errors[0][0] == 1
+        assert errors[0][1].startswith("ERR_")
+
+    def test_decode_batch_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Wrong value for errors handling"):
+            gammu.DecodePDUBatch([PDU_DATA], Errors="ignore")
+        with pytest.raises(TypeError):
+            gammu.DecodePDUBatch([PDU_DATA, 42])
+        with pytest.raises(TypeError):
+            gammu.DecodePDUBatch(42)
+
+    def test_encode_batch(self) -> None:
+        smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+        sms = gammu.EncodeSMS(smsinfo)
+        pdu = gammu.EncodePDUBatch(sms * 50, Layout="Deliver")
+        assert len(pdu) == len(sms) * 50
+        assert pdu[0] == gammu.EncodePDU(sms[0], Layout="Deliver")
+        decoded = gammu.DecodePDUBatch(pdu)
+        assert decoded[-1]["Text"] == gammu.DecodePDU(pdu[-1])["Text"]
+
+        with pytest.raises(ValueError, match="Wrong value for SMS layout"):
+            gammu.EncodePDUBatch(sms, Layout="Foo")
+        with pytest.raises(TypeError):
+            gammu.EncodePDUBatch([42])
+
     def do_smstest(self, smsinfo, expected) -> None:
         # encode SMSes
         sms = gammu.EncodeSMS(smsinfo)
@@ -77,6 +142,7 @@ class PDUTest(unittest.TestCase):
 
         # do conversion to PDU
         pdu = [gammu.EncodePDU(s) for s in sms]
+        assert gammu.EncodePDUBatch(sms) == pdu
 
         # Convert back
         pdusms = [gammu.DecodePDU(p) for p in pdu]
@@ -118,6 +184,112 @@ class PDUTest(unittest.TestCase):
         # compare results
         assert decodedsms["Entries"][0]["Buffer"], MESSAGE
 
+    def test_template(self) -> None:
+        smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+        template = gammu.EncodeSMSTemplate(smsinfo, SMSC={"Location": 1})
+        assert template.Parts == len(gammu.EncodeSMS(smsinfo))
+
+        for number in ("123456", "+420789"):
+            sms = template.Render(number)
+            assert len(sms) == template.Parts
+            assert {message["Number"] for message in sms} == {number}
+            assert sms[0]["SMSC"]["Location"] == 1
+            assert gammu.DecodeSMS(sms)["Entries"][0]["Buffer"] == MESSAGE
+
+            pdu = template.RenderPDU(number)
+            assert len(pdu) == template.Parts
+            assert gammu.DecodePDU(pdu[0])["Number"] == number
+
+        with pytest.raises(ValueError, match="Number is too long"):
+            template.Render("1" * 100)
+        with pytest.raises(ValueError, match="Wrong value for SMS layout"):
+            template.RenderPDU("123456", Layout="Foo")
+
+    def test_lazy(self) -> None:
+        smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+        previous = gammu.SetLazySMS(True)
+        try:
+            sms = gammu.DecodePDU(PDU_DATA)
+            parts = gammu.EncodeSMS(smsinfo)
+        finally:
+            gammu.SetLazySMS(previous)
+
+        assert isinstance(sms, gammu.SMSRecord)
+        assert sms.Number == "604865888"
+        assert sms["Text"] == "Delivered"
+        assert sms.ToDict() == gammu.DecodePDU(PDU_DATA)
+        assert set(sms) == set(sms.keys()) == set(sms.ToDict())
+        assert "Number" in sms
+        assert "Foo" not in sms
+        assert sms.get("Foo") is None
+        with pytest.raises(KeyError):
+            sms["Foo"]
+
+        assert isinstance(parts[0], gammu.SMSRecord)
+        assert gammu.DecodeSMS(parts)["Entries"][0]["Buffer"] == MESSAGE
+        assert gammu.EncodePDU(parts[0]) == gammu.EncodePDU(parts[0].ToDict())
+
+        parts[0]["Number"] = "123456"
+        assert parts[0].Number == "123456"
+        assert parts[0].ToDict()["Number"] == "123456"
+        assert gammu.DecodePDU(gammu.EncodePDU(parts[0]))["Number"] == "123456"
+        with pytest.raises(KeyError):
+            parts[0]["Foo"] = 1
+
+        sms = gammu.DecodePDU(PDU_DATA, Lazy=True)
+        assert isinstance(sms, gammu.SMSRecord)
+        assert sms.ToDict() == gammu.DecodePDU(PDU_DATA, Lazy=None)
+        assert isinstance(
+            gammu.DecodePDUBatch([PDU_DATA], Lazy=True)[0], gammu.SMSRecord
+        )
+
+        previous = gammu.SetLazySMS(True)
+        try:
+            assert isinstance(gammu.DecodePDU(PDU_DATA, Lazy=False), dict)
+            assert isinstance(gammu.DecodePDU(PDU_DATA), gammu.SMSRecord)
+        finally:
+            gammu.SetLazySMS(previous)
+
+    def test_lazy_buffers(self) -> None:
+        smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+        previous = gammu.SetLazySMS(True)
+        try:
+            parts = gammu.EncodeSMS(smsinfo)
+            binary = parts[0].ToDict()
+            binary["Coding"] = "8bit"
+            binary["Text"] = bytearray(b"\x01\x02\x03")
+            decoded = gammu.DecodePDU(gammu.EncodePDU(binary))
+        finally:
+            gammu.SetLazySMS(previous)
+
+        udh = parts[0].UDHData
+        assert isinstance(udh, memoryview)
+        assert udh.readonly
+        assert bytes(udh) == parts[0].UDH["Text"]
+        assert parts[0].TextData is None
+        assert decoded.TextData.tobytes() == b"\x01\x02\x03"
+
+        # Views can be used when creating messages
+        message = parts[0].ToDict()
+        message["UDH"]["Text"] = udh
+        assert gammu.EncodePDU(message) == gammu.EncodePDU(parts[0])
+
+        # View keeps record alive
+        del parts
+        assert bytes(udh) == message["UDH"]["Text"].tobytes()
+
+    def test_link_and_decode(self) -> None:
+        smsinfo = {"Entries": [{"ID": "ConcatenatedTextLong", "Buffer": MESSAGE}]}
+        sms = gammu.EncodeSMS(smsinfo)
+        messages = [[sms[1]], [sms[0]]]
+
+        result = gammu.LinkAndDecodeSMS(messages, True)
+        linked = gammu.LinkSMS(messages, True)
+        assert len(result) == len(linked) == 1
+        assert result[0][0] == linked[0]
+        assert result[0][1] == gammu.DecodeSMS(linked[0])
+        assert result[0][1]["Entries"][0]["Buffer"] == MESSAGE
+
     def test_mms_decode(self) -> None:
         message = [
             {
@@ -173,6 +345,17 @@ class PDUTest(unittest.TestCase):
     def test_counter(self) -> None:
         assert gammu.SMSCounter("foobar") == (1, 154)
 
+    def test_counter_many(self) -> None:
+        texts = ["foobar", MESSAGE, UNICODE, ""]
+        numbers, chars = gammu.SMSCounterMany(texts)
+        assert isinstance(numbers, array.array)
+        assert list(zip(numbers, chars, strict=True)) == [
+            gammu.SMSCounter(text) for text in texts
+        ]
+        assert gammu.SMSCounterMany([]) == (array.array("i"), array.array("i"))
+        with pytest.raises(TypeError):
+            gammu.SMSCounterMany([42])
+
     def test_counter_long(self) -> None:
         assert gammu.SMSCounter(
             "foobar fjsa;kjfkasdjfkljsklfjaskdljfkljasdfkljqilui143uu51o23rjhskdf jasdklfjasdklf jasdfkljasdlkfj;asd;lfjaskdljf431ou983jdfaskljfklsdjdkljasfl sdfjasdfkl jafklsda"
@@ -18,6 +18,8 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
+import pytest
+
 import gammu.worker
 
 from .test_dummy import DummyTest
@@ -356,3 +358,153 @@ class WorkerDummyTest(DummyTest):
         self.fake_incoming_call()
         worker.terminate()
         assert self._called
+
+    def test_poll_interval(self) -> None:
+        self.results = []
+        pulls = []
+        worker = gammu.worker.GammuWorker(
+            self.callback, pull_func=pulls.append, poll_interval=0
+        )
+        worker.configure(self.get_statemachine().GetConfig())
+        for _i in range(5):
+            worker.enqueue("GetModel")
+        worker.initiate()
+        worker.terminate()
+
+        # Device is read after every task even when queue is not empty
+        assert len(pulls) >= 5
+        assert [result[0] for result in self.results].count("GetModel") == 5
+
+    def test_no_poll_after_terminate(self) -> None:
+        self.results = []
+        worker = gammu.worker.GammuWorker(
+            self.callback,
+            pull_func=lambda _sm: self.results.append("pull"),
+            poll_interval=0,
+        )
+        worker.configure(self.get_statemachine().GetConfig())
+        worker.enqueue("GetModel")
+        worker.initiate()
+        worker.terminate()
+
+        assert self.results[-1] == ("Terminate", None, "ERR_NONE", 100)
+
+    def pool_callback(self, index, name, result, error, percents) -> None:
+        self.results.append((index, name, result, error, percents))
+
+    def test_pool(self) -> None:
+        self.results = []
+        config = self.get_statemachine().GetConfig()
+        pool = gammu.worker.GammuWorkerPool(self.pool_callback, [config, config])
+        assert len(pool) == 2
+        assert [pool.enqueue("GetModel")[0] for _i in range(4)] == [0, 1, 0, 1]
+        index, task = pool.enqueue("GetIMEI")
+        assert index == 0
+        pool.cancel(task)
+        pool.initiate()
+        pool.terminate()
+
+        models = [result for result in self.results if result[1] == "GetModel"]
+        assert sorted(result[0] for result in models) == [0, 0, 1, 1]
+        assert all(result[2] == ("unknown", "Dummy") for result in models)
+        assert (0, "GetIMEI", None, "ERR_CANCELED", 100) in self.results
+
+    def test_pool_affinity(self) -> None:
+        self.results = []
+        config = self.get_statemachine().GetConfig()
+        pool = gammu.worker.GammuWorkerPool(
+            self.pool_callback, [config, config], routing="affinity"
+        )
+        pool.set_affinity("SIM2", 1)
+        assert pool.enqueue("GetIMEI", key="SIM2")[0] == 1
+        assert pool.enqueue("GetIMEI", key="SIM2")[0] == 1
+        first = pool.enqueue("GetIMEI", key="SIM1")[0]
+        assert pool.enqueue("GetIMEI", key="SIM1")[0] == first
+        # Terminating pool which was not initiated does nothing
+        pool.terminate()
+
+    def test_pool_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Invalid routing"):
+            gammu.worker.GammuWorkerPool(self.pool_callback, [{}], routing="random")
+        with pytest.raises(ValueError, match="At least one configuration"):
+            gammu.worker.GammuWorkerPool(self.pool_callback, [])
+
+    def test_priority(self) -> None:
+        self.results = []
+        worker = gammu.worker.GammuWorker(self.callback)
+        worker.configure(self.get_statemachine().GetConfig())
+        worker.enqueue("GetModel", priority=gammu.worker.PRIORITY_LOW)
+        worker.enqueue("GetManufacturer")
+        worker.enqueue("GetIMEI", priority=gammu.worker.PRIORITY_HIGH)
+        worker.initiate()
+        worker.terminate()
+
+        assert [result[0] for result in self.results] == [
+            "Init",
+            "GetIMEI",
+            "GetManufacturer",
+            "GetModel",
+            "Terminate",
+        ]
+
+    def test_cancel_and_expire(self) -> None:
+        self.results = []
+        worker = gammu.worker.GammuWorker(self.callback)
+        worker.configure(self.get_statemachine().GetConfig())
+        task = worker.enqueue("GetModel")
+        worker.enqueue("GetIMEI", timeout=0)
+        worker.enqueue("GetManufacturer")
+        worker.cancel(task)
+        worker.initiate()
+        worker.terminate()
+
+        assert self.results[1:] == [
+            ("GetModel", None, "ERR_CANCELED", 100),
+            ("GetIMEI", None, "ERR_TIMEOUT", 100),
+            ("GetManufacturer", "Gammu", "ERR_NONE", 100),
+            ("Terminate", None, "ERR_NONE", 100),
+        ]
+
+    def test_abort(self) -> None:
+        self.results = []
+        worker = gammu.worker.GammuWorker(self.callback)
+        worker.configure(self.get_statemachine().GetConfig())
+        worker.enqueue("GetModel")
+        worker.enqueue("GetIMEI")
+        worker.abort()
+        worker.enqueue("GetManufacturer")
+        worker.initiate()
+        worker.terminate()
+
+        assert self.results == [
+            ("GetModel", None, "ERR_CANCELED", 100),
+            ("GetIMEI", None, "ERR_CANCELED", 100),
+            ("Init", None, "ERR_NONE", 100),
+            ("GetManufacturer", "Gammu", "ERR_NONE", 100),
+            ("Terminate", None, "ERR_NONE", 100),
+        ]
+
+    def test_abort_running(self) -> None:
+        self.results = []
+
+        def callback(name, result, error, percents) -> None:
+            self.callback(name, result, error, percents)
+            if name == "CustomGetInfo" and error == "ERR_NONE":
+                # Abort the task while it is being executed
+                worker.abort()
+                worker.enqueue("GetManufacturer")
+
+        worker = gammu.worker.GammuWorker(callback)
+        worker.configure(self.get_statemachine().GetConfig())
+        worker.enqueue("CustomGetInfo", commands=["GetModel", "GetIMEI", "GetHardware"])
+        worker.initiate()
+        worker.terminate()
+
+        # Remaining commands are skipped and next task is not affected
+        assert self.results == [
+            ("Init", None, "ERR_NONE", 100),
+            ("CustomGetInfo", ("unknown", "Dummy"), "ERR_NONE", 33),
+            ("CustomGetInfo", None, "ERR_CANCELED", 100),
+            ("GetManufacturer", "Gammu", "ERR_NONE", 100),
+            ("Terminate", None, "ERR_NONE", 100),
+        ]